@@ -0,0 +1,62 @@
+"""
+Measures how long importing parts of glx takes in a fresh interpreter.  glx
+loads its modules lazily, so a plain import glx, or an import of only
+glx.viewport, no longer pays for OpenGL, freetype and mako; from glx import *
+still loads everything, as import glx used to.
+
+Run it, e.g., from the repository root:
+
+    python benchmarks/import_time.py
+
+It imports glx from the repository that contains it.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPOSITORY))
+
+STATEMENTS = ['import glx',
+              'import glx.transformations, glx.viewport',
+              'from glx import *',
+              'import pkg_resources']
+
+TIMER = """
+import time
+start = time.perf_counter()
+exec({statement!r})
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement):
+    """
+    Returns the time in seconds that statement takes in a fresh interpreter.
+    """
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        filter(None, [str(REPOSITORY), environment.get('PYTHONPATH')]))
+    process = subprocess.run(
+        [sys.executable, '-c', TIMER.format(statement=statement)],
+        env=environment, stdout=subprocess.PIPE, check=True,
+        universal_newlines=True)
+    return float(process.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=10,
+                        help="interpreters per statement, of which the "
+                             "median is reported")
+    arguments = parser.parse_args()
+    for statement in STATEMENTS:
+        times = [import_time(statement) for _ in range(arguments.runs)]
+        print(f"{statement:<44}{statistics.median(times) * 1e3:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
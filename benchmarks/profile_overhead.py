@@ -0,0 +1,118 @@
+"""
+Measures how long typical glx calls take under each GL profile; see
+glx.gl_profiles.  PyOpenGL reads its options when OpenGL.GL is imported, so
+each profile is measured in its own process.
+
+Run it with an offscreen platform, e.g., from the repository root:
+
+    PYOPENGL_PLATFORM=egl python benchmarks/profile_overhead.py
+
+It imports glx from the repository that contains it.
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import timeit
+from pathlib import Path
+
+REPOSITORY = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPOSITORY))
+
+
+def measure(number, repeat):
+    """
+    Returns a map from workload name to its best time per call in seconds in
+    the profile of this process.
+    """
+    import numpy as np
+
+    from glx import (BasicShaderProgram, CameraBlock, Framebuffer,
+                     OffscreenContext, gl)
+
+    context = OffscreenContext()
+    camera_block = CameraBlock()
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    vertices = np.array([[0, 0], [1, 0], [0, 1]], dtype='f')
+    program.buffer.upload(vertices)
+    framebuffer = Framebuffer(8, 8)
+    color = np.ones(4, dtype='f')
+
+    def set_uniform():
+        program.color(color)
+
+    def upload():
+        program.buffer.upload(vertices)
+
+    def draw():
+        with program.bind_context({'color': color}):
+            program.vertex_array.draw_arrays(gl.GL_TRIANGLES)
+
+    workloads = {'set uniform': set_uniform,
+                 'upload buffer': upload,
+                 'bind and draw': draw}
+    times = {}
+    with framebuffer.bind_context(), program.bind_context():
+        for name, workload in workloads.items():
+            workload()
+            times[name] = min(timeit.repeat(workload,
+                                            number=number,
+                                            repeat=repeat)) / number
+            gl.glFinish()
+    framebuffer.delete()
+    program.delete_program()
+    camera_block.delete()
+    context.delete()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=2000,
+                        help="calls per timing")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="timings per workload, of which the best is "
+                             "kept")
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    if arguments.child:
+        # The debug profile's messages are logged, which is part of its
+        # overhead, but not shown.
+        logger = logging.getLogger('glx.debug_output')
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        print(json.dumps(measure(arguments.number, arguments.repeat)))
+        return
+
+    from glx.gl_profiles import GL_PROFILES
+
+    results = {}
+    for profile in GL_PROFILES:
+        environment = dict(os.environ, GLX_GL_PROFILE=profile)
+        environment.setdefault('PYOPENGL_PLATFORM', 'egl')
+        environment['PYTHONPATH'] = os.pathsep.join(
+            filter(None, [str(REPOSITORY), environment.get('PYTHONPATH')]))
+        process = subprocess.run(
+            [sys.executable, __file__, '--child',
+             '--number', str(arguments.number),
+             '--repeat', str(arguments.repeat)],
+            env=environment, stdout=subprocess.PIPE, check=True,
+            universal_newlines=True)
+        results[profile] = json.loads(process.stdout)
+
+    baseline = results['production']
+    print(f"{'workload':<16}"
+          + "".join(f"{profile:>22}" for profile in results))
+    for workload, best in baseline.items():
+        cells = []
+        for times in results.values():
+            ratio = times[workload] / best
+            cells.append(f"{times[workload] * 1e6:>12.2f} us ({ratio:.2f}x)")
+        print(f"{workload:<16}" + "".join(cells))
+
+
+if __name__ == '__main__':
+    main()
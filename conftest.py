@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+# Tests that need an OpenGL context create a headless EGL context, which
+# requires PyOpenGL's EGL platform to be selected before OpenGL is imported.
+os.environ.setdefault('PYOPENGL_PLATFORM', 'egl')
+
+
+@pytest.fixture(scope='module')
+def context():
+    """
+    Makes an offscreen OpenGL 4.5 context current for the tests of a module,
+    or skips them if none is available.
+    """
+    from glx import OffscreenContext
+
+    try:
+        context = OffscreenContext()
+    except Exception:
+        pytest.skip("An offscreen OpenGL context is not available.")
+    yield context
+    context.delete()
+
+
+@pytest.fixture
+def gl_state(context):
+    """
+    Yields the GLState of the context, whose capabilities a test can set to
+    False, or whose max_vertex_attrib_relative_offset it can set to zero, to
+    force the fallbacks, and restores them afterwards.
+    """
+    from glx import GLState
+
+    state = GLState.current()
+    capabilities = {name: getattr(state, name)
+                    for name in ['direct_state_access',
+                                 'vertex_attrib_binding',
+                                 'buffer_storage',
+                                 'multi_draw_indirect',
+                                 'max_vertex_attrib_relative_offset']}
+    yield state
+    for name, value in capabilities.items():
+        setattr(state, name, value)
+
+
+@pytest.fixture
+def render_target(context):
+    """
+    Yields a cleared Framebuffer of 16 × 8 pixels, and writes the Camera
+    uniform block so that scene coördinates are pixel coördinates from the
+    bottom left.  Flip what read returns, i.e., read()[::-1], to index the
+    pixels from the bottom.
+    """
+    from rectangle import Rect
+
+    from glx import (CameraBlock, Framebuffer, OrthoProjection, OrthoView,
+                     Viewport)
+
+    width, height = 16, 8
+    camera_block = CameraBlock()
+    Viewport(OrthoProjection(Rect(sizes=[width, height])),
+             OrthoView(scroll=[0, -height])).write_camera_block(camera_block)
+    framebuffer = Framebuffer(width, height)
+    framebuffer.clear()
+    yield framebuffer
+    framebuffer.delete()
+    camera_block.delete()
@@ -38,7 +38,7 @@ class Geometry:
 
     @property
     def view_matrix(self):
-        return self.viewport.view.scene_to_widget.astype('f')
+        return self.viewport.view.matrix('scene', 'widget', np.float32)
 
     # Setters -----------------------------------------------------------------
     def set_device_pixel_ratio(self, device_pixel_ratio):
@@ -66,16 +66,9 @@ class Geometry:
             v.view.scene_rect = new_scene_rect
 
     # Attribute setters -------------------------------------------------------
-    def apply_projection_matrix(self, shader_programs):
-        projection_matrix = self.projection_matrix
-        for shader_program in shader_programs:
-            with shader_program.bind_context(
-                    uniforms={'projection': projection_matrix}):
-                pass
-
-    def apply_view_matrix(self, shader_programs):
-        view_matrix = self.view_matrix
-        for shader_program in shader_programs:
-            with shader_program.bind_context(
-                    uniforms={'view': view_matrix}):
-                pass
+    def apply_camera(self, camera_block):
+        """
+        Writes the projection and view matrices into camera_block, which
+        updates every shader program that declares the Camera uniform block.
+        """
+        self.viewport.write_camera_block(camera_block)
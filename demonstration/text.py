@@ -6,7 +6,7 @@ from PyQt5.QtWidgets import QApplication, QOpenGLWidget
 from rectangle import Rect
 
 from geometry import Geometry
-from glx import DisplayList, Font, gl, translation_matrix
+from glx import CameraBlock, DisplayList, Font, gl, translation_matrix
 
 background = np.array([0.0, 0.16862745098039217, 0.21176470588235294, 1.0])
 off_white = np.array([0.9333, 0.9098, 0.8353, 1.0])
@@ -27,6 +27,9 @@ class MyWidget(QOpenGLWidget):
     def initializeGL(self):
         super().initializeGL()
 
+        # Set up the camera uniform block shared by all shader programs.
+        self.camera_block = CameraBlock()
+
         # Set up font.
         self.font = Font('/Library/Fonts/Arial Unicode.ttf', 24)
         with self.font.shader_program.bind_context():
@@ -46,7 +49,6 @@ class MyWidget(QOpenGLWidget):
 
     def do_resize(self, width, height):
         self.geometry.set_widget_size([width, height])
-        self.geometry.apply_projection_matrix([self.font.shader_program])
         self.text_location = np.array(
             [(0.9 * self.geometry.scene_visible_rect.mins[0]
               + 0.1 * self.geometry.scene_visible_rect.maxes[0]),
@@ -66,6 +68,9 @@ class MyWidget(QOpenGLWidget):
         gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
         gl.glEnable(gl.GL_BLEND)
 
+        # Write the camera once for all shader programs.
+        self.geometry.apply_camera(self.camera_block)
+
         # Get matrices.
         view_matrix = self.geometry.view_matrix
         model_matrix = translation_matrix([0.0, 0.0, 0.0]).astype('f')
@@ -1,8 +1,63 @@
-from .font import *
-from .gl_importer import *
-from .shader_program import *
-from .shader_programs import *
-from .tools import *
-from .transformations import *
-from .viewport import *
-from .wrappers import *
+"""
+glx imports its modules when they are first used, so that, e.g., code that
+only uses glx.viewport doesn't import OpenGL, freetype or mako.  The names in
+__all__ can be imported from glx directly, e.g., from glx import Font.
+"""
+import importlib
+
+# A map from each module of glx to the names that glx exports from it.
+_EXPORTS = {
+    'debug_output': ['DebugOutput'],
+    'decimation': ['DecimationPyramid'],
+    'font': ['Atlas', 'CodeLookup', 'DisplayList', 'Font'],
+    'gl_importer': ['OpenGL', 'gl'],
+    'gl_profiles': ['GL_PROFILES', 'gl_profile', 'select_gl_profile'],
+    'gl_state': ['Binding', 'GLState'],
+    'offscreen': ['Framebuffer', 'OffscreenContext', 'ReadbackRing',
+                  'render_batch'],
+    'profiling': ['GPUTimer', 'RollingStatistics', 'Tracer'],
+    'shader_program': ['Attribute', 'BufferDescription', 'ComputeProgram',
+                       'DrawCommand', 'DrawList', 'ElementBuffer', 'Fence',
+                       'FreeList', 'GLBuffer', 'Mesh', 'MeshArena',
+                       'PersistentBuffer', 'Shader', 'ShaderProgram',
+                       'UniformBlock', 'UniformBlockRegistry', 'UnpackRing',
+                       'buffer_data', 'buffer_sub_data',
+                       'copy_buffer_sub_data', 'create_buffer',
+                       'delete_buffer', 'get_buffer_sub_data',
+                       'memory_barrier', 'uniform_block_registry'],
+    'shader_programs': ['BasicShaderProgram', 'CameraBlock',
+                        'StreamingPolyline'],
+    'tools': ['next_power_of_two'],
+    'transformations': ['clip_matrix', 'four_components',
+                        'translation_matrix'],
+    'viewport': ['BoundedOrthoView', 'OrthoProjection', 'OrthoView',
+                 'Viewport'],
+    'wrappers': ['glGetActiveAttrib', 'glGetActiveUniform',
+                 'glGetActiveUniformBlockName', 'glGetProgramResourceName',
+                 'glGetInteger', 'glGetProgramInteger', 'glGenName',
+                 'glCreateName', 'glDeleteNames']}
+
+# A map from exported name to the module of glx that defines it.
+_MODULES = {name: module
+            for module, names in _EXPORTS.items()
+            for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return importlib.import_module(f'.{name}', __name__)
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Later lookups find the name without calling __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
@@ -0,0 +1,159 @@
+import logging
+import weakref
+
+from .gl_importer import extensions, gl
+from .gl_state import GLState
+
+__all__ = ['DebugOutput']
+
+logger = logging.getLogger(__name__)
+
+
+class DebugOutput:
+
+    """
+    A DebugOutput routes the GL_KHR_debug messages of one OpenGL context,
+    i.e., the errors, performance warnings and notes that the driver
+    reports, to the logger glx.debug_output.  Each message is logged with
+    the glx objects, e.g., the ShaderProgram and VertexArray, that were bound
+    when the driver reported it.  The messages are reported synchronously,
+    within the call that caused them, so the bound objects are those of that
+    call.  Their log records carry the objects as the attribute glx_objects.
+
+    The debug profile installs a DebugOutput in each context that glx uses;
+    see gl_profiles.  Otherwise, use it like this:
+
+        DebugOutput().install()
+    """
+
+    # Maps from the enumerants of a message to the names that are logged.
+    SOURCES = {gl.GL_DEBUG_SOURCE_API: 'API',
+               gl.GL_DEBUG_SOURCE_WINDOW_SYSTEM: 'window system',
+               gl.GL_DEBUG_SOURCE_SHADER_COMPILER: 'shader compiler',
+               gl.GL_DEBUG_SOURCE_THIRD_PARTY: 'third party',
+               gl.GL_DEBUG_SOURCE_APPLICATION: 'application',
+               gl.GL_DEBUG_SOURCE_OTHER: 'other source'}
+    TYPES = {gl.GL_DEBUG_TYPE_ERROR: 'error',
+             gl.GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR: 'deprecated behavior',
+             gl.GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR: 'undefined behavior',
+             gl.GL_DEBUG_TYPE_PORTABILITY: 'portability',
+             gl.GL_DEBUG_TYPE_PERFORMANCE: 'performance',
+             gl.GL_DEBUG_TYPE_MARKER: 'marker',
+             gl.GL_DEBUG_TYPE_PUSH_GROUP: 'push group',
+             gl.GL_DEBUG_TYPE_POP_GROUP: 'pop group',
+             gl.GL_DEBUG_TYPE_OTHER: 'other'}
+    # A map from message severity to logging level.
+    LEVELS = {gl.GL_DEBUG_SEVERITY_HIGH: logging.ERROR,
+              gl.GL_DEBUG_SEVERITY_MEDIUM: logging.WARNING,
+              gl.GL_DEBUG_SEVERITY_LOW: logging.INFO,
+              gl.GL_DEBUG_SEVERITY_NOTIFICATION: logging.DEBUG}
+
+    def __init__(self):
+        # A map from (object type, object name), where the object type is the
+        # identifier that glObjectLabel takes, e.g., GL_PROGRAM, to a weak
+        # reference to the glx object that owns the OpenGL object.
+        self.objects = {}
+        # The GLState of the context that the output is installed in.
+        self.state = None
+        # The ctypes function that is passed to glDebugMessageCallback, which
+        # must be kept alive for as long as it is installed.
+        self.callback = None
+
+    # New methods -------------------------------------------------------------
+    @staticmethod
+    def supported():
+        """
+        Returns whether the current context supports GL_KHR_debug.
+        """
+        return (GLState.current().version >= (4, 3)
+                or extensions.hasGLExtension('GL_KHR_debug'))
+
+    def install(self):
+        """
+        Routes the messages of the current context until uninstall is called.
+        """
+        if not self.supported():
+            raise Exception("The context doesn't support GL_KHR_debug.")
+        state = GLState.current()
+        if state.debug_output is not None:
+            raise ValueError("A DebugOutput is already installed.")
+        self.callback = gl.GLDEBUGPROC(self.receive)
+        gl.glDebugMessageCallback(self.callback, None)
+        gl.glEnable(gl.GL_DEBUG_OUTPUT)
+        gl.glEnable(gl.GL_DEBUG_OUTPUT_SYNCHRONOUS)
+        self.state = state
+        state.debug_output = self
+
+    def uninstall(self):
+        """
+        Stops routing the messages of the current context.
+        """
+        if self.state is None or self.state is not GLState.current():
+            return
+        gl.glDisable(gl.GL_DEBUG_OUTPUT_SYNCHRONOUS)
+        gl.glDisable(gl.GL_DEBUG_OUTPUT)
+        # A null function pointer removes the callback.
+        gl.glDebugMessageCallback(gl.GLDEBUGPROC(), None)
+        self.state.debug_output = None
+        self.state = None
+        self.callback = None
+
+    def register(self, object_type, name, glx_object):
+        self.objects[object_type, int(name)] = weakref.ref(glx_object)
+
+    def bound_objects(self):
+        """
+        Returns a list of the (description, glx object) pairs of the bound
+        objects that were registered.
+        """
+        state = self.state
+        bindings = [('program', gl.GL_PROGRAM, state.program),
+                    ('vertex array', gl.GL_VERTEX_ARRAY, state.vertex_array)]
+        bindings.extend(('framebuffer', gl.GL_FRAMEBUFFER, binding)
+                        for binding in state.framebuffers.values())
+        bindings.extend(('buffer', gl.GL_BUFFER, binding)
+                        for binding in state.buffers.values())
+        bound_objects = []
+        for kind, object_type, binding in bindings:
+            if not binding.current:
+                continue
+            reference = self.objects.get((object_type, int(binding.current)))
+            glx_object = None if reference is None else reference()
+            if glx_object is not None:
+                bound_objects.append((f'{kind} {binding.current}',
+                                      glx_object))
+        return bound_objects
+
+    def receive(self, source, type_, id_, severity, length, message,
+                user_parameter):
+        """
+        Logs one message.  It is called by the driver.
+        """
+        level = self.LEVELS.get(severity, logging.WARNING)
+        if not logger.isEnabledFor(level):
+            return
+        bound_objects = self.bound_objects()
+        text = message[:length].decode(errors='replace')
+        if bound_objects:
+            text += "; bound: " + ", ".join(
+                f"{description} {glx_object!r}"
+                for description, glx_object in bound_objects)
+        logger.log(level,
+                   "GL %s %s %d: %s",
+                   self.SOURCES.get(source, source),
+                   self.TYPES.get(type_, type_),
+                   id_,
+                   text,
+                   extra={'glx_objects': [glx_object
+                                          for _, glx_object in bound_objects]})
+
+
+def register_object(object_type, name, glx_object):
+    """
+    Records that glx_object owns the OpenGL object called name, e.g., a
+    program if object_type is GL_PROGRAM, so that the DebugOutput installed
+    in the current context, if any, can name it in messages.
+    """
+    debug_output = GLState.current().debug_output
+    if debug_output is not None:
+        debug_output.register(object_type, name, glx_object)
@@ -0,0 +1 @@
+from .decimation_pyramid import *
@@ -0,0 +1,145 @@
+import numpy as np
+
+__all__ = ['DecimationPyramid']
+
+
+class DecimationPyramid:
+
+    """
+    A DecimationPyramid reduces a polyline of many samples to the few that
+    are needed to draw it at some zoom.  Within each pixel column, only the
+    first, minimum, maximum, and last samples affect which pixels a line
+    strip covers, so drawing those looks the same as drawing all of them.
+
+    The pyramid's level k ≥ 1 summarizes each run of 2**k consecutive
+    samples by the int32 indices of those four samples, which takes 16 bytes
+    per sample over all of the levels.  A query picks the level whose runs
+    hold about one pixel column's worth of the visible samples, and merges
+    the runs that fall into the same column.  The cost of a query is
+    proportional to the number of visible pixel columns rather than to the
+    number of samples.
+
+    The x coordinates of the samples must be nondecreasing.  A run that
+    straddles a column boundary is assigned to the column of its first
+    sample, which can move a sample by one pixel column.
+
+    The pyramid only chooses the samples; it draws nothing.  Upload what
+    decimate returns to the buffer of the program that draws the line, e.g.,
+
+        program.buffer.upload(pyramid.decimate_visible(viewport))
+        program.vertex_array.draw_arrays(gl.GL_LINE_STRIP)
+    """
+
+    # The columns of the levels.
+    FIRST, MIN, MAX, LAST = range(4)
+
+    def __init__(self, points):
+        """
+        * points is a numpy array of shape (n, 2) of (x, y) samples.
+        """
+        self.points = np.asarray(points)
+        if self.points.ndim != 2 or self.points.shape[1] != 2:
+            raise ValueError("The points must have shape (n, 2).")
+        self.x = self.points[:, 0]
+        self.y = self.points[:, 1]
+        if np.any(np.diff(self.x) < 0):
+            raise ValueError("The x coordinates must be nondecreasing.")
+        self.levels = self.create_levels()
+
+    def __len__(self):
+        return len(self.points)
+
+    # New methods -------------------------------------------------------------
+    def create_levels(self):
+        """
+        Returns a list of numpy arrays of shape (m, 4), one per level k ≥ 1
+        at index k - 1, that hold the indices of the first, minimum, maximum
+        and last samples of each run.  There is no level zero, whose runs
+        would be single samples, because decimate only uses the pyramid when
+        a pixel column holds at least four samples.
+        """
+        left = np.arange(0, len(self.points), 2, dtype=np.int32)
+        right = np.minimum(left + 1, len(self.points) - 1)
+        level = np.empty((len(left), 4), dtype=np.int32)
+        level[:, self.FIRST] = left
+        level[:, self.LAST] = right
+        level[:, self.MIN] = np.where(self.y[left] <= self.y[right],
+                                      left, right)
+        level[:, self.MAX] = np.where(self.y[left] >= self.y[right],
+                                      left, right)
+        levels = [level]
+        while len(levels[-1]) > 1:
+            runs = levels[-1]
+            if len(runs) % 2:
+                runs = np.concatenate([runs, runs[-1:]])
+            left = runs[0::2]
+            right = runs[1::2]
+            level = np.empty_like(left)
+            level[:, self.FIRST] = left[:, self.FIRST]
+            level[:, self.LAST] = right[:, self.LAST]
+            level[:, self.MIN] = np.where(
+                self.y[left[:, self.MIN]] <= self.y[right[:, self.MIN]],
+                left[:, self.MIN],
+                right[:, self.MIN])
+            level[:, self.MAX] = np.where(
+                self.y[left[:, self.MAX]] >= self.y[right[:, self.MAX]],
+                left[:, self.MAX],
+                right[:, self.MAX])
+            levels.append(level)
+        return levels
+
+    def decimate(self, x_min, x_max, column_width):
+        """
+        Returns the samples to draw between x_min and x_max when a pixel
+        column is column_width wide, including the samples just outside of
+        the range so that the line reaches its edges.
+        """
+        if not len(self.points):
+            return self.points
+        if column_width <= 0:
+            raise ValueError("The column width must be positive.")
+        lo = max(int(np.searchsorted(self.x, x_min, 'left')) - 1, 0)
+        hi = min(int(np.searchsorted(self.x, x_max, 'right')) + 1,
+                 len(self.points))
+        columns = max((x_max - x_min) / column_width, 1.0)
+        samples_per_column = (hi - lo) / columns
+        if samples_per_column < 4:
+            return self.points[lo:hi]
+        k = min(int(np.log2(samples_per_column)) - 1, len(self.levels))
+        runs = self.levels[k - 1][lo >> k: ((hi - 1) >> k) + 1]
+
+        # Group the runs by pixel column.
+        column = np.floor(
+            (self.x[runs[:, self.FIRST]] - x_min) / column_width)
+        new_group = np.empty(len(runs), dtype=bool)
+        new_group[0] = True
+        np.not_equal(column[1:], column[:-1], out=new_group[1:])
+        starts = np.flatnonzero(new_group)
+        stops = np.append(starts[1:], len(runs)) - 1
+        group = np.cumsum(new_group) - 1
+
+        # Reduce each group to its first, minimum, maximum, and last samples.
+        reduced = np.empty((len(starts), 4), dtype=runs.dtype)
+        reduced[:, self.FIRST] = runs[starts, self.FIRST]
+        reduced[:, self.LAST] = runs[stops, self.LAST]
+        order = np.lexsort((self.y[runs[:, self.MIN]], group))
+        reduced[:, self.MIN] = runs[order[starts], self.MIN]
+        order = np.lexsort((-self.y[runs[:, self.MAX]], group))
+        reduced[:, self.MAX] = runs[order[starts], self.MAX]
+
+        # Keep the samples in their original order.
+        indices = np.sort(reduced, axis=1).ravel()
+        keep = np.empty(len(indices), dtype=bool)
+        keep[0] = True
+        np.not_equal(indices[1:], indices[:-1], out=keep[1:])
+        return self.points[indices[keep]]
+
+    def decimate_visible(self, viewport):
+        """
+        Returns the samples to draw in the viewport's scene_visible_rect given
+        the zoom of its view, which is the number of pixels per scene unit.
+        """
+        visible_rect = viewport.scene_visible_rect()
+        return self.decimate(visible_rect.mins[0],
+                             visible_rect.maxes[0],
+                             1.0 / viewport.view.zoom[0])
@@ -0,0 +1,64 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from .decimation_pyramid import DecimationPyramid
+
+
+def brute_force_columns(points, x_min, column_width):
+    column = np.floor((points[:, 0] - x_min) / column_width)
+    return {c: (points[column == c, 1].min(), points[column == c, 1].max())
+            for c in np.unique(column)}
+
+
+def test_decimation_preserves_column_extrema():
+    random_state = np.random.RandomState(123)
+    x = np.cumsum(random_state.uniform(0.0, 1.0, 100_000))
+    y = np.cumsum(random_state.normal(size=x.shape))
+    points = np.stack([x, y], axis=1)
+    pyramid = DecimationPyramid(points)
+
+    x_min, x_max = x[1000], x[90_000]
+    column_width = (x_max - x_min) / 500
+    decimated = pyramid.decimate(x_min, x_max, column_width)
+    assert len(decimated) <= 4 * 2 * 500
+
+    # Every decimated sample is a sample, in order.
+    assert np.all(np.diff(decimated[:, 0]) >= 0)
+    assert set(map(tuple, decimated)) <= set(map(tuple, points))
+
+    # The extrema of the visible samples are kept.
+    visible = points[(x >= x_min) & (x <= x_max)]
+    assert decimated[:, 1].min() <= visible[:, 1].min()
+    assert decimated[:, 1].max() >= visible[:, 1].max()
+
+    # Each column's extrema are off by at most one neighbouring column.
+    expected = brute_force_columns(visible, x_min, column_width)
+    actual = brute_force_columns(decimated, x_min, column_width)
+    for c, (low, high) in expected.items():
+        neighbours = [actual[d] for d in (c - 1, c, c + 1) if d in actual]
+        assert min(n[0] for n in neighbours) <= low
+        assert max(n[1] for n in neighbours) >= high
+
+
+def test_sparse_samples_are_not_decimated():
+    points = np.stack([np.arange(10.0), np.arange(10.0) ** 2], axis=1)
+    pyramid = DecimationPyramid(points)
+    assert_array_equal(pyramid.decimate(2.5, 6.5, 0.1), points[2:8])
+    assert_array_equal(pyramid.decimate(-1.0, 20.0, 0.1), points)
+
+
+def test_levels():
+    y = np.array([3.0, 1.0, 4.0, 1.0, 5.0])
+    pyramid = DecimationPyramid(np.stack([np.arange(5.0), y], axis=1))
+    # The first level pairs the samples; there is no level of single
+    # samples.
+    assert [level.tolist() for level in pyramid.levels] == [
+        [[0, 1, 0, 1], [2, 3, 2, 3], [4, 4, 4, 4]],
+        [[0, 1, 2, 3], [4, 4, 4, 4]],
+        [[0, 1, 4, 4]]]
+    assert all(level.dtype == np.int32 for level in pyramid.levels)
+
+    points = np.stack([np.arange(100_000.0), np.zeros(100_000)], axis=1)
+    pyramid = DecimationPyramid(points)
+    assert sum(level.nbytes for level in pyramid.levels) <= 16 * (
+        len(points) + len(pyramid.levels))
@@ -2,7 +2,9 @@ from contextlib import contextmanager
 
 import numpy as np
 
-from ..gl_importer import gl as gl
+from ..gl_importer import gl, raw_gl_1_1
+from ..gl_state import GLState
+from ..wrappers import glGenName
 
 __all__ = ['Atlas']
 
@@ -24,6 +26,12 @@ class Atlas:
 
     def __init__(self, font, size, texture_unit, guard=1):
         self.creation_id = 0
+        # The shape of the texture's storage, which is reallocated only when
+        # the atlas is resized.
+        self.texture_shape = None
+        # The rectangle (left, top, right, bottom) of texture_array that
+        # differs from the texture, or None.
+        self.dirty = None
         self.clear()
         self.resize(size)
         self.texture_unit = texture_unit
@@ -32,14 +40,14 @@ class Atlas:
 
         with self.font.shader_program.bind_context():
             # Create sampler.
-            self.sampler_object, = gl.glGenSamplers(1)
+            self.sampler_object = glGenName(gl.glGenSamplers)
 
             # Create texture.
-            self.texture, = gl.glGenTextures(1)
+            self.texture = glGenName(gl.glGenTextures)
 
             # Bind sampler to texture unit, and set parameters.
-            gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-            gl.glBindSampler(self.texture_unit, self.sampler_object)
+            sampler = GLState.current().sampler(self.texture_unit)
+            sampler.push(self.sampler_object)
             gl.glSamplerParameteri(self.sampler_object,
                                    gl.GL_TEXTURE_WRAP_S,
                                    gl.GL_CLAMP_TO_EDGE)
@@ -52,18 +60,17 @@ class Atlas:
             gl.glSamplerParameteri(self.sampler_object,
                                    gl.GL_TEXTURE_MIN_FILTER,
                                    gl.GL_LINEAR)
-            gl.glBindSampler(self.texture_unit, 0)
+            sampler.pop()
 
             # Set uniform with texture unit.
             self.font.shader_program.font_atlas(np.int32(self.texture_unit))
 
     def resize(self, size):
         self.creation_id += 1
-        self.needs_update = True
         self.texture_array = np.empty((size, size), dtype=np.ubyte)
+        self.mark_dirty(0, 0, size, size)
 
     def clear(self):
-        self.needs_update = True
         self.lines = []
         self.y = 0  # rows used
 
@@ -71,6 +78,22 @@ class Atlas:
     def size(self):
         return self.texture_array.shape[0]
 
+    @property
+    def needs_update(self):
+        return self.dirty is not None
+
+    def mark_dirty(self, left, top, right, bottom):
+        """
+        Extends the dirty rectangle to include the pixels [left, right) ×
+        [top, bottom) of texture_array.
+        """
+        if self.dirty is not None:
+            left = min(left, self.dirty[0])
+            top = min(top, self.dirty[1])
+            right = max(right, self.dirty[2])
+            bottom = max(bottom, self.dirty[3])
+        self.dirty = (left, top, right, bottom)
+
     def new_line(self):
         if self.lines:
             self.y += self.lines[-1].height + self.guard
@@ -97,7 +120,8 @@ class Atlas:
                 self.texture_array[line.y: line.y + bitmap.rows,
                                    line.x: line.x + bitmap.width].flat = \
                     bitmap.buffer
-                self.needs_update = True
+                self.mark_dirty(line.x, line.y, line.x + bitmap.width,
+                                line.y + bitmap.rows)
 
                 line.height = max(bitmap.rows, line.height)
                 bottom_left = [line.x, line.y + bitmap.rows]
@@ -112,25 +136,48 @@ class Atlas:
         # Bind texture to texture unit, set paramters and upload texture.
         # ActiveTexture must precede TexParameter, BindTexture,
         # and TexImage.
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
-        gl.glTexImage2D(gl.GL_TEXTURE_2D,
-                        0,
-                        gl.GL_R8,
-                        self.texture_array.shape[1],
-                        self.texture_array.shape[0],
-                        0,
-                        gl.GL_RED,
-                        gl.GL_UNSIGNED_BYTE,
-                        self.texture_array)
-        self.needs_update = False
+        state = GLState.current()
+        state.texture(self.texture_unit, gl.GL_TEXTURE_2D).bind(self.texture)
+        state.active_texture(self.texture_unit)
+        height, width = self.texture_array.shape
+        left, top, right, bottom = self.dirty
+        if self.texture_shape != self.texture_array.shape:
+            gl.glTexImage2D(gl.GL_TEXTURE_2D,
+                            0,
+                            gl.GL_R8,
+                            width,
+                            height,
+                            0,
+                            gl.GL_RED,
+                            gl.GL_UNSIGNED_BYTE,
+                            None)
+            self.texture_shape = self.texture_array.shape
+            left, top, right, bottom = 0, 0, width, height
+        # Widen the columns to multiples of four so that the rows of the
+        # staged pixels keep the default GL_UNPACK_ALIGNMENT.  The size is a
+        # power of two of at least four.
+        left -= left % 4
+        right += -right % 4
+        # Stage the pixels so that the driver doesn't copy them before
+        # returning.
+        with self.font.unpack_ring.unpack_context(
+                self.texture_array[top: bottom, left: right]) as pixels:
+            raw_gl_1_1.glTexSubImage2D(gl.GL_TEXTURE_2D,
+                                       0,
+                                       left,
+                                       top,
+                                       right - left,
+                                       bottom - top,
+                                       gl.GL_RED,
+                                       gl.GL_UNSIGNED_BYTE,
+                                       pixels)
+        self.dirty = None
 
     @contextmanager
     def draw_context(self):
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
-        gl.glBindSampler(self.texture_unit, self.sampler_object)
-        yield
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
-        gl.glBindSampler(self.texture_unit, 0)
+        state = GLState.current()
+        texture = state.texture(self.texture_unit, gl.GL_TEXTURE_2D)
+        sampler = state.sampler(self.texture_unit)
+        with texture.context(self.texture), \
+                sampler.context(self.sampler_object):
+            yield
@@ -2,8 +2,10 @@ from contextlib import contextmanager
 
 import numpy as np
 
-from ..gl_importer import gl as gl
+from ..gl_importer import gl, raw_gl_1_1
+from ..gl_state import GLState
 from ..tools import next_power_of_two
+from ..wrappers import glGenName
 
 __all__ = ['CodeLookup']
 
@@ -11,6 +13,9 @@ __all__ = ['CodeLookup']
 class CodeLookup:
 
     def __init__(self, font, size, texture_unit):
+        # The width of the texture's storage, which is reallocated only when
+        # the lookup is resized.
+        self.texture_size = None
         self.clear()
         self.resize(size)
         self.texture_unit = texture_unit
@@ -18,20 +23,21 @@ class CodeLookup:
 
         with self.font.shader_program.bind_context():
             # Create sampler.
-            self.sampler_object, = gl.glGenSamplers(1)
+            self.sampler_object = glGenName(gl.glGenSamplers)
 
             # Create texture.
-            self.texture, = gl.glGenTextures(1)
+            self.texture = glGenName(gl.glGenTextures)
 
             # Bind sampler to texture unit, and set parameters.
-            gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-            gl.glBindSampler(self.texture_unit, self.sampler_object)
+            sampler = GLState.current().sampler(self.texture_unit)
+            sampler.push(self.sampler_object)
             gl.glSamplerParameteri(self.sampler_object,
                                    gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
             gl.glSamplerParameteri(self.sampler_object,
                                    gl.GL_TEXTURE_MAG_FILTER, gl.GL_NEAREST)
             gl.glSamplerParameteri(self.sampler_object,
                                    gl.GL_TEXTURE_MIN_FILTER, gl.GL_NEAREST)
+            sampler.pop()
 
             # Set uniform with texture unit.
             self.font.shader_program.code_to_texture(
@@ -63,24 +69,38 @@ class CodeLookup:
         # Bind texture to texture unit, set paramters and upload texture.
         # ActiveTexture must precede TexParameter, BindTexture,
         # and TexImage.
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_1D, self.texture)
-        gl.glTexImage1D(gl.GL_TEXTURE_1D,
-                        0,
-                        gl.GL_RGBA32F,
-                        self.data.shape[0],
-                        0,  # border
-                        gl.GL_RGBA,
-                        gl.GL_FLOAT,
-                        self.data)
+        state = GLState.current()
+        state.texture(self.texture_unit, gl.GL_TEXTURE_1D).bind(self.texture)
+        state.active_texture(self.texture_unit)
+        if self.texture_size != self.size:
+            gl.glTexImage1D(gl.GL_TEXTURE_1D,
+                            0,
+                            gl.GL_RGBA32F,
+                            self.size,
+                            0,  # border
+                            gl.GL_RGBA,
+                            gl.GL_FLOAT,
+                            None)
+            self.texture_size = self.size
+        # Only the used codes are read by the shader.  Stage them so that the
+        # driver doesn't copy them before returning.
+        if self.used:
+            with self.font.unpack_ring.unpack_context(
+                    self.data[:self.used]) as pixels:
+                raw_gl_1_1.glTexSubImage1D(gl.GL_TEXTURE_1D,
+                                           0,
+                                           0,
+                                           self.used,
+                                           gl.GL_RGBA,
+                                           gl.GL_FLOAT,
+                                           pixels)
         self.needs_update = False
 
     @contextmanager
     def draw_context(self):
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_1D, self.texture)
-        gl.glBindSampler(self.texture_unit, self.sampler_object)
-        yield
-        gl.glActiveTexture(gl.GL_TEXTURE0 + self.texture_unit)
-        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
-        gl.glBindSampler(self.texture_unit, 0)
+        state = GLState.current()
+        texture = state.texture(self.texture_unit, gl.GL_TEXTURE_1D)
+        sampler = state.sampler(self.texture_unit)
+        with texture.context(self.texture), \
+                sampler.context(self.sampler_object):
+            yield
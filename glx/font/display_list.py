@@ -2,7 +2,7 @@ import freetype as ft
 import numpy as np
 
 from ..gl_importer import gl as gl
-from ..shader_program import Attribute, BufferDescription
+from ..shader_program import Attribute, BufferDescription, GLBuffer
 
 __all__ = ['DisplayList']
 
@@ -13,11 +13,11 @@ class DisplayList:
 
     def __init__(self, font):
         self.font = font
-        self.buffer, = gl.glGenBuffers(1)
+        self.buffer = GLBuffer(self.RECORD_TYPE, usage=gl.GL_STATIC_DRAW)
         self.vertex_array, = font.shader_program.create_vertex_arrays(
             [BufferDescription(
                 self.buffer,
-                self.RECORD_TYPE,
+                None,
                 [Attribute('vertex', ['vertex'], is_vector=True),
                  Attribute('code', ['code'])])])
         self.array = None
@@ -25,9 +25,7 @@ class DisplayList:
         self.characters = {}
 
     def delete(self):
-        # Work around the fact that glGenBuffers returns a result that
-        # glDeleteBuffers can't handle.
-        gl.glDeleteBuffers(1, int(self.buffer))
+        self.buffer.delete()
         self.vertex_array.delete()
 
     def set_text(self, text):
@@ -96,20 +94,14 @@ class DisplayList:
 
             last_char_index = this_char_index
 
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.buffer)
-        gl.glBufferData(gl.GL_ARRAY_BUFFER,
-                        self.array.nbytes,
-                        self.array,
-                        gl.GL_STATIC_DRAW)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        self.buffer.upload(self.array)
 
     def draw(self, widget_point):
         """
-        Before drawing, be sure to set the uniforms:
-        * projection
+        Before drawing, be sure to write the Camera uniform block, e.g.,
+        with Viewport.write_camera_block, and to set the uniforms:
         * color
-        * gamma
-        * scale
+        * gamma (which Font sets to 2.2)
         """
         if self.atlas_creation_id != self.font.atlas.creation_id:
             self.regenerate()
@@ -1,11 +1,11 @@
 import string
 from contextlib import contextmanager
+from importlib.resources import files
 
 import freetype as ft
 import numpy as np
-from pkg_resources import resource_filename
 
-from ..shader_program import ShaderProgram
+from ..shader_program import ShaderProgram, UnpackRing
 from .atlas import Atlas
 from .code_lookup import CodeLookup
 
@@ -29,11 +29,13 @@ class Font:
         Set uniforms for the textures.
         """
         self.shader_program = ShaderProgram(
-            vertex=[resource_filename('glx', 'glsl_shaders/text.vert')],
-            geometry=[resource_filename('glx', 'glsl_shaders/text.geom')],
-            fragment=[resource_filename('glx', 'glsl_shaders/text.frag')])
+            vertex=[str(files('glx') / 'glsl_shaders' / 'text.vert')],
+            geometry=[str(files('glx') / 'glsl_shaders' / 'text.geom')],
+            fragment=[str(files('glx') / 'glsl_shaders' / 'text.frag')])
         self.char_to_index = {}
         self.chars = []
+        # Stages the uploads of the atlas and the code lookup.
+        self.unpack_ring = UnpackRing()
         self.atlas = Atlas(self, 256, self.ATLAS_TEXTURE_UNIT)
         self.code_lookup = CodeLookup(self, len(self.DEFAULT_CHARACTERS),
                                       self.CODE_TEXTURE_UNIT)
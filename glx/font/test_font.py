@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from rectangle import Rect
+
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..offscreen import Framebuffer
+from ..shader_programs import CameraBlock
+from ..viewport import OrthoProjection, OrthoView, Viewport
+from .display_list import DisplayList
+from .font import Font
+
+FONT_FILES = ['/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+              '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+              '/usr/share/fonts/TTF/DejaVuSans.ttf',
+              '/Library/Fonts/Arial.ttf',
+              'C:/Windows/Fonts/arial.ttf']
+
+WIDTH = 64
+HEIGHT = 32
+
+
+@pytest.fixture
+def font_file():
+    for filename in FONT_FILES:
+        if Path(filename).exists():
+            return filename
+    pytest.skip("No font file was found.")
+
+
+@pytest.fixture
+def framebuffer(context):
+    camera_block = CameraBlock()
+    Viewport(OrthoProjection(Rect(sizes=[WIDTH, HEIGHT])),
+             OrthoView(scroll=[0, -HEIGHT])).write_camera_block(camera_block)
+    framebuffer = Framebuffer(WIDTH, HEIGHT)
+    yield framebuffer
+    framebuffer.delete()
+    camera_block.delete()
+
+
+@pytest.mark.parametrize('direct_state_access', [True, False])
+def test_draw_text(gl_state, framebuffer, font_file, direct_state_access):
+    if direct_state_access and not gl_state.direct_state_access:
+        pytest.skip("Direct state access isn't supported.")
+    gl_state.direct_state_access = direct_state_access
+    font = Font(font_file, 12)
+    display_list = DisplayList(font)
+    display_list.set_text('Hi')
+
+    def draw(widget_point):
+        framebuffer.clear()
+        with framebuffer.bind_context(), font.draw_context(
+                {'color': np.array([1.0, 1.0, 1.0, 1.0], dtype='f')}):
+            display_list.draw(np.array(widget_point, dtype='f'))
+        return framebuffer.read()
+
+    image = draw([4, 16])
+    rows, columns = np.nonzero(image[..., 3])
+    assert len(rows) > 20
+    # The glyphs are drawn right of the widget point and above the baseline,
+    # which is the row of the widget point counted from the top.
+    assert columns.min() >= 4
+    assert rows.max() < 16
+    assert (image[..., :3][image[..., 3] > 0] == 255).all()
+    # The vertex_offset moves the text.
+    assert_array_equal(draw([20, 28])[12:, 16:], image[:-12, :-16])
+    display_list.delete()
+    font.shader_program.delete_program()
+
+
+def _texture_pixels(atlas):
+    """
+    Returns the pixels of the atlas's texture.
+    """
+    texture = GLState.current().texture(atlas.texture_unit, gl.GL_TEXTURE_2D)
+    with texture.context(atlas.texture):
+        GLState.current().active_texture(atlas.texture_unit)
+        pixels = gl.glGetTexImage(gl.GL_TEXTURE_2D, 0, gl.GL_RED,
+                                  gl.GL_UNSIGNED_BYTE)
+    return np.frombuffer(pixels, dtype=np.ubyte).reshape(
+        atlas.texture_array.shape)
+
+
+def test_atlas_updates(context, font_file):
+    font = Font(font_file, 12)
+    atlas = font.atlas
+    # The first update allocates and fills the whole texture.
+    assert atlas.dirty == (0, 0, atlas.size, atlas.size)
+    atlas.update_texture()
+    assert not atlas.needs_update
+    assert_array_equal(_texture_pixels(atlas), atlas.texture_array)
+
+    for c in ['\u00e9', '\u00df']:
+        font.get_char(c)
+        left, top, right, bottom = atlas.dirty
+        assert (right - left) * (bottom - top) < atlas.size ** 2 / 16
+        # Pixels outside of the dirty rectangle, such as the bottom right
+        # one, aren't uploaded.
+        assert bottom < atlas.size
+        outside = atlas.size - 1, atlas.size - 1
+        expected = atlas.texture_array.copy()
+        atlas.texture_array[outside] ^= 0xff
+        atlas.update_texture()
+        assert atlas.dirty is None
+        assert_array_equal(_texture_pixels(atlas), expected)
+        atlas.texture_array[outside] ^= 0xff
+    font.shader_program.delete_program()
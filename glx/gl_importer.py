@@ -1,7 +1,11 @@
-# gl should be imported through this file so that the options are set before
-# importing OpenGL.GL.
+# Everything from OpenGL should be imported through this file so that the
+# options are set before PyOpenGL reads them, which it does when the first of
+# its modules is imported.  The options come from the selected profile; see
+# gl_profiles.
 import OpenGL
-OpenGL.SIZE_1_ARRAY_UNPACK = False
+from .gl_profiles import gl_profile
+gl_profile()
+# PyOpenGL's defaults:
 # ERROR_CHECKING = True
 # ERROR_LOGGING = False
 # ERROR_ON_COPY = False
@@ -18,6 +22,14 @@ OpenGL.SIZE_1_ARRAY_UNPACK = False
 # UNSIGNED_BYTE_IMAGES_AS_STRING = True
 # MODULE_ANNOTATIONS = False
 import OpenGL.GL as gl
+from OpenGL import contextdata, extensions
+# The raw functions take pointers, e.g., offsets into a bound buffer, as is.
+from OpenGL.raw.GL.VERSION import GL_1_0 as raw_gl_1_0
+from OpenGL.raw.GL.VERSION import GL_1_1 as raw_gl_1_1
+from OpenGL.raw.GL.VERSION import GL_2_0 as raw_gl_2_0
+from OpenGL.raw.GL.VERSION import GL_3_0 as raw_gl_3_0
+from OpenGL.raw.GL.VERSION import GL_3_1 as raw_gl_3_1
+from OpenGL.raw.GL.VERSION import GL_4_3 as raw_gl_4_3
 
 
 __all__ = ['OpenGL', 'gl']
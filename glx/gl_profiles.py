@@ -0,0 +1,80 @@
+# This module must not import anything from OpenGL: PyOpenGL copies its
+# options when the first of its modules is imported, e.g., OpenGL.GL, so a
+# profile is only selected before then.
+import os
+import sys
+
+import OpenGL
+
+__all__ = ['GL_PROFILES', 'gl_profile', 'select_gl_profile']
+
+# The PyOpenGL options of every profile.  glx expects queries of one value to
+# return arrays.
+BASE_OPTIONS = {'SIZE_1_ARRAY_UNPACK': False}
+
+# A map from profile name to the PyOpenGL options that it sets.
+GL_PROFILES = {
+    # PyOpenGL's defaults, or whatever the PYOPENGL_* environment variables
+    # set.
+    'default': {},
+    # No glGetError after every call, no checks of array sizes or of the
+    # current context, and no silent copies of arrays: arrays that would need
+    # to be copied raise instead, so PyOpenGL needn't keep them alive.
+    'production': {'ERROR_CHECKING': False,
+                   'ERROR_LOGGING': False,
+                   'ARRAY_SIZE_CHECKING': False,
+                   'CONTEXT_CHECKING': False,
+                   'ERROR_ON_COPY': True,
+                   'STORE_POINTERS': False},
+    # The checks, the logging of failed calls, and a GL_KHR_debug message
+    # callback that is installed in each context; see DebugOutput.
+    # CONTEXT_CHECKING stays off because it also checks the calls that create
+    # and make current the contexts, e.g., through EGL.
+    'debug': {'ERROR_CHECKING': True,
+              'ERROR_LOGGING': True,
+              'ARRAY_SIZE_CHECKING': True}}
+
+# The environment variable that selects the profile when glx imports
+# OpenGL.GL without one having been selected.  If something else imported
+# from OpenGL first, PyOpenGL's options are left as they are, and the profile
+# is 'default'.
+ENVIRONMENT_VARIABLE = 'GLX_GL_PROFILE'
+
+_selected = None
+
+
+def select_gl_profile(name):
+    """
+    Selects the profile called name, a key of GL_PROFILES, by setting
+    PyOpenGL's options.  It must be called before anything is imported from
+    OpenGL.  Otherwise, it raises ValueError unless the profile is already
+    selected.
+    """
+    global _selected
+    if name not in GL_PROFILES:
+        raise ValueError(
+            f"Unknown GL profile {name!r}.  The profiles are "
+            f"{list(GL_PROFILES)}.")
+    if 'OpenGL._configflags' in sys.modules:
+        if name != gl_profile():
+            raise ValueError(
+                f"The GL profile {name!r} must be selected before anything "
+                f"is imported from OpenGL.")
+        return
+    for option, value in {**BASE_OPTIONS, **GL_PROFILES[name]}.items():
+        setattr(OpenGL, option, value)
+    _selected = name
+
+
+def gl_profile():
+    """
+    Returns the name of the selected profile, selecting the one named by the
+    environment variable GLX_GL_PROFILE, or 'default', if none has been.
+    """
+    global _selected
+    if _selected is None:
+        if 'OpenGL._configflags' in sys.modules:
+            _selected = 'default'
+        else:
+            select_gl_profile(os.environ.get(ENVIRONMENT_VARIABLE, 'default'))
+    return _selected
@@ -0,0 +1,283 @@
+from contextlib import contextmanager
+
+from .gl_importer import contextdata, extensions, gl
+from .gl_profiles import gl_profile
+from .wrappers import glGetInteger
+
+__all__ = ['Binding', 'GLState']
+
+
+class Binding:
+
+    """
+    A Binding caches the object that is bound to one OpenGL binding point,
+    e.g., the current program or the 2D texture of texture unit 3.
+
+    Contexts that need an object bound push it and pop it when they are done.
+    A bind is skipped when the object is already bound, and popping the last
+    object leaves it bound: unbinding is deferred until something else needs
+    the binding point.  When contexts nest, popping rebinds the object that
+    the enclosing context pushed.
+    """
+
+    __slots__ = ['bind_function', 'current', 'requested']
+
+    def __init__(self, bind_function):
+        """
+        * bind_function is a function of one argument, the object name, that
+          binds the object, e.g., glUseProgram.
+        """
+        self.bind_function = bind_function
+        # The bound object name, or None if it is unknown.
+        self.current = None
+        # The stack of object names pushed by open contexts.
+        self.requested = []
+
+    def bind(self, name):
+        if self.current != name:
+            self.bind_function(name)
+            self.current = name
+
+    def push(self, name):
+        self.bind(name)
+        self.requested.append(name)
+
+    def pop(self):
+        self.requested.pop()
+        if self.requested:
+            self.bind(self.requested[-1])
+
+    @contextmanager
+    def context(self, name):
+        self.push(name)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def unbind(self):
+        """
+        Binds zero unless an open context needs the binding point.
+        """
+        if not self.requested:
+            self.bind(0)
+
+    def forget(self, name):
+        """
+        Records that the object called name was deleted, which unbinds it.
+        """
+        if self.current == name:
+            self.current = 0
+
+    def invalidate(self):
+        self.current = None
+
+
+class GLState:
+
+    """
+    A GLState caches the bindings of one OpenGL context so that glx context
+    managers can skip redundant binds.  Use GLState.current() to get the
+    state of the current context.
+
+    The cache assumes that all binds of programs, vertex arrays, textures,
+    samplers, the active texture unit, primitive restart and the buffer and
+    framebuffer targets it is asked for go through it.  After code outside of
+    glx changes any of them, call invalidate.  Before handing the context to
+    code that expects nothing to be bound, call unbind_all.
+
+    The GLState also records the capabilities of the context:
+    * version: the OpenGL version as a tuple (major, minor).
+    * direct_state_access: whether objects can be edited without binding
+      them (OpenGL 4.5 or ARB_direct_state_access).
+    * vertex_attrib_binding: whether vertex attribute formats can be
+      separated from their buffer bindings (OpenGL 4.3 or
+      ARB_vertex_attrib_binding).
+    * max_vertex_attrib_relative_offset: the largest offset of an attribute
+      relative to its buffer binding.
+    * buffer_storage: whether buffers can have immutable storage that stays
+      mapped (OpenGL 4.4 or ARB_buffer_storage).
+    * multi_draw_indirect: whether many draws can be read from a buffer of
+      draw commands (OpenGL 4.3 or ARB_multi_draw_indirect).
+    Setting a capability to False before creating objects forces the
+    fallbacks.
+
+    debug_output is the DebugOutput installed in the context, if any.  The
+    debug profile installs one when the GLState is created.
+    """
+
+    CONTEXT_DATA_KEY = 'glx.gl_state'
+
+    def __init__(self):
+        self.program = Binding(gl.glUseProgram)
+        self.vertex_array = Binding(gl.glBindVertexArray)
+        self.active_texture_unit = None
+        # The primitive restart index, None if primitive restart is disabled,
+        # or -1 if it is unknown.
+        self.primitive_restart_index = None
+        # Maps from (texture unit, target), texture unit, buffer target,
+        # (buffer target, index), and framebuffer target to Binding.
+        self.textures = {}
+        self.samplers = {}
+        self.buffers = {}
+        self.indexed_buffers = {}
+        self.framebuffers = {}
+        self.debug_output = None
+
+        self.version = (glGetInteger(gl.GL_MAJOR_VERSION),
+                        glGetInteger(gl.GL_MINOR_VERSION))
+        self.direct_state_access = (
+            self.version >= (4, 5)
+            or extensions.hasGLExtension('GL_ARB_direct_state_access'))
+        self.vertex_attrib_binding = (
+            self.version >= (4, 3)
+            or extensions.hasGLExtension('GL_ARB_vertex_attrib_binding'))
+        self.max_vertex_attrib_relative_offset = (
+            glGetInteger(gl.GL_MAX_VERTEX_ATTRIB_RELATIVE_OFFSET)
+            if self.vertex_attrib_binding
+            else 0)
+        self.buffer_storage = (
+            self.version >= (4, 4)
+            or extensions.hasGLExtension('GL_ARB_buffer_storage'))
+        self.multi_draw_indirect = (
+            self.version >= (4, 3)
+            or extensions.hasGLExtension('GL_ARB_multi_draw_indirect'))
+
+    @classmethod
+    def current(cls):
+        state = contextdata.getValue(cls.CONTEXT_DATA_KEY)
+        if state is None:
+            state = cls()
+            contextdata.setValue(cls.CONTEXT_DATA_KEY, state)
+            if gl_profile() == 'debug':
+                from .debug_output import DebugOutput
+                DebugOutput().install()
+        return state
+
+    # New methods -------------------------------------------------------------
+    def active_texture(self, texture_unit):
+        if self.active_texture_unit != texture_unit:
+            gl.glActiveTexture(gl.GL_TEXTURE0 + texture_unit)
+            self.active_texture_unit = texture_unit
+
+    def primitive_restart(self, restart_index):
+        """
+        Enables primitive restart at restart_index, or disables it if
+        restart_index is None.
+        """
+        current = self.primitive_restart_index
+        if restart_index == current:
+            return
+        if restart_index is None:
+            gl.glDisable(gl.GL_PRIMITIVE_RESTART)
+        else:
+            if current is None or current == -1:
+                gl.glEnable(gl.GL_PRIMITIVE_RESTART)
+            gl.glPrimitiveRestartIndex(restart_index)
+        self.primitive_restart_index = restart_index
+
+    def texture(self, texture_unit, target):
+        """
+        Returns the Binding of target, e.g., GL_TEXTURE_2D, in texture_unit.
+        """
+        try:
+            return self.textures[texture_unit, target]
+        except KeyError:
+            def bind_texture(texture):
+                self.active_texture(texture_unit)
+                gl.glBindTexture(target, texture)
+            binding = Binding(bind_texture)
+            self.textures[texture_unit, target] = binding
+            return binding
+
+    def sampler(self, texture_unit):
+        """
+        Returns the Binding of the sampler object of texture_unit.
+        """
+        try:
+            return self.samplers[texture_unit]
+        except KeyError:
+            binding = Binding(
+                lambda sampler: gl.glBindSampler(texture_unit, sampler))
+            self.samplers[texture_unit] = binding
+            return binding
+
+    def buffer(self, target):
+        """
+        Returns the Binding of the buffer target, e.g., GL_COPY_WRITE_BUFFER.
+        GL_ELEMENT_ARRAY_BUFFER must not be tracked because its binding is
+        part of the vertex array's state.
+        """
+        try:
+            return self.buffers[target]
+        except KeyError:
+            if target == gl.GL_ELEMENT_ARRAY_BUFFER:
+                raise ValueError(
+                    "The element array buffer binding belongs to the vertex "
+                    "array.")
+            binding = Binding(
+                lambda buffer_index: gl.glBindBuffer(target, buffer_index))
+            self.buffers[target] = binding
+            return binding
+
+    def indexed_buffer(self, target, index):
+        """
+        Returns the Binding of the binding point index of the indexed buffer
+        target, e.g., a uniform block binding point of GL_UNIFORM_BUFFER.
+        Binding a buffer there also binds it to the generic target.
+        """
+        try:
+            return self.indexed_buffers[target, index]
+        except KeyError:
+            def bind_buffer_base(buffer_index):
+                gl.glBindBufferBase(target, index, buffer_index)
+                self.buffer(target).invalidate()
+            binding = Binding(bind_buffer_base)
+            self.indexed_buffers[target, index] = binding
+            return binding
+
+    def forget_buffer(self, buffer_index):
+        for binding in self.buffers.values():
+            binding.forget(buffer_index)
+        for binding in self.indexed_buffers.values():
+            binding.forget(buffer_index)
+
+    def framebuffer(self, target):
+        """
+        Returns the Binding of the framebuffer target, GL_DRAW_FRAMEBUFFER or
+        GL_READ_FRAMEBUFFER.  GL_FRAMEBUFFER must not be used because it
+        binds both.
+        """
+        try:
+            return self.framebuffers[target]
+        except KeyError:
+            if target not in (gl.GL_DRAW_FRAMEBUFFER, gl.GL_READ_FRAMEBUFFER):
+                raise ValueError(
+                    "Bind the draw and read framebuffers separately.")
+            binding = Binding(
+                lambda framebuffer: gl.glBindFramebuffer(target, framebuffer))
+            self.framebuffers[target] = binding
+            return binding
+
+    def forget_framebuffer(self, framebuffer):
+        for binding in self.framebuffers.values():
+            binding.forget(framebuffer)
+
+    def bindings(self):
+        yield self.program
+        yield self.vertex_array
+        yield from self.textures.values()
+        yield from self.samplers.values()
+        yield from self.buffers.values()
+        yield from self.indexed_buffers.values()
+        yield from self.framebuffers.values()
+
+    def unbind_all(self):
+        for binding in self.bindings():
+            binding.unbind()
+
+    def invalidate(self):
+        self.active_texture_unit = None
+        self.primitive_restart_index = -1
+        for binding in self.bindings():
+            binding.invalidate()
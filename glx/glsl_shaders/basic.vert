@@ -1,8 +1,12 @@
 #version 330
 
+layout (std140, row_major) uniform Camera
+{
+    mat4 projection;
+    mat4 view;
+};
+
 uniform vec4 color;
-uniform mat4 projection;
-uniform mat4 view;
 uniform mat4 model;
 
 in vec2 vertex;
@@ -1,8 +1,13 @@
 #version 330
 
+layout (std140, row_major) uniform Camera
+{
+    mat4 projection;
+    mat4 view;
+};
+
 uniform sampler2D font_atlas;
 uniform sampler1D code_to_texture;
-uniform mat4 projection;
 uniform vec2 vertex_offset;  // in view space.
 uniform vec4 color;
 uniform float gamma;
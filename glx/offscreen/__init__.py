@@ -0,0 +1,4 @@
+from .batch_renderer import *
+from .framebuffer import *
+from .offscreen_context import *
+from .readback_ring import *
@@ -0,0 +1,86 @@
+import itertools
+import multiprocessing
+
+from .framebuffer import Framebuffer
+from .offscreen_context import OffscreenContext
+from .readback_ring import ReadbackRing
+
+__all__ = ['render_batch']
+
+# The state of a worker process: its OffscreenContext, its Framebuffer, its
+# ReadbackRing, the result of the setup function, the render function and the
+# clear color.
+_worker = None
+
+
+def _initialize_worker(setup, render, width, height, samples, version,
+                       clear_color):
+    global _worker
+    context = OffscreenContext(version)
+    framebuffer = Framebuffer(width, height, samples)
+    ring = ReadbackRing(width, height)
+    state = None if setup is None else setup()
+    _worker = (context, framebuffer, ring, state, render, clear_color)
+
+
+def _render_jobs(jobs):
+    """
+    Renders a chunk of jobs.  Each readback is collected while the GPU draws
+    the following jobs.
+    """
+    _, framebuffer, ring, state, render, clear_color = _worker
+    images = []
+    for job in jobs:
+        framebuffer.clear(clear_color)
+        with framebuffer.bind_context():
+            render(state, job)
+        if ring.full:
+            images.append(ring.collect().copy())
+        ring.start(framebuffer)
+    while ring.pending:
+        images.append(ring.collect().copy())
+    return images
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def render_batch(render, jobs, width, height, setup=None, samples=0,
+                 version=(4, 5), clear_color=(0.0, 0.0, 0.0, 0.0),
+                 processes=None, chunksize=8):
+    """
+    Renders one image per job in a pool of worker processes, each of which
+    creates its own OffscreenContext and Framebuffer, and yields the images in
+    the order of jobs as returned by Framebuffer.read.
+    * render is a function render(state, job) that draws job, e.g., a chart
+      description, into the bound and cleared framebuffer.
+    * setup is None or a function of no arguments that is called once per
+      worker after its context is created.  Its return value, e.g., a Font
+      and a BasicShaderProgram, is passed to render as state so that
+      shaders and glyphs are prepared once per worker instead of once per
+      image.
+    * width, height and samples are as for Framebuffer.
+    * version is as for OffscreenContext.
+    * clear_color is the RGBA color that each image starts from.
+    * processes is the number of workers, which defaults to the number of
+      CPUs.
+    * chunksize is the number of jobs sent to a worker at once.  Within a
+      chunk, workers read images back through a ReadbackRing so that drawing
+      and reading overlap.
+    Workers are started with the spawn method because forked workers would
+    inherit the OpenGL state of this process, so render, setup and the jobs
+    must be picklable, e.g., render and setup must be defined at module level.
+    """
+    pool = multiprocessing.get_context('spawn').Pool(
+        processes,
+        _initialize_worker,
+        (setup, render, width, height, samples, version, clear_color))
+    with pool:
+        for images in pool.imap(_render_jobs, _chunks(jobs, chunksize)):
+            yield from images
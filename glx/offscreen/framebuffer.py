@@ -0,0 +1,167 @@
+from contextlib import contextmanager
+
+import numpy as np
+
+from ..debug_output import register_object
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..wrappers import glCreateName, glDeleteNames, glGenName
+
+__all__ = ['Framebuffer']
+
+
+class Framebuffer:
+
+    """
+    A Framebuffer is an offscreen render target made of a color renderbuffer
+    and a depth-stencil renderbuffer.  Whatever is drawn inside bind_context,
+    e.g., with a DisplayList or a BasicShaderProgram, lands in it, and read
+    copies the color renderbuffer into a numpy array.  To read without
+    waiting for the GPU, use a ReadbackRing.
+    """
+
+    COLOR_FORMAT = gl.GL_RGBA8
+    DEPTH_STENCIL_FORMAT = gl.GL_DEPTH24_STENCIL8
+
+    def __init__(self, width, height, samples=0):
+        """
+        * width and height are the size of the render target in pixels.
+        * samples is the number of samples per pixel for multisample
+          antialiasing, or zero to render without multisampling.  A
+          multisampled framebuffer is resolved into a second, single-sample
+          framebuffer when it is read.
+        """
+        self.width = width
+        self.height = height
+        self.samples = samples
+        self.renderbuffers = []
+        # The GL framebuffer that is drawn into.
+        self.framebuffer = self.create_framebuffer(
+            samples,
+            [(gl.GL_COLOR_ATTACHMENT0, self.COLOR_FORMAT),
+             (gl.GL_DEPTH_STENCIL_ATTACHMENT, self.DEPTH_STENCIL_FORMAT)])
+        # The GL framebuffer that is read from.
+        self.resolve_framebuffer = (
+            self.create_framebuffer(
+                0, [(gl.GL_COLOR_ATTACHMENT0, self.COLOR_FORMAT)])
+            if samples
+            else self.framebuffer)
+        register_object(gl.GL_FRAMEBUFFER, self.framebuffer, self)
+        register_object(gl.GL_FRAMEBUFFER, self.resolve_framebuffer, self)
+
+    def create_framebuffer(self, samples, attachments):
+        """
+        Returns a new framebuffer with a renderbuffer of each
+        (attachment, internal format) pair in attachments.
+        """
+        state = GLState.current()
+        if state.direct_state_access:
+            framebuffer = glCreateName(gl.glCreateFramebuffers)
+            for attachment, internal_format in attachments:
+                renderbuffer = glCreateName(gl.glCreateRenderbuffers)
+                gl.glNamedRenderbufferStorageMultisample(
+                    renderbuffer, samples, internal_format, self.width,
+                    self.height)
+                gl.glNamedFramebufferRenderbuffer(
+                    framebuffer, attachment, gl.GL_RENDERBUFFER, renderbuffer)
+                self.renderbuffers.append(renderbuffer)
+            status = gl.glCheckNamedFramebufferStatus(
+                framebuffer, gl.GL_DRAW_FRAMEBUFFER)
+        else:
+            framebuffer = glGenName(gl.glGenFramebuffers)
+            binding = state.framebuffer(gl.GL_DRAW_FRAMEBUFFER)
+            with binding.context(framebuffer):
+                for attachment, internal_format in attachments:
+                    renderbuffer = glGenName(gl.glGenRenderbuffers)
+                    gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, renderbuffer)
+                    gl.glRenderbufferStorageMultisample(
+                        gl.GL_RENDERBUFFER, samples, internal_format,
+                        self.width, self.height)
+                    gl.glFramebufferRenderbuffer(
+                        gl.GL_DRAW_FRAMEBUFFER, attachment,
+                        gl.GL_RENDERBUFFER, renderbuffer)
+                    self.renderbuffers.append(renderbuffer)
+                gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, 0)
+                status = gl.glCheckFramebufferStatus(gl.GL_DRAW_FRAMEBUFFER)
+        if status != gl.GL_FRAMEBUFFER_COMPLETE:
+            raise Exception(f"The framebuffer is incomplete: {status}.")
+        return framebuffer
+
+    def delete(self):
+        assert self.framebuffer is not None
+        state = GLState.current()
+        for framebuffer in {self.framebuffer, self.resolve_framebuffer}:
+            glDeleteNames(gl.glDeleteFramebuffers, [framebuffer])
+            state.forget_framebuffer(framebuffer)
+        glDeleteNames(gl.glDeleteRenderbuffers, self.renderbuffers)
+        self.framebuffer = None
+        self.resolve_framebuffer = None
+        self.renderbuffers = []
+
+    @contextmanager
+    def bind_context(self):
+        """
+        Binds the framebuffer for drawing and sets the viewport to cover it.
+        The viewport is restored afterwards.
+        """
+        binding = GLState.current().framebuffer(gl.GL_DRAW_FRAMEBUFFER)
+        viewport = gl.glGetIntegerv(gl.GL_VIEWPORT)
+        with binding.context(self.framebuffer):
+            gl.glViewport(0, 0, self.width, self.height)
+            try:
+                yield
+            finally:
+                gl.glViewport(*viewport)
+
+    def clear(self, color=(0.0, 0.0, 0.0, 0.0)):
+        """
+        Clears the color renderbuffer to color, an RGBA tuple, and resets the
+        depth and stencil renderbuffer.
+        """
+        with self.bind_context():
+            gl.glClearColor(*color)
+            gl.glClear(gl.GL_COLOR_BUFFER_BIT
+                       | gl.GL_DEPTH_BUFFER_BIT
+                       | gl.GL_STENCIL_BUFFER_BIT)
+
+    def resolve(self):
+        """
+        Averages the samples of a multisampled framebuffer into the resolve
+        framebuffer.  Does nothing without multisampling.
+        """
+        if not self.samples:
+            return
+        state = GLState.current()
+        if state.direct_state_access:
+            gl.glBlitNamedFramebuffer(
+                self.framebuffer, self.resolve_framebuffer,
+                0, 0, self.width, self.height,
+                0, 0, self.width, self.height,
+                gl.GL_COLOR_BUFFER_BIT, gl.GL_NEAREST)
+        else:
+            state.framebuffer(gl.GL_READ_FRAMEBUFFER).bind(self.framebuffer)
+            with state.framebuffer(gl.GL_DRAW_FRAMEBUFFER).context(
+                    self.resolve_framebuffer):
+                gl.glBlitFramebuffer(
+                    0, 0, self.width, self.height,
+                    0, 0, self.width, self.height,
+                    gl.GL_COLOR_BUFFER_BIT, gl.GL_NEAREST)
+
+    def read(self):
+        """
+        Returns the color renderbuffer as a numpy array of shape
+        (height, width, 4) and dtype uint8 whose first row is the top of the
+        image, as image libraries expect.
+        """
+        self.resolve()
+        pixels = np.empty((self.height, self.width, 4), dtype=np.uint8)
+        state = GLState.current()
+        state.framebuffer(gl.GL_READ_FRAMEBUFFER).bind(
+            self.resolve_framebuffer)
+        # A bound pixel pack buffer, e.g., left by a ReadbackRing, would
+        # receive the pixels instead.
+        state.buffer(gl.GL_PIXEL_PACK_BUFFER).unbind()
+        gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA,
+                        gl.GL_UNSIGNED_BYTE, pixels)
+        # OpenGL stores the bottom row first.
+        return np.ascontiguousarray(pixels[::-1])
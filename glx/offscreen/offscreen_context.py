@@ -0,0 +1,184 @@
+import ctypes
+import os
+from contextlib import contextmanager
+
+import numpy as np
+
+from ..gl_importer import contextdata, gl
+from ..gl_profiles import gl_profile
+from ..gl_state import GLState
+
+__all__ = ['OffscreenContext']
+
+
+class OffscreenContext:
+
+    """
+    An OffscreenContext is an OpenGL context that is created without a window
+    through EGL or OSMesa, e.g., to render images on a server.  It has no
+    default framebuffer, so draw into a Framebuffer.
+
+    PyOpenGL chooses how it loads OpenGL functions when OpenGL is first
+    imported, so the environment variable PYOPENGL_PLATFORM must be set to
+    'egl' or 'osmesa' before glx is imported.
+    """
+
+    # The EGL platform of Mesa's surfaceless displays, which need neither a
+    # display server nor a GPU device to be named.
+    EGL_PLATFORM_SURFACELESS_MESA = 0x31DD
+
+    def __init__(self, version=(4, 5), platform=None):
+        """
+        * version is the (major, minor) version of the core profile context
+          to create.
+        * platform is 'egl' or 'osmesa', and defaults to PYOPENGL_PLATFORM.
+        The context is made current.
+        """
+        if platform is None:
+            platform = os.environ.get('PYOPENGL_PLATFORM')
+        if platform not in ('egl', 'osmesa'):
+            raise ValueError(
+                "Set PYOPENGL_PLATFORM to 'egl' or 'osmesa' before importing "
+                "glx to create an offscreen context.")
+        self.platform = platform
+        self.version = version
+        self.display = None
+        self.context = None
+        # OSMesa requires a color buffer to make a context current even
+        # though glx renders into framebuffer objects.
+        self.osmesa_buffer = None
+        if platform == 'egl':
+            self.create_egl_context()
+        else:
+            self.create_osmesa_context()
+        self.make_current()
+
+    # New methods -------------------------------------------------------------
+    def create_egl_context(self):
+        # PyOpenGL's EGL error module only defines its error checker when
+        # ERROR_CHECKING is on, yet EGL needs it to import.
+        from OpenGL.raw.EGL import _errors
+        if not hasattr(_errors, '_error_checker'):
+            _errors._error_checker = None
+        from OpenGL import EGL
+
+        self.display = self.egl_display()
+        config = EGL.EGLConfig()
+        count = EGL.EGLint()
+        # eglChooseConfig asks for window surfaces by default, which
+        # surfaceless displays lack.
+        attributes = (EGL.EGLint * 5)(EGL.EGL_SURFACE_TYPE,
+                                      EGL.EGL_PBUFFER_BIT,
+                                      EGL.EGL_RENDERABLE_TYPE,
+                                      EGL.EGL_OPENGL_BIT,
+                                      EGL.EGL_NONE)
+        if (not EGL.eglChooseConfig(self.display, attributes,
+                                    ctypes.pointer(config), 1,
+                                    ctypes.pointer(count))
+                or not count.value):
+            raise Exception("No EGL configuration supports OpenGL.")
+        EGL.eglBindAPI(EGL.EGL_OPENGL_API)
+        major, minor = self.version
+        context_attributes = [EGL.EGL_CONTEXT_MAJOR_VERSION, major,
+                              EGL.EGL_CONTEXT_MINOR_VERSION, minor,
+                              EGL.EGL_CONTEXT_OPENGL_PROFILE_MASK,
+                              EGL.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT]
+        if gl_profile() == 'debug':
+            # Drivers may report more through GL_KHR_debug in debug contexts.
+            context_attributes += [EGL.EGL_CONTEXT_OPENGL_DEBUG, EGL.EGL_TRUE]
+        context_attributes.append(EGL.EGL_NONE)
+        context_attributes = (EGL.EGLint * len(context_attributes))(
+            *context_attributes)
+        self.context = EGL.eglCreateContext(self.display, config,
+                                            EGL.EGL_NO_CONTEXT,
+                                            context_attributes)
+        if not self.context:
+            raise Exception(
+                f"Couldn't create an OpenGL {major}.{minor} context through "
+                f"EGL.")
+
+    def egl_display(self):
+        """
+        Returns the initialized default EGL display, or a surfaceless display
+        if there is no display server.
+        """
+        from OpenGL import EGL
+
+        try:
+            display = EGL.eglGetDisplay(EGL.EGL_DEFAULT_DISPLAY)
+            if display and EGL.eglInitialize(display, None, None):
+                return display
+        except EGL.EGLError:
+            pass
+        display = EGL.eglGetPlatformDisplay(
+            self.EGL_PLATFORM_SURFACELESS_MESA, None, None)
+        if not display or not EGL.eglInitialize(display, None, None):
+            raise Exception("Couldn't initialize an EGL display.")
+        return display
+
+    def create_osmesa_context(self):
+        from OpenGL import osmesa
+
+        major, minor = self.version
+        attributes = np.array([osmesa.OSMESA_PROFILE,
+                               osmesa.OSMESA_CORE_PROFILE,
+                               osmesa.OSMESA_CONTEXT_MAJOR_VERSION, major,
+                               osmesa.OSMESA_CONTEXT_MINOR_VERSION, minor,
+                               0],
+                              dtype=np.int32)
+        self.context = osmesa.OSMesaCreateContextAttribs(attributes, None)
+        if not self.context:
+            raise Exception(
+                f"Couldn't create an OpenGL {major}.{minor} context through "
+                f"OSMesa.")
+        self.osmesa_buffer = np.zeros((1, 1, 4), dtype=np.uint8)
+
+    def make_current(self):
+        if self.platform == 'egl':
+            from OpenGL import EGL
+            if not EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE,
+                                      EGL.EGL_NO_SURFACE, self.context):
+                raise Exception("Couldn't make the EGL context current.")
+        else:
+            from OpenGL import osmesa
+            if not osmesa.OSMesaMakeCurrent(self.context,
+                                            self.osmesa_buffer,
+                                            gl.GL_UNSIGNED_BYTE, 1, 1):
+                raise Exception("Couldn't make the OSMesa context current.")
+
+    def release(self):
+        """
+        Leaves no context current in this thread.
+        """
+        if self.platform == 'egl':
+            from OpenGL import EGL
+            EGL.eglMakeCurrent(self.display, EGL.EGL_NO_SURFACE,
+                               EGL.EGL_NO_SURFACE, EGL.EGL_NO_CONTEXT)
+        else:
+            from OpenGL import osmesa
+            osmesa.OSMesaMakeCurrent(None, None, gl.GL_UNSIGNED_BYTE, 0, 0)
+
+    @contextmanager
+    def current_context(self):
+        self.make_current()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def delete(self):
+        """
+        Destroys the context.  The objects created in it, and the GLState
+        that caches its bindings, are discarded with it.
+        """
+        assert self.context is not None
+        self.make_current()
+        contextdata.delValue(GLState.CONTEXT_DATA_KEY)
+        self.release()
+        if self.platform == 'egl':
+            from OpenGL import EGL
+            EGL.eglDestroyContext(self.display, self.context)
+        else:
+            from OpenGL import osmesa
+            osmesa.OSMesaDestroyContext(self.context)
+        self.context = None
@@ -0,0 +1,142 @@
+import ctypes
+from collections import deque
+
+import numpy as np
+
+from ..gl_importer import gl, raw_gl_1_0
+from ..gl_state import GLState
+from ..shader_program import Fence
+from ..shader_program.buffer_functions import (EDIT_TARGET, buffer_data,
+                                               create_buffer, delete_buffer)
+
+__all__ = ['ReadbackRing']
+
+
+class ReadbackRing:
+
+    """
+    A ReadbackRing reads framebuffers back without stalling.  A synchronous
+    glReadPixels waits until the GPU has finished every command that draws
+    into the framebuffer.  Instead, start has glReadPixels copy into a pixel
+    pack buffer and places a Fence, and collect returns the pixels a frame or
+    two later, by which time the copy has usually finished.  The buffers are
+    used in turn so that several readbacks can be in flight.
+
+    Use it like this, e.g., to export video:
+
+        for frame in frames:
+            draw(framebuffer, frame)
+            if ring.full:
+                write(ring.collect())
+            ring.start(framebuffer)
+        while ring.pending:
+            write(ring.collect())
+    """
+
+    def __init__(self, width, height, slots=3):
+        """
+        * width and height are the size of the framebuffers that are read.
+        * slots is the number of pixel pack buffers, and so the largest
+          number of readbacks in flight.
+        """
+        self.width = width
+        self.height = height
+        self.nbytes = width * height * 4
+        self.buffers = [create_buffer() for _ in range(slots)]
+        for buffer_index in self.buffers:
+            buffer_data(buffer_index, None, gl.GL_STREAM_READ, self.nbytes)
+        self.fences = [Fence() for _ in self.buffers]
+        # The numpy array mapped to each buffer, or None if it is unmapped.
+        self.arrays = [None for _ in self.buffers]
+        # The slots of the readbacks in flight, oldest first.
+        self.pending = deque()
+        # The slot that the next readback uses.
+        self.slot = 0
+
+    # Properties --------------------------------------------------------------
+    @property
+    def full(self):
+        """
+        Whether every slot has a readback in flight, in which case collect
+        must be called before start.
+        """
+        return len(self.pending) == len(self.buffers)
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        for slot, buffer_index in enumerate(self.buffers):
+            self.fences[slot].delete()
+            self.unmap(slot)
+            delete_buffer(buffer_index)
+        self.buffers = []
+        self.pending.clear()
+
+    def start(self, framebuffer):
+        """
+        Starts reading framebuffer, a Framebuffer, into the next slot.  The
+        array that collect returned for that slot becomes invalid.
+        """
+        if self.full:
+            raise ValueError("Collect a readback before starting another.")
+        if (framebuffer.width, framebuffer.height) != (self.width,
+                                                       self.height):
+            raise ValueError("The framebuffer doesn't match the ring's size.")
+        slot = self.slot
+        self.slot = (slot + 1) % len(self.buffers)
+        self.unmap(slot)
+        framebuffer.resolve()
+        state = GLState.current()
+        state.framebuffer(gl.GL_READ_FRAMEBUFFER).bind(
+            framebuffer.resolve_framebuffer)
+        with state.buffer(gl.GL_PIXEL_PACK_BUFFER).context(
+                self.buffers[slot]):
+            # With a pixel pack buffer bound, the pointer argument is an
+            # offset into it.
+            raw_gl_1_0.glReadPixels(0, 0, self.width, self.height,
+                                    gl.GL_RGBA, gl.GL_UNSIGNED_BYTE,
+                                    ctypes.c_void_p(0))
+        self.fences[slot].place()
+        self.pending.append(slot)
+
+    def ready(self):
+        """
+        Returns whether collect would return without waiting.
+        """
+        return bool(self.pending) and self.fences[self.pending[0]].signaled()
+
+    def collect(self):
+        """
+        Waits for the oldest readback in flight and returns its pixels as for
+        Framebuffer.read.  The array is a view of the mapped buffer, which is
+        valid until its slot is started again, so copy it to keep it longer.
+        """
+        if not self.pending:
+            raise ValueError("No readback is in flight.")
+        slot = self.pending.popleft()
+        self.fences[slot].wait()
+        state = GLState.current()
+        if state.direct_state_access:
+            address = gl.glMapNamedBufferRange(
+                self.buffers[slot], 0, self.nbytes, gl.GL_MAP_READ_BIT)
+        else:
+            state.buffer(EDIT_TARGET).bind(self.buffers[slot])
+            address = gl.glMapBufferRange(EDIT_TARGET, 0, self.nbytes,
+                                          gl.GL_MAP_READ_BIT)
+        if not address:
+            raise Exception("Couldn't map the buffer.")
+        mapping = (ctypes.c_ubyte * self.nbytes).from_address(address)
+        self.arrays[slot] = np.frombuffer(mapping, dtype=np.uint8).reshape(
+            (self.height, self.width, 4))
+        # OpenGL stores the bottom row first.
+        return self.arrays[slot][::-1]
+
+    def unmap(self, slot):
+        if self.arrays[slot] is None:
+            return
+        self.arrays[slot] = None
+        state = GLState.current()
+        if state.direct_state_access:
+            gl.glUnmapNamedBuffer(self.buffers[slot])
+        else:
+            state.buffer(EDIT_TARGET).bind(self.buffers[slot])
+            gl.glUnmapBuffer(EDIT_TARGET)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from rectangle import Rect
+
+from ..gl_importer import gl
+from ..shader_programs import BasicShaderProgram, CameraBlock
+from ..viewport import OrthoProjection, OrthoView, Viewport
+from .batch_renderer import render_batch
+from .framebuffer import Framebuffer
+from .readback_ring import ReadbackRing
+
+WIDTH = 16
+HEIGHT = 8
+
+
+def _setup():
+    camera_block = CameraBlock()
+    # Put the scene origin at the bottom left of the widget.
+    Viewport(OrthoProjection(Rect(sizes=[WIDTH, HEIGHT])),
+             OrthoView(scroll=[0, -HEIGHT])).write_camera_block(camera_block)
+    return camera_block, BasicShaderProgram({'model': np.eye(4, dtype='f')})
+
+
+def _render(state, job):
+    """
+    Fills the rectangle of scene coördinates [0, width) × [0, height) with
+    color.
+    """
+    _, program = state
+    width, height, color = job
+    program.buffer.upload(
+        np.array([[0, 0], [width, 0], [0, height], [width, height]],
+                 dtype='f'))
+    with program.bind_context({'color': np.array(color, dtype='f')}):
+        program.vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP)
+
+
+def _expected(job):
+    width, height, color = job
+    image = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    image[HEIGHT - height:, :width] = np.round(np.array(color) * 255)
+    return image
+
+
+JOBS = [(4, 2, (1.0, 0.0, 0.0, 1.0)),
+        (16, 8, (0.0, 1.0, 0.0, 1.0)),
+        (8, 4, (0.0, 0.0, 1.0, 1.0))]
+
+
+@pytest.mark.parametrize('samples', [0, 4])
+def test_read(context, samples):
+    state = _setup()
+    framebuffer = Framebuffer(WIDTH, HEIGHT, samples)
+    for job in JOBS:
+        framebuffer.clear()
+        with framebuffer.bind_context():
+            _render(state, job)
+        # The bottom of the scene is the last row of the image.
+        assert_array_equal(framebuffer.read(), _expected(job))
+    framebuffer.delete()
+
+
+def test_render_batch(context):
+    images = list(render_batch(_render, JOBS, WIDTH, HEIGHT, _setup,
+                               processes=2))
+    assert len(images) == len(JOBS)
+    for image, job in zip(images, JOBS):
+        assert_array_equal(image, _expected(job))
+
+
+def test_readback_ring(context):
+    state = _setup()
+    framebuffer = Framebuffer(WIDTH, HEIGHT)
+    ring = ReadbackRing(WIDTH, HEIGHT, slots=2)
+    images = []
+    for job in JOBS:
+        framebuffer.clear()
+        with framebuffer.bind_context():
+            _render(state, job)
+        if ring.full:
+            images.append(ring.collect().copy())
+        ring.start(framebuffer)
+    with pytest.raises(ValueError):
+        ring.start(framebuffer)
+    while ring.pending:
+        images.append(ring.collect().copy())
+    assert not ring.ready()
+    for image, job in zip(images, JOBS):
+        assert_array_equal(image, _expected(job))
+    # The synchronous read isn't disturbed by the pixel pack buffers.
+    assert_array_equal(framebuffer.read(), _expected(JOBS[-1]))
+    ring.delete()
+    framebuffer.delete()
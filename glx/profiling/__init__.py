@@ -0,0 +1,3 @@
+from .gpu_timer import *
+from .rolling_statistics import *
+from .tracer import *
@@ -0,0 +1,173 @@
+import functools
+from collections import deque
+from contextlib import contextmanager
+
+from ..gl_importer import gl
+from ..wrappers import glDeleteNames, glGenName
+from .hooks import patch_methods, restore_methods
+from .rolling_statistics import RollingStatistics
+
+__all__ = ['GPUTimer']
+
+
+class GPUTimer:
+
+    """
+    A GPUTimer measures how long the GPU spends on named passes, and keeps
+    rolling statistics of the durations of each pass.
+
+    Each pass is bracketed by two GL_TIMESTAMP queries rather than measured by
+    a GL_TIME_ELAPSED query, because only one GL_TIME_ELAPSED query can be
+    active at a time whereas passes nest, e.g., ShaderProgram.bind_context
+    within Font.draw_context.  The queries are read a few frames late, once
+    their results are available, so measuring never stalls the pipeline.
+    Queries are recycled through a pool.
+
+    Use it like this:
+
+        timer = GPUTimer()
+        timer.install()
+        while running:
+            with timer.pass_context('labels'):
+                ...
+            timer.end_frame()
+        export(timer.summaries())
+    """
+
+    # The installed GPUTimer, if any.
+    installed = None
+
+    def __init__(self, window=240):
+        """
+        * window is the number of most recent durations of each pass that are
+          summarized.
+        """
+        self.window = window
+        # The query names that are free for reuse.
+        self.free_queries = []
+        # The (name, start query, stop query) triples of the passes of the
+        # current frame in the order that they ended.
+        self.passes = []
+        # The passes of the ended frames whose results haven't been read,
+        # oldest first.
+        self.pending = deque()
+        # A map from pass name to the RollingStatistics of its durations in
+        # seconds.
+        self.statistics = {}
+        self.patches = []
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        self.uninstall()
+        queries = list(self.free_queries)
+        for passes in [self.passes, *self.pending]:
+            for _, start, stop in passes:
+                queries.extend((start, stop))
+        if queries:
+            glDeleteNames(gl.glDeleteQueries, queries)
+        self.free_queries = []
+        self.passes = []
+        self.pending.clear()
+
+    def install(self):
+        """
+        Times Font.draw_context and ShaderProgram.bind_context, as passes
+        named after the class of the font or program, until uninstall is
+        called.
+        """
+        from ..font import Font
+        from ..shader_program import ShaderProgram
+
+        if GPUTimer.installed is not None:
+            raise ValueError("A GPUTimer is already installed.")
+
+        def wrap(method, cls):
+            @functools.wraps(method)
+            @contextmanager
+            def timed_context(instance, *args, **kwargs):
+                with self.pass_context(type(instance).__name__), \
+                        method(instance, *args, **kwargs) as value:
+                    yield value
+            return timed_context
+
+        self.patches = patch_methods([(Font, 'draw_context'),
+                                      (ShaderProgram, 'bind_context')],
+                                     wrap)
+        GPUTimer.installed = self
+
+    def uninstall(self):
+        if GPUTimer.installed is not self:
+            return
+        restore_methods(self.patches)
+        self.patches = []
+        GPUTimer.installed = None
+
+    def query(self):
+        if self.free_queries:
+            return self.free_queries.pop()
+        return glGenName(gl.glGenQueries)
+
+    @contextmanager
+    def pass_context(self, name):
+        """
+        Times the GPU commands issued within the context as the pass name.
+        """
+        start = self.query()
+        gl.glQueryCounter(start, gl.GL_TIMESTAMP)
+        try:
+            yield
+        finally:
+            stop = self.query()
+            gl.glQueryCounter(stop, gl.GL_TIMESTAMP)
+            self.passes.append((name, start, stop))
+
+    def end_frame(self):
+        """
+        Ends the current frame and reads the results of earlier frames that
+        are available.
+        """
+        if self.passes:
+            self.pending.append(self.passes)
+            self.passes = []
+        self.collect()
+
+    def collect(self, wait=False):
+        """
+        Reads the results of the ended frames in order.  Stops at the first
+        frame whose results aren't available unless wait is true.
+        """
+        available = gl.GLint()
+        while self.pending:
+            passes = self.pending[0]
+            if not wait:
+                # Timestamps are recorded in order, so the stop query of the
+                # pass that ended last is the last to become available.
+                gl.glGetQueryObjectiv(passes[-1][2],
+                                      gl.GL_QUERY_RESULT_AVAILABLE,
+                                      available)
+                if not available.value:
+                    return
+            self.pending.popleft()
+            for name, start, stop in passes:
+                duration = (self.query_result(stop)
+                            - self.query_result(start)) * 1e-9
+                try:
+                    statistics = self.statistics[name]
+                except KeyError:
+                    statistics = RollingStatistics(self.window)
+                    self.statistics[name] = statistics
+                statistics.add(duration)
+                self.free_queries.extend((start, stop))
+
+    def query_result(self, query):
+        result = gl.GLuint64()
+        gl.glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT, result)
+        return result.value
+
+    def summaries(self):
+        """
+        Returns a map from pass name to the summary of its durations in
+        seconds as returned by RollingStatistics.summary.
+        """
+        return {name: statistics.summary()
+                for name, statistics in self.statistics.items()}
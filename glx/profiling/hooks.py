@@ -0,0 +1,23 @@
+__all__ = []
+
+
+def patch_methods(targets, wrap):
+    """
+    Replaces methods by instrumented versions.  Instrumentation that patches
+    methods only while it is installed costs nothing while it isn't.
+    * targets is an iterable of (class, method name) pairs.
+    * wrap is a function wrap(method, class) that returns the replacement.
+    Returns the list of (class, method name, method) triples that
+    restore_methods needs to undo the patches.
+    """
+    patches = []
+    for cls, name in targets:
+        method = cls.__dict__[name]
+        setattr(cls, name, wrap(method, cls))
+        patches.append((cls, name, method))
+    return patches
+
+
+def restore_methods(patches):
+    for cls, name, method in reversed(patches):
+        setattr(cls, name, method)
@@ -0,0 +1,49 @@
+from collections import deque
+
+import numpy as np
+
+__all__ = ['RollingStatistics']
+
+
+class RollingStatistics:
+
+    """
+    RollingStatistics summarizes the most recent samples of a measurement,
+    e.g., the durations of one pass over the last few seconds of frames.
+    """
+
+    def __init__(self, window=240):
+        """
+        * window is the number of most recent samples that are summarized.
+        """
+        self.samples = deque(maxlen=window)
+        # The number of samples ever added.
+        self.count = 0
+
+    # New methods -------------------------------------------------------------
+    def add(self, sample):
+        self.samples.append(sample)
+        self.count += 1
+
+    def mean(self):
+        return float(np.mean(self.samples)) if self.samples else 0.0
+
+    def percentile(self, q):
+        return float(np.percentile(self.samples, q)) if self.samples else 0.0
+
+    def summary(self):
+        """
+        Returns a dict of plain numbers that can be exported to a metrics
+        system.
+        """
+        return {'count': self.count,
+                'mean': self.mean(),
+                'p95': self.percentile(95),
+                'max': max(self.samples, default=0.0)}
+
+    # Magic methods -----------------------------------------------------------
+    def __repr__(self):
+        return (f"{type(self).__name__}("
+                f"count={self.count}, "
+                f"mean={self.mean():.6g}, "
+                f"p95={self.percentile(95):.6g})")
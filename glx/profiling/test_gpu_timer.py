@@ -0,0 +1,52 @@
+import numpy as np
+
+from ..gl_importer import gl
+from ..offscreen import Framebuffer
+from ..shader_program import ShaderProgram
+from ..shader_programs import BasicShaderProgram, CameraBlock
+from .gpu_timer import GPUTimer
+from .rolling_statistics import RollingStatistics
+
+
+def test_rolling_statistics():
+    statistics = RollingStatistics(window=100)
+    for sample in range(200):
+        statistics.add(float(sample))
+    summary = statistics.summary()
+    assert summary['count'] == 200
+    assert summary['mean'] == 149.5
+    assert summary['p95'] == np.percentile(np.arange(100, 200), 95)
+    assert summary['max'] == 199.0
+
+
+def test_gpu_timer(context):
+    bind_context = ShaderProgram.bind_context
+    camera_block = CameraBlock()
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    program.buffer.upload(np.array([[0, 0], [1, 0], [0, 1]], dtype='f'))
+    framebuffer = Framebuffer(8, 8)
+    timer = GPUTimer()
+    timer.install()
+    assert ShaderProgram.bind_context is not bind_context
+    frames = 5
+    for _ in range(frames):
+        with timer.pass_context('frame'), framebuffer.bind_context():
+            with program.bind_context({'color': np.ones(4, dtype='f')}):
+                program.vertex_array.draw_arrays(gl.GL_TRIANGLES)
+        timer.end_frame()
+    timer.uninstall()
+    assert ShaderProgram.bind_context is bind_context
+
+    timer.collect(wait=True)
+    summaries = timer.summaries()
+    assert set(summaries) == {'frame', 'BasicShaderProgram'}
+    for summary in summaries.values():
+        assert summary['count'] == frames
+        assert 0 <= summary['mean'] <= summary['max']
+    # Every query was returned to the pool.
+    assert not timer.pending
+    assert 4 <= len(timer.free_queries) <= 4 * frames
+    timer.delete()
+    framebuffer.delete()
+    program.delete_program()
+    camera_block.delete()
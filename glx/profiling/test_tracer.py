@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from ..shader_program import GLBuffer, ShaderProgram
+from ..shader_programs import BasicShaderProgram, CameraBlock
+from .tracer import Tracer
+
+
+def test_spans_and_counters(tmp_path):
+    tracer = Tracer()
+    with tracer.span_context('frame', index=3):
+        tracer.count('glyphs', 2)
+        tracer.count('glyphs')
+    assert tracer.counters['glyphs'] == 3
+    path = tmp_path / 'trace.json'
+    tracer.write(path)
+    events = json.loads(path.read_text())['traceEvents']
+    assert [(event['name'], event['ph']) for event in events] == [
+        ('glyphs', 'C'), ('glyphs', 'C'), ('frame', 'X')]
+    assert events[1]['args'] == {'glyphs': 3}
+    assert events[2]['args'] == {'index': 3}
+    assert events[2]['dur'] >= 0
+
+
+def test_install(context):
+    init = ShaderProgram.__init__
+    camera_block = CameraBlock()
+    tracer = Tracer()
+    tracer.install()
+    assert ShaderProgram.__init__ is not init
+    program = BasicShaderProgram()
+    program.buffer.upload(np.zeros((3, 2), dtype='f'))
+    buffer = GLBuffer(np.uint32)
+    buffer.write(np.arange(5, dtype=np.uint32), offset=2)
+    tracer.uninstall()
+    assert ShaderProgram.__init__ is init
+    buffer.upload(np.arange(5, dtype=np.uint32))
+
+    names = [event['name'] for event in tracer.events if event['ph'] == 'X']
+    assert names.count('Shader.__init__') == 2
+    assert 'ShaderProgram.__init__' in names
+    assert names.count('GLBuffer.upload') == 1
+    assert tracer.counters[Tracer.BYTES_UPLOADED] == 3 * 8 + 5 * 4
+    json.dumps(tracer.chrome_trace())
+    buffer.delete()
+    program.delete_program()
+    camera_block.delete()
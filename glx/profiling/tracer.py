@@ -0,0 +1,184 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .hooks import patch_methods, restore_methods
+
+__all__ = ['Tracer']
+
+
+class Tracer:
+
+    """
+    A Tracer records the time that glx spends on the CPU in text layout, glyph
+    rasterization, texture and buffer uploads and shader compilation, and
+    counts the bytes uploaded and the atlas rebuilds.  The records export as
+    Chrome trace events, which trace viewers such as Perfetto or
+    chrome://tracing show as a timeline.
+
+    The hooks patch the traced methods only while the tracer is installed, so
+    they cost nothing otherwise.
+
+    Use it like this:
+
+        tracer = Tracer()
+        tracer.install()
+        while running:
+            with tracer.span_context('frame'):
+                ...
+        tracer.uninstall()
+        tracer.write('glx.trace.json')
+    """
+
+    # The installed Tracer, if any.
+    installed = None
+
+    # The names of the counters.
+    BYTES_UPLOADED = 'bytes uploaded'
+    ATLAS_REBUILDS = 'atlas rebuilds'
+
+    def __init__(self):
+        # The trace events in the Chrome trace event format.
+        self.events = []
+        # A map from counter name to its total.
+        self.counters = {self.BYTES_UPLOADED: 0,
+                         self.ATLAS_REBUILDS: 0}
+        # The time from which the timestamps are measured.
+        self.origin = time.perf_counter()
+        self.patches = []
+
+    # New methods -------------------------------------------------------------
+    def traced_methods(self):
+        """
+        Returns a map from each traced (class, method name) pair to a function
+        of the instance and the method's return value that returns the number
+        of bytes that the call uploaded, or None if it uploads nothing.
+        """
+        from ..font import Atlas, CodeLookup, DisplayList, Font
+        from ..shader_program import (GLBuffer, Shader, ShaderProgram,
+                                      UniformBlock)
+
+        def buffer_bytes(buffer, count):
+            return count * buffer.dtype.itemsize
+
+        return {
+            (DisplayList, 'set_text'): None,
+            (DisplayList, 'regenerate'): None,
+            (Font, 'add_char'): None,
+            (Font, 'repopulate'): None,
+            (Atlas, 'add_char'): None,
+            (Atlas, 'update_texture'):
+                lambda atlas, _: atlas.texture_array.nbytes,
+            (CodeLookup, 'update_texture'):
+                lambda code_lookup, _: code_lookup.data[
+                    :code_lookup.used].nbytes,
+            (Shader, '__init__'): None,
+            (ShaderProgram, '__init__'): None,
+            (GLBuffer, 'upload'): buffer_bytes,
+            (GLBuffer, 'write'): buffer_bytes,
+            (UniformBlock, 'upload'):
+                lambda uniform_block, _: uniform_block.data.nbytes}
+
+    def install(self):
+        """
+        Traces the methods given by traced_methods until uninstall is called.
+        """
+        if Tracer.installed is not None:
+            raise ValueError("A Tracer is already installed.")
+        from ..font import Font
+
+        traced_methods = self.traced_methods()
+
+        def wrap(method, cls):
+            name = f'{cls.__name__}.{method.__name__}'
+            uploaded_bytes = traced_methods[cls, method.__name__]
+            rebuilds = cls is Font and method.__name__ == 'repopulate'
+
+            @functools.wraps(method)
+            def traced(instance, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = method(instance, *args, **kwargs)
+                finally:
+                    self.add_span(name, start, time.perf_counter())
+                if uploaded_bytes is not None:
+                    self.count(self.BYTES_UPLOADED,
+                               uploaded_bytes(instance, result))
+                if rebuilds:
+                    self.count(self.ATLAS_REBUILDS)
+                return result
+            return traced
+
+        self.patches = patch_methods(traced_methods, wrap)
+        Tracer.installed = self
+
+    def uninstall(self):
+        if Tracer.installed is not self:
+            return
+        restore_methods(self.patches)
+        self.patches = []
+        Tracer.installed = None
+
+    def timestamp(self, seconds):
+        """
+        Converts a time returned by time.perf_counter into a trace timestamp,
+        which is in microseconds.
+        """
+        return (seconds - self.origin) * 1e6
+
+    def add_span(self, name, start, stop, **args):
+        """
+        Records a span of CPU time from start to stop, which were returned by
+        time.perf_counter.  args are shown with the span.
+        """
+        event = {'name': name,
+                 'cat': 'glx',
+                 'ph': 'X',
+                 'ts': self.timestamp(start),
+                 'dur': (stop - start) * 1e6,
+                 'pid': os.getpid(),
+                 'tid': threading.get_ident()}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    @contextmanager
+    def span_context(self, name, **args):
+        """
+        Records the time spent within the context as a span, e.g., a frame.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, time.perf_counter(), **args)
+
+    def count(self, name, value=1):
+        """
+        Adds value to the counter name and records its new total.
+        """
+        total = self.counters.get(name, 0) + value
+        self.counters[name] = total
+        self.events.append({'name': name,
+                            'cat': 'glx',
+                            'ph': 'C',
+                            'ts': self.timestamp(time.perf_counter()),
+                            'pid': os.getpid(),
+                            'args': {name: total}})
+
+    def clear(self):
+        self.events = []
+
+    def chrome_trace(self):
+        """
+        Returns the events as a Chrome trace in the JSON object format.
+        """
+        return {'traceEvents': self.events,
+                'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.chrome_trace(), file)
@@ -1,4 +1,14 @@
 from .attribute import *
 from .buffer_description import *
+from .buffer_functions import *
+from .compute_program import *
+from .draw_list import *
+from .element_buffer import *
+from .free_list import *
+from .gl_buffer import *
+from .mesh_arena import *
+from .persistent_buffer import *
 from .shader import *
 from .shader_program import *
+from .uniform_block import *
+from .unpack_ring import *
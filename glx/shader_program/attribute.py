@@ -9,7 +9,8 @@ class Attribute:
                  *,
                  is_vector=False,
                  is_packed_array=False,
-                 array_size=None):
+                 array_size=None,
+                 divisor=0):
         """
         * name is the name of the input attribute in the GLSL vertex
           shader code.  It is mainly used for error-reporting.
@@ -29,18 +30,26 @@ class Attribute:
           attribute, e.g., float data[7].  For now, these must be bound to
           contiguous entries in the buffer numpy array.  Otherwise
           array_size is None to indicate a scalar.
+        * divisor is the number of instances that share each element of the
+          buffer, as for glVertexAttribDivisor.  It is zero for attributes
+          that advance per vertex, and one for attributes that advance per
+          instance in instanced draws.
         """
         self.name = name
         self.lookup_sequence = lookup_sequence
         self.is_vector = is_vector
         self.array_size = array_size
         self.is_packed_array = is_packed_array
+        self.divisor = divisor
         if is_vector and is_packed_array:
             raise ValueError
+        if divisor < 0:
+            raise ValueError
 
     def __repr__(self):
         return (f"{type(self).__qualname__}("
                 f"{self.name}, {self.lookup_sequence}, "
                 f"is_vector={self.is_vector}, "
                 f"is_packed_array={self.is_packed_array}, "
-                f"array_size={self.array_size})")
+                f"array_size={self.array_size}, "
+                f"divisor={self.divisor})")
@@ -1,9 +1,9 @@
 import ctypes
-from itertools import count
 
 import numpy as np
 
-from ..gl_importer import OpenGL, gl
+from ..gl_importer import OpenGL, gl, raw_gl_2_0, raw_gl_3_0
+from ..gl_state import GLState
 
 __all__ = []
 
@@ -18,8 +18,14 @@ class Indexer:
         * strides:
           The strides in bytes of the indexed dimensions.
         """
-        self.shape = shape
-        self.strides = strides
+        self.shape = tuple(int(x) for x in shape)
+        self.strides = tuple(int(x) for x in strides)
+        self.dimensions = tuple(zip(self.shape, self.strides))
+        # The size and stride of the only dimension, if there is one, for
+        # integer indices.
+        self.size, self.stride = (self.dimensions[0]
+                                  if len(self.dimensions) == 1
+                                  else (None, None))
 
     def __repr__(self):
         return "Indexer(shape={}, strides={})".format(
@@ -27,7 +33,26 @@ class Indexer:
             self.strides)
 
     def get_offset(self, index):
-        return int(np.dot(index, self.strides))
+        """
+        Returns the byte offset of the sub-array at index, which is a tuple
+        with one entry per indexed dimension, or an integer if there is only
+        one.  Raises IndexError if the index is out of range.
+        """
+        if self.stride is not None and not isinstance(index, (tuple, list)):
+            if not 0 <= index < self.size:
+                raise IndexError
+            return int(index) * self.stride
+        try:
+            if len(index) != len(self.dimensions):
+                raise IndexError
+        except TypeError:
+            index = (index,)
+        offset = 0
+        for i, (size, stride) in zip(index, self.dimensions):
+            if not 0 <= i < size:
+                raise IndexError
+            offset += i * stride
+        return offset
 
 
 class BoundAttribute:
@@ -36,7 +61,13 @@ class BoundAttribute:
     A BoundAttribute knows how to bind a single attribute in a shader.
     """
 
-    def __init__(self, attribute, program, buffer_dtype):
+    # Binding modes.
+    POINTER = 'pointer'
+    VERTEX_ATTRIB_BINDING = 'vertex_attrib_binding'
+    DIRECT_STATE_ACCESS = 'direct_state_access'
+
+    def __init__(self, attribute, program, buffer_dtype,
+                 vertex_array=None, buffer_index=None):
         """
         The constructor accepts:
         * attribute: An Attribute object that describes the location of some
@@ -44,6 +75,10 @@ class BoundAttribute:
         * program: An instance of ShaderProgram.
         * buffer_dtype:  The type of the numpy array that represents the
           buffer.
+        * vertex_array and buffer_index: The GL names of the vertex array and
+          of the buffer.  If both are provided, the attribute is specified
+          using direct state access, which binds neither of them.  Otherwise,
+          the attribute is specified for the bound vertex array.
 
         The constructor calculates the parameters of the OpenGL calls (e.g.,
         glVertexAttribPointer) that will need to be made when the
@@ -68,6 +103,31 @@ class BoundAttribute:
           object.
         * array_stride:
           The stride in bytes between each component of the array.
+        * divisor:
+          The attribute's divisor, which is zero unless it advances per
+          instance.
+
+        The constructor also sets members relating to the binding mode:
+        * binding_mode:
+          One of
+          * POINTER: glVertexAttribPointer is called for each location
+            with the bound GL_ARRAY_BUFFER,
+          * VERTEX_ATTRIB_BINDING: the data format of each location is
+            declared once with glVertexAttribFormat, and binding sets the
+            buffer offset with glBindVertexBuffer, or
+          * DIRECT_STATE_ACCESS: as for VERTEX_ATTRIB_BINDING, but using the
+            glVertexArray* functions, which don't need the vertex array to
+            be bound.
+        * shares_binding:
+          Whether all of the locations read from one vertex buffer binding
+          point at relative offsets so that selecting a sub-array index is a
+          single call.  The binding point's index is attribute_location.
+          Otherwise, each location has its own binding point.
+        * binding_plan:
+          A list of (function, base offset) pairs.  Binding calls each
+          function with its base offset plus the offset of the sub-array.
+          The functions close over everything else that the GL calls need so
+          that binding allocates nothing.
 
         The constructor also sets members relating to indexing:
         * indexer:
@@ -85,9 +145,12 @@ class BoundAttribute:
           vertex array (so binding the vertex array) automatically binds them.
         """
         self.attribute_name = attribute.name
+        self.vertex_array = vertex_array
+        self.buffer_index = buffer_index
         self.attribute_location = \
             program.attribute_name_to_location(attribute.name)
         self.stride = buffer_dtype.itemsize
+        self.divisor = attribute.divisor
 
         # Calculate offset and sub_dtype.
         self.offset = 0
@@ -156,6 +219,7 @@ class BoundAttribute:
                         f'{attribute.array_size}, '
                         f'but the buffer has dimensions {shape}')
                 self.array_size = attribute.array_size
+                self.array_stride = strides[-1]
                 consume_last_dimension()
 
         if shape:  # Any leftover dimensions must be indexed at call time.
@@ -168,9 +232,142 @@ class BoundAttribute:
             sub_dtype.base]
         self.integral = np.issubdtype(sub_dtype, np.integer)
 
+        # Calculate binding_mode and shares_binding.
+        state = GLState.current()
+        if buffer_index is None:
+            self.binding_mode = self.POINTER
+        elif vertex_array is not None:
+            self.binding_mode = self.DIRECT_STATE_ACCESS
+        elif state.vertex_attrib_binding:
+            self.binding_mode = self.VERTEX_ATTRIB_BINDING
+        else:
+            self.binding_mode = self.POINTER
+        self.shares_binding = (
+            self.binding_mode != self.POINTER
+            and ((self.array_size - 1) * self.array_stride
+                 <= state.max_vertex_attrib_relative_offset))
+        if self.binding_mode == self.VERTEX_ATTRIB_BINDING:
+            if not self.shares_binding:
+                self.binding_mode = self.POINTER
+        self.binding_plan = self.create_binding_plan()
+
     def enable_attributes(self):
-        for i in range(self.array_size):
-            gl.glEnableVertexAttribArray(self.attribute_location + i)
+        """
+        Enables the locations of the attribute in the vertex array and sets
+        their divisor.  Except in the POINTER binding mode, this also declares
+        their data formats and associates them with their binding points.
+        """
+        if self.binding_mode == self.POINTER:
+            for location in self.locations():
+                gl.glEnableVertexAttribArray(location)
+                if self.divisor:
+                    gl.glVertexAttribDivisor(location, self.divisor)
+            return
+        dsa = self.binding_mode == self.DIRECT_STATE_ACCESS
+        if self.divisor:
+            for binding_index, _ in self.binding_offsets():
+                if dsa:
+                    gl.glVertexArrayBindingDivisor(self.vertex_array,
+                                                   binding_index,
+                                                   self.divisor)
+                else:
+                    gl.glVertexBindingDivisor(binding_index, self.divisor)
+        for location, relative_offset, binding_index in self.formats():
+            if dsa:
+                gl.glEnableVertexArrayAttrib(self.vertex_array, location)
+                if self.integral:
+                    gl.glVertexArrayAttribIFormat(self.vertex_array,
+                                                  location,
+                                                  self.vector_size,
+                                                  self.gl_type,
+                                                  relative_offset)
+                else:
+                    gl.glVertexArrayAttribFormat(self.vertex_array,
+                                                 location,
+                                                 self.vector_size,
+                                                 self.gl_type,
+                                                 gl.GL_FALSE,
+                                                 relative_offset)
+                gl.glVertexArrayAttribBinding(self.vertex_array,
+                                              location,
+                                              binding_index)
+            else:
+                gl.glEnableVertexAttribArray(location)
+                if self.integral:
+                    gl.glVertexAttribIFormat(location,
+                                             self.vector_size,
+                                             self.gl_type,
+                                             relative_offset)
+                else:
+                    gl.glVertexAttribFormat(location,
+                                            self.vector_size,
+                                            self.gl_type,
+                                            gl.GL_FALSE,
+                                            relative_offset)
+                gl.glVertexAttribBinding(location, binding_index)
+
+    def locations(self):
+        return range(self.attribute_location,
+                     self.attribute_location + self.array_size)
+
+    def formats(self):
+        """
+        Returns an iterable of (location, relative offset, binding index) for
+        the locations of the attribute.
+        """
+        for i, location in enumerate(self.locations()):
+            if self.shares_binding:
+                yield location, i * self.array_stride, self.attribute_location
+            else:
+                yield location, 0, location
+
+    def binding_offsets(self):
+        """
+        Returns a list of (binding index, buffer offset) for the sub-array at
+        offset zero.
+        """
+        if self.shares_binding:
+            return [(self.attribute_location, self.offset)]
+        return [(location, self.offset + i * self.array_stride)
+                for i, location in enumerate(self.locations())]
+
+    def create_binding_plan(self):
+        """
+        Returns the binding_plan for the binding mode.
+        """
+        stride = self.stride
+        if self.binding_mode == self.POINTER:
+            # The raw functions skip PyOpenGL's pointer bookkeeping, which only
+            # matters for client-side arrays.
+            def attrib_pointer(location):
+                if self.integral:
+                    arguments = (location, self.vector_size, self.gl_type,
+                                 stride)
+                    function = raw_gl_3_0.glVertexAttribIPointer
+                else:
+                    arguments = (location, self.vector_size, self.gl_type,
+                                 gl.GL_FALSE, stride)
+                    function = raw_gl_2_0.glVertexAttribPointer
+                return lambda offset: function(*arguments,
+                                               ctypes.c_void_p(offset))
+
+            return [(attrib_pointer(location),
+                     self.offset + i * self.array_stride)
+                    for i, location in enumerate(self.locations())]
+
+        buffer_index = int(self.buffer_index)
+        if self.binding_mode == self.DIRECT_STATE_ACCESS:
+            vertex_array = int(self.vertex_array)
+
+            def vertex_buffer(binding_index):
+                return lambda offset: gl.glVertexArrayVertexBuffer(
+                    vertex_array, binding_index, buffer_index, offset, stride)
+        else:
+            def vertex_buffer(binding_index):
+                return lambda offset: gl.glBindVertexBuffer(
+                    binding_index, buffer_index, offset, stride)
+        return [(vertex_buffer(binding_index), offset)
+                for binding_index, offset in self.binding_offsets()]
 
     def bind(self, index=None):
         """
@@ -178,34 +375,22 @@ class BoundAttribute:
         the array of vertex attributes.
         * index is the index into the dimensions (that are not consumed by
           is_vertex or array_index) of the vertex buffer (a numpy array).
+
+        In the POINTER binding mode, the buffer must be bound to
+        GL_ARRAY_BUFFER.
         """
-        offset = self.offset
-        if index is not None:
+        if index is None:
+            offset = 0
+        else:
             try:
-                offset += self.indexer.get_offset(index)
-            except ValueError as e:
+                offset = self.indexer.get_offset(index)
+            except (IndexError, AttributeError) as e:
                 raise IndexError(
                     f"Bad index {index} on attribute '{self.attribute_name}' "
-                    f"that wants {len(self.indexer.strides)} components.") \
-                    from e
-        for attrib_index, this_offset in zip(
-                range(self.array_size),
-                count(offset, self.array_stride)):
-            pointer = ctypes.c_void_p(this_offset)
-            this_attrib_location = self.attribute_location + attrib_index
-            if self.integral:
-                gl.glVertexAttribIPointer(this_attrib_location,
-                                          self.vector_size,
-                                          self.gl_type,
-                                          self.stride,
-                                          pointer)
-            else:
-                gl.glVertexAttribPointer(this_attrib_location,
-                                         self.vector_size,
-                                         self.gl_type,
-                                         gl.GL_FALSE,
-                                         self.stride,
-                                         pointer)
+                    f"whose indexed dimensions are "
+                    f"{getattr(self.indexer, 'shape', ())}.") from e
+        for function, base_offset in self.binding_plan:
+            function(base_offset + offset)
 
     def __str__(self):
         return ("BoundAttribute("
@@ -218,4 +403,7 @@ class BoundAttribute:
                                       'vector_size',
                                       'array_size',
                                       'array_stride',
+                                      'divisor',
+                                      'binding_mode',
+                                      'shares_binding',
                                       'indexer']) + ")")
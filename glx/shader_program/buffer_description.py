@@ -1,22 +1,43 @@
 import numpy as np
 
+from .gl_buffer import GLBuffer
+from .persistent_buffer import PersistentBuffer
+
 __all__ = ['BufferDescription']
 
 
 class BufferDescription:
 
-    def __init__(self, buffer_index, buffer_dtype, attributes):
+    def __init__(self, buffer, buffer_dtype, attributes, element_buffer=None):
         """
-        * buffer_index is a buffer object index (as returned by glGenBuffers).
+        * buffer is a GLBuffer or PersistentBuffer, or a buffer object index
+          (as returned by glGenBuffers).
         * buffer_dtype is the dtype of the numpy array that will be loaded
-          into the buffer.
+          into the buffer.  It can be None if buffer is a GLBuffer or
+          PersistentBuffer, in which case its dtype is used.
         * attributes is a reiterable of BoundAttribute objects.
+        * element_buffer is an optional ElementBuffer of vertex indices into
+          the buffer for indexed draws.
         """
+        if isinstance(buffer, (GLBuffer, PersistentBuffer)):
+            if buffer_dtype is None:
+                buffer_dtype = buffer.dtype
+            elif buffer_dtype != buffer.dtype:
+                raise ValueError(
+                    f"The buffer dtype {buffer_dtype} doesn't match the "
+                    f"buffer's dtype {buffer.dtype}.")
+            buffer_index = buffer.buffer_index
+        else:
+            buffer_index = buffer
+            buffer = None
         if not isinstance(buffer_index, np.uint32):
             raise TypeError
         if not isinstance(buffer_dtype, np.dtype):
             raise TypeError
 
+        # The GLBuffer or PersistentBuffer, if any.
+        self.buffer = buffer
         self.buffer_index = buffer_index
         self.buffer_dtype = buffer_dtype
         self.attributes = attributes
+        self.element_buffer = element_buffer
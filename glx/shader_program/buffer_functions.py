@@ -0,0 +1,90 @@
+import numpy as np
+
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..wrappers import glCreateName, glDeleteNames, glGenName
+
+__all__ = ['create_buffer', 'delete_buffer', 'buffer_data', 'buffer_sub_data',
+           'copy_buffer_sub_data', 'get_buffer_sub_data']
+
+# The fallbacks edit buffers through this target because, unlike
+# GL_ARRAY_BUFFER and GL_ELEMENT_ARRAY_BUFFER, nothing else uses it.  Its
+# binding is left in place.
+EDIT_TARGET = gl.GL_COPY_WRITE_BUFFER
+
+
+def create_buffer():
+    """
+    Returns the name of a new buffer object.  With direct state access, the
+    buffer is created with glCreateBuffers so that it can be edited without
+    ever being bound.
+    """
+    if GLState.current().direct_state_access:
+        return glCreateName(gl.glCreateBuffers)
+    return glGenName(gl.glGenBuffers)
+
+
+def delete_buffer(buffer_index):
+    glDeleteNames(gl.glDeleteBuffers, [buffer_index])
+    GLState.current().forget_buffer(buffer_index)
+
+
+def buffer_data(buffer_index, array, usage, nbytes=None):
+    """
+    Allocates the storage of the buffer and fills it with array.
+    * array is a numpy array, or None to leave the storage uninitialized.
+    * nbytes is the size of the storage, which defaults to array.nbytes.
+    """
+    if nbytes is None:
+        nbytes = array.nbytes
+    state = GLState.current()
+    if state.direct_state_access:
+        gl.glNamedBufferData(buffer_index, nbytes, array, usage)
+    else:
+        state.buffer(EDIT_TARGET).bind(buffer_index)
+        gl.glBufferData(EDIT_TARGET, nbytes, array, usage)
+
+
+def buffer_sub_data(buffer_index, offset, array):
+    """
+    Writes array into the buffer's existing storage starting at offset bytes.
+    """
+    state = GLState.current()
+    if state.direct_state_access:
+        gl.glNamedBufferSubData(buffer_index, offset, array.nbytes, array)
+    else:
+        state.buffer(EDIT_TARGET).bind(buffer_index)
+        gl.glBufferSubData(EDIT_TARGET, offset, array.nbytes, array)
+
+
+def copy_buffer_sub_data(read_buffer, write_buffer, read_offset, write_offset,
+                         nbytes):
+    """
+    Copies nbytes from read_buffer at read_offset to write_buffer at
+    write_offset without a round trip through client memory.
+    """
+    state = GLState.current()
+    if state.direct_state_access:
+        gl.glCopyNamedBufferSubData(read_buffer, write_buffer, read_offset,
+                                    write_offset, nbytes)
+    else:
+        state.buffer(gl.GL_COPY_READ_BUFFER).bind(read_buffer)
+        state.buffer(EDIT_TARGET).bind(write_buffer)
+        gl.glCopyBufferSubData(gl.GL_COPY_READ_BUFFER, EDIT_TARGET,
+                               read_offset, write_offset, nbytes)
+
+
+def get_buffer_sub_data(buffer_index, offset, array):
+    """
+    Reads array.nbytes from the buffer starting at offset bytes into array,
+    which must be a contiguous numpy array.
+    """
+    state = GLState.current()
+    if state.direct_state_access:
+        gl.glGetNamedBufferSubData(buffer_index, offset, array.nbytes, array)
+    else:
+        state.buffer(gl.GL_COPY_READ_BUFFER).bind(buffer_index)
+        # PyOpenGL converts the output array of glGetBufferSubData to bytes,
+        # which fails for structured dtypes, so the bytes are passed instead.
+        gl.glGetBufferSubData(gl.GL_COPY_READ_BUFFER, offset, array.nbytes,
+                              array.reshape(-1).view(np.uint8))
@@ -0,0 +1,127 @@
+import math
+from functools import reduce
+from operator import or_
+
+import numpy as np
+
+from ..gl_importer import gl
+from ..wrappers import glGetProgramResourceName
+from .shader_program import ShaderProgram
+from .uniform_block import uniform_block_registry
+
+__all__ = ['ComputeProgram', 'memory_barrier']
+
+
+def memory_barrier(*barrier_bits):
+    """
+    Orders the writes of earlier dispatches before the reads of later
+    commands.  Each of barrier_bits names how the later commands read the
+    data, e.g.,
+    * GL_SHADER_STORAGE_BARRIER_BIT for another dispatch that reads the
+      storage buffer,
+    * GL_VERTEX_ATTRIB_ARRAY_BARRIER_BIT for draws that read the buffer as
+      vertex attributes, and
+    * GL_BUFFER_UPDATE_BARRIER_BIT for reading the buffer back, e.g., with
+      GLBuffer.read.
+    With no arguments, all barriers are issued.
+    """
+    gl.glMemoryBarrier(reduce(or_, barrier_bits, 0)
+                       if barrier_bits
+                       else gl.GL_ALL_BARRIER_BITS)
+
+
+class ComputeProgram(ShaderProgram):
+
+    """
+    A ComputeProgram manages a program with a compute shader, e.g., for bulk
+    per-vertex work such as coordinate transforms.  The shader is a Mako
+    template, and uniforms are set as for ShaderProgram.
+
+    Each shader storage block in the program is attached to the binding
+    point equal to its block index.  The buffers that back the blocks are
+    passed by block name to dispatch, which binds them there.  A GLBuffer
+    backs a block whose members are laid out according to std430 if its
+    dtype has the same layout, e.g., np.dtype([('position', '<f4', 2),
+    ('weight', '<f4'), ('pad', '<f4')]) for struct { vec2 position; float
+    weight; }.
+    """
+
+    def __init__(self, compute, context_kwargs=None,
+                 uniform_block_registry=uniform_block_registry):
+        """
+        * compute is a list of filenames of included compute shaders.
+        * context_kwargs and uniform_block_registry are as for ShaderProgram.
+        """
+        super().__init__(compute=compute,
+                         context_kwargs=context_kwargs,
+                         uniform_block_registry=uniform_block_registry)
+        work_group_size = np.zeros(3, dtype=np.int32)
+        gl.glGetProgramiv(self.program_index,
+                          gl.GL_COMPUTE_WORK_GROUP_SIZE,
+                          work_group_size)
+        # The local size of the shader's work groups.
+        self.work_group_size = tuple(int(x) for x in work_group_size)
+        # A map from storage block name to binding point.
+        self.storage_blocks = self.bind_storage_blocks()
+
+    # New methods -------------------------------------------------------------
+    def bind_storage_blocks(self):
+        storage_blocks = {}
+        count = gl.GLint()
+        gl.glGetProgramInterfaceiv(self.program_index,
+                                   gl.GL_SHADER_STORAGE_BLOCK,
+                                   gl.GL_ACTIVE_RESOURCES,
+                                   count)
+        for block_index in range(count.value):
+            name = glGetProgramResourceName(self.program_index,
+                                            gl.GL_SHADER_STORAGE_BLOCK,
+                                            block_index)
+            gl.glShaderStorageBlockBinding(self.program_index,
+                                           block_index,
+                                           block_index)
+            storage_blocks[name] = block_index
+        return storage_blocks
+
+    def bind_storage_buffers(self, storage_buffers):
+        """
+        Binds the buffers that back the storage blocks.
+        * storage_buffers is a mapping from storage block name to GLBuffer.
+        """
+        for name, buffer in storage_buffers.items():
+            try:
+                binding_point = self.storage_blocks[name]
+            except KeyError:
+                raise ValueError(
+                    f"Storage block {name} is not active in the program.  "
+                    f"Active storage blocks are "
+                    f"{sorted(self.storage_blocks)}.") from None
+            gl.glBindBufferBase(gl.GL_SHADER_STORAGE_BUFFER,
+                                binding_point,
+                                buffer.buffer_index)
+
+    def dispatch(self, groups, storage_buffers=None, uniforms=None):
+        """
+        Runs the compute shader.
+        * groups is the number of work groups, or a tuple of up to three
+          numbers of work groups.
+        * storage_buffers is as for bind_storage_buffers.
+        * uniforms is as for bind_context.
+        Follow the dispatch with memory_barrier before using its results.
+        """
+        if isinstance(groups, int):
+            groups = (groups,)
+        groups = tuple(groups) + (1,) * (3 - len(groups))
+        with self.bind_context(uniforms):
+            if storage_buffers:
+                self.bind_storage_buffers(storage_buffers)
+            gl.glDispatchCompute(*groups)
+
+    def dispatch_elements(self, count, storage_buffers=None, uniforms=None):
+        """
+        Runs the compute shader with enough work groups for one invocation
+        per element along x.  The shader must skip the invocations past
+        count.
+        """
+        self.dispatch(math.ceil(count / self.work_group_size[0]),
+                      storage_buffers,
+                      uniforms)
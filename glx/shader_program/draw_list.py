@@ -0,0 +1,247 @@
+import ctypes
+from itertools import groupby
+
+import numpy as np
+
+from ..gl_importer import gl
+from ..gl_state import GLState
+from .gl_buffer import GLBuffer
+
+__all__ = ['DrawCommand', 'DrawList']
+
+
+class DrawCommand:
+
+    """
+    A DrawCommand records one glDrawArrays-style draw and the state it needs.
+    """
+
+    __slots__ = ['program', 'vertex_array', 'mode', 'first', 'count',
+                 'instance_count', 'base_instance', 'textures', 'uniforms',
+                 'uniforms_key']
+
+    def __init__(self, program, vertex_array, mode, first, count,
+                 instance_count, base_instance, textures, uniforms):
+        self.program = program
+        self.vertex_array = vertex_array
+        self.mode = mode
+        self.first = first
+        self.count = count
+        self.instance_count = instance_count
+        self.base_instance = base_instance
+        self.textures = textures
+        self.uniforms = uniforms
+        self.uniforms_key = self.freeze_uniforms(uniforms)
+
+    def __repr__(self):
+        return ("DrawCommand(mode={}, first={}, count={}, instance_count={}, "
+                "base_instance={})".format(self.mode,
+                                           self.first,
+                                           self.count,
+                                           self.instance_count,
+                                           self.base_instance))
+
+    @staticmethod
+    def freeze_uniforms(uniforms):
+        """
+        Returns a hashable form of the uniforms mapping that compares by
+        value: the sorted (name, value) pairs, with each value replaced by its
+        dtype, shape and bytes as a numpy array.
+        """
+        if uniforms is None:
+            return ()
+        frozen = []
+        for name, value in uniforms.items():
+            array = np.asarray(value)
+            frozen.append((name, (array.dtype.str, array.shape,
+                                  array.tobytes())))
+        return tuple(sorted(frozen))
+
+    def state_key(self):
+        """
+        Returns a key that orders commands from the most expensive state
+        change to the cheapest: program, textures, vertex array.  Commands
+        with equal keys can be merged into one multi-draw.
+        """
+        return (self.program.program_index,
+                self.textures,
+                self.vertex_array.vertex_array,
+                self.uniforms_key,
+                self.mode)
+
+
+class DrawList:
+
+    """
+    A DrawList records draws, and then executes them sorted by the state
+    they need so that programs, textures and vertex arrays are bound as
+    rarely as possible.  Consecutive draws that need the same state are
+    merged into one glMultiDrawArraysIndirect call that reads its draw
+    commands from a buffer, so the number of GL calls per frame grows with
+    the number of distinct states rather than with the number of draws.
+
+    Sorting changes the order of the draws, which matters for blending.  Pass
+    sort=False to execute to keep the recorded order and only merge
+    consecutive draws.
+
+    The recorded draws can be executed again, e.g., every frame, without
+    re-uploading the command buffer until the list is changed.
+    """
+
+    # The layout of DrawArraysIndirectCommand.
+    INDIRECT_COMMAND = np.dtype([('count', '<u4'),
+                                 ('instance_count', '<u4'),
+                                 ('first', '<u4'),
+                                 ('base_instance', '<u4')])
+
+    def __init__(self):
+        self.commands = []
+        self.indirect_buffer = None
+        # The groups of commands of the last plan, whether they were sorted,
+        # whether multi-draw indirect was available, and whether the merged
+        # groups are drawn from indirect_buffer.
+        self.groups = None
+        self.sorted = None
+        self.multi_draw_indirect = None
+        self.indirect = False
+
+    def __len__(self):
+        return len(self.commands)
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        if self.indirect_buffer is not None:
+            self.indirect_buffer.delete()
+            self.indirect_buffer = None
+
+    def clear(self):
+        self.commands = []
+        self.groups = None
+
+    def draw_arrays(self, program, vertex_array, mode, first=0, count=None,
+                    instance_count=1, base_instance=0, textures=(),
+                    uniforms=None):
+        """
+        Records a draw.
+        * program and vertex_array are the ShaderProgram and VertexArray.
+        * mode, first, count, instance_count and base_instance are as for
+          VertexArray.draw_arrays.
+        * textures is a tuple of (texture unit, target, texture name) to bind.
+        * uniforms is a mapping from uniform name to value to set.  Only draws
+          whose uniforms have equal values, or that have none, are merged.
+          The values are compared as they are when the draw is recorded.
+        """
+        if count is None:
+            count = vertex_array.default_count(first)
+        self.commands.append(DrawCommand(program, vertex_array, mode, first,
+                                         count, instance_count,
+                                         base_instance, tuple(textures),
+                                         uniforms))
+        self.groups = None
+
+    def plan(self, sort):
+        """
+        Groups the commands by state, and uploads the commands of the groups
+        that are drawn indirectly.
+        """
+        commands = self.commands
+        if sort:
+            commands = sorted(commands, key=DrawCommand.state_key)
+        self.groups = [list(group)
+                       for _, group in groupby(commands,
+                                               key=DrawCommand.state_key)]
+        self.sorted = sort
+        self.multi_draw_indirect = GLState.current().multi_draw_indirect
+        self.indirect = False
+        if not self.multi_draw_indirect:
+            return
+        merged = [command
+                  for group in self.groups
+                  if len(group) > 1
+                  for command in group]
+        if not merged:
+            return
+        indirect_commands = np.empty(len(merged), dtype=self.INDIRECT_COMMAND)
+        for name in self.INDIRECT_COMMAND.names:
+            indirect_commands[name] = [getattr(command, name)
+                                       for command in merged]
+        if self.indirect_buffer is None:
+            self.indirect_buffer = GLBuffer(self.INDIRECT_COMMAND,
+                                            usage=gl.GL_DYNAMIC_DRAW)
+        self.indirect_buffer.upload(indirect_commands)
+        self.indirect = True
+
+    def execute(self, sort=True):
+        """
+        Issues the recorded draws.
+        """
+        state = GLState.current()
+        if (self.groups is None
+                or self.sorted != sort
+                or self.multi_draw_indirect != state.multi_draw_indirect):
+            self.plan(sort)
+        if not self.indirect:
+            self.draw_groups(state)
+            return
+        binding = state.buffer(gl.GL_DRAW_INDIRECT_BUFFER)
+        with binding.context(self.indirect_buffer.buffer_index):
+            self.draw_groups(state)
+        # Indirect draws of other code would otherwise read from the buffer.
+        binding.unbind()
+
+    def draw_groups(self, state):
+        # A map from program index to the key of the uniforms last set.
+        set_uniforms = {}
+        indirect_offset = 0
+        for group in self.groups:
+            command = group[0]
+            program = command.program
+            with program.bind_context():
+                if command.uniforms is not None:
+                    uniforms_key = command.uniforms_key
+                    if (set_uniforms.get(program.program_index)
+                            != uniforms_key):
+                        program.set_uniforms(command.uniforms)
+                        set_uniforms[program.program_index] = uniforms_key
+                for texture_unit, target, texture in command.textures:
+                    state.texture(texture_unit, target).bind(texture)
+                if len(group) == 1:
+                    self.draw_command(command)
+                elif self.indirect:
+                    with command.vertex_array.bind_context():
+                        gl.glMultiDrawArraysIndirect(
+                            command.mode,
+                            ctypes.c_void_p(indirect_offset),
+                            len(group),
+                            0)
+                    indirect_offset += (len(group)
+                                        * self.INDIRECT_COMMAND.itemsize)
+                else:
+                    self.draw_group(group)
+
+    @staticmethod
+    def draw_command(command):
+        plain = command.instance_count == 1 and not command.base_instance
+        command.vertex_array.draw_arrays(
+            command.mode,
+            command.first,
+            command.count,
+            None if plain else command.instance_count,
+            command.base_instance)
+
+    @classmethod
+    def draw_group(cls, group):
+        """
+        Draws a group without indirect draws: one glMultiDrawArrays call if
+        none of the draws is instanced.
+        """
+        if any(command.instance_count != 1 or command.base_instance
+               for command in group):
+            for command in group:
+                cls.draw_command(command)
+            return
+        command = group[0]
+        firsts = np.array([c.first for c in group], dtype=np.int32)
+        counts = np.array([c.count for c in group], dtype=np.int32)
+        with command.vertex_array.bind_context():
+            gl.glMultiDrawArrays(command.mode, firsts, counts, len(group))
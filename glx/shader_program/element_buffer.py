@@ -0,0 +1,61 @@
+import numpy as np
+
+from ..gl_importer import gl
+from .gl_buffer import GLBuffer
+
+__all__ = ['ElementBuffer']
+
+
+class ElementBuffer(GLBuffer):
+
+    """
+    An ElementBuffer is a GLBuffer of vertex indices for indexed draws.  A
+    VertexArray that is given an ElementBuffer draws it with draw_elements.
+
+    The largest value of the index type is reserved as the primitive restart
+    index, which ends one strip or fan and starts the next within a single
+    draw.
+    """
+
+    ELEMENT_TYPES = {np.dtype(np.uint8): gl.GL_UNSIGNED_BYTE,
+                     np.dtype(np.uint16): gl.GL_UNSIGNED_SHORT,
+                     np.dtype(np.uint32): gl.GL_UNSIGNED_INT}
+
+    # A map from element type to primitive restart index.
+    RESTART_INDICES = {gl_type: int(np.iinfo(dtype).max)
+                       for dtype, gl_type in ELEMENT_TYPES.items()}
+
+    def __init__(self, dtype=np.uint32, capacity=0, usage=gl.GL_STATIC_DRAW):
+        """
+        * dtype is np.uint8, np.uint16, or np.uint32.
+        * capacity and usage are as for GLBuffer.
+        """
+        dtype = np.dtype(dtype)
+        try:
+            self.element_type = self.ELEMENT_TYPES[dtype]
+        except KeyError:
+            raise ValueError(
+                f"Element buffers hold unsigned integers, not {dtype}.") \
+                from None
+        super().__init__(dtype, capacity, usage)
+        self.restart_index = self.RESTART_INDICES[self.element_type]
+
+    def __repr__(self):
+        return "ElementBuffer(dtype={}, capacity={}, size={})".format(
+            self.dtype, self.capacity, self.size)
+
+    # New methods -------------------------------------------------------------
+    def join_strips(self, strips):
+        """
+        Returns the index arrays in strips concatenated with the restart index
+        between them, ready to be uploaded.
+        """
+        strips = list(strips)
+        if not strips:
+            return np.empty(0, dtype=self.dtype)
+        parts = [np.asarray(strips[0], dtype=self.dtype)]
+        restart = np.array([self.restart_index], dtype=self.dtype)
+        for strip in strips[1:]:
+            parts.append(restart)
+            parts.append(np.asarray(strip, dtype=self.dtype))
+        return np.concatenate(parts)
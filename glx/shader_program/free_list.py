@@ -0,0 +1,108 @@
+from bisect import bisect_left
+
+__all__ = ['FreeList']
+
+
+class FreeList:
+
+    """
+    A FreeList tracks which ranges of a linear storage of some capacity are
+    free.  It allocates ranges first-fit and coalesces adjacent free ranges
+    when ranges are freed.
+    """
+
+    def __init__(self, capacity=0):
+        self.capacity = 0
+        # The sorted starts and the counts of the free ranges.
+        self.starts = []
+        self.counts = []
+        self.grow(capacity)
+
+    def __repr__(self):
+        return "FreeList(capacity={}, free={})".format(
+            self.capacity,
+            list(zip(self.starts, self.counts)))
+
+    # Properties --------------------------------------------------------------
+    @property
+    def free_count(self):
+        return sum(self.counts)
+
+    # New methods -------------------------------------------------------------
+    def allocate(self, count):
+        """
+        Returns the start of a free range of count elements and marks it as
+        used, or returns None if there is no such range.
+        """
+        if count <= 0:
+            raise ValueError(f"Can't allocate {count} elements.")
+        for i, free_count in enumerate(self.counts):
+            if free_count >= count:
+                start = self.starts[i]
+                if free_count == count:
+                    del self.starts[i]
+                    del self.counts[i]
+                else:
+                    self.starts[i] += count
+                    self.counts[i] -= count
+                return start
+        return None
+
+    def free(self, start, count):
+        """
+        Marks the range of count elements at start as free.
+        """
+        stop = start + count
+        if start < 0 or count <= 0 or stop > self.capacity:
+            raise ValueError(
+                f"Can't free the range [{start}, {stop}) of a storage of "
+                f"capacity {self.capacity}.")
+        i = bisect_left(self.starts, start)
+        previous_stop = (self.starts[i - 1] + self.counts[i - 1]
+                         if i > 0
+                         else -1)
+        next_start = (self.starts[i]
+                      if i < len(self.starts)
+                      else self.capacity + 1)
+        if previous_stop > start or next_start < stop:
+            raise ValueError(
+                f"The range [{start}, {stop}) is already partly free.")
+        merges_previous = previous_stop == start
+        merges_next = next_start == stop
+        if merges_previous and merges_next:
+            self.counts[i - 1] += count + self.counts[i]
+            del self.starts[i]
+            del self.counts[i]
+        elif merges_previous:
+            self.counts[i - 1] += count
+        elif merges_next:
+            self.starts[i] = start
+            self.counts[i] += count
+        else:
+            self.starts.insert(i, start)
+            self.counts.insert(i, count)
+
+    def grow(self, capacity):
+        """
+        Increases the capacity, freeing the added range.
+        """
+        if capacity < self.capacity:
+            raise ValueError("A FreeList can't shrink.")
+        old_capacity = self.capacity
+        self.capacity = capacity
+        if capacity > old_capacity:
+            self.free(old_capacity, capacity - old_capacity)
+
+    def reset(self, used):
+        """
+        Marks the first used elements as used and the rest as free, e.g.,
+        after compacting the storage.
+        """
+        if not 0 <= used <= self.capacity:
+            raise ValueError
+        if used == self.capacity:
+            self.starts = []
+            self.counts = []
+        else:
+            self.starts = [used]
+            self.counts = [self.capacity - used]
@@ -0,0 +1,181 @@
+import numpy as np
+
+from ..debug_output import register_object
+from ..gl_importer import gl
+from ..tools import next_power_of_two
+from .buffer_functions import (buffer_data, buffer_sub_data,
+                               copy_buffer_sub_data, create_buffer,
+                               delete_buffer, get_buffer_sub_data)
+
+__all__ = ['GLBuffer']
+
+
+class GLBuffer:
+
+    """
+    A GLBuffer owns a buffer object that stores an array of elements of one
+    numpy dtype.  Its storage grows geometrically, so appending elements one
+    write at a time reallocates it only a logarithmic number of times.
+    Writes of sub-ranges only transfer the bytes that changed.
+    """
+
+    def __init__(self, dtype, capacity=0, usage=gl.GL_STATIC_DRAW):
+        """
+        * dtype is the numpy dtype of one element, e.g., the dtype of one
+          vertex.  It may have a shape, e.g., np.dtype(('f', (2,))).
+        * capacity is the number of elements to allocate storage for.
+        * usage is the usage hint passed to glBufferData, e.g.,
+          GL_STATIC_DRAW for data that is written once, GL_DYNAMIC_DRAW for
+          data that is rewritten now and then, or GL_STREAM_DRAW for data
+          that is rewritten every frame.
+
+        Members:
+        * buffer_index: the GL buffer object name.
+        * capacity: the number of elements that the storage holds.
+        * size: one past the last element that has been written since the
+          storage was last allocated or orphaned.
+        """
+        self.dtype = np.dtype(dtype)
+        self.usage = usage
+        self.buffer_index = create_buffer()
+        register_object(gl.GL_BUFFER, self.buffer_index, self)
+        self.capacity = 0
+        self.size = 0
+        if capacity:
+            self.allocate(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        return "GLBuffer(dtype={}, capacity={}, size={})".format(
+            self.dtype, self.capacity, self.size)
+
+    # Properties --------------------------------------------------------------
+    @property
+    def nbytes(self):
+        return self.capacity * self.dtype.itemsize
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        delete_buffer(self.buffer_index)
+        self.buffer_index = None
+        self.capacity = 0
+        self.size = 0
+
+    def allocate(self, capacity):
+        """
+        Replaces the storage with uninitialized storage for capacity elements.
+        """
+        self.capacity = capacity
+        self.size = 0
+        buffer_data(self.buffer_index, None, self.usage, self.nbytes)
+
+    def reserve(self, capacity):
+        """
+        Grows the storage, if necessary, so that it holds at least capacity
+        elements.  The capacity is rounded up to a power of two, and the
+        elements that have been written are preserved.  The buffer keeps its
+        name, so vertex arrays that read from it remain valid.
+        """
+        if capacity <= self.capacity:
+            return
+        capacity = next_power_of_two(capacity)
+        size = self.size
+        if not size:
+            self.allocate(capacity)
+            return
+        # Copy the contents out to a temporary buffer and back.
+        nbytes = size * self.dtype.itemsize
+        temporary = create_buffer()
+        try:
+            buffer_data(temporary, None, gl.GL_STREAM_COPY, nbytes)
+            copy_buffer_sub_data(self.buffer_index, temporary, 0, 0, nbytes)
+            self.allocate(capacity)
+            copy_buffer_sub_data(temporary, self.buffer_index, 0, 0, nbytes)
+        finally:
+            delete_buffer(temporary)
+        self.size = size
+
+    def orphan(self):
+        """
+        Discards the contents by reallocating storage of the same capacity.
+        The driver can hand out fresh memory instead of waiting for draws
+        that still read the old contents, which suits data that is rewritten
+        every frame.
+        """
+        self.allocate(self.capacity)
+
+    def upload(self, array, orphan=None):
+        """
+        Replaces the contents with array.  Returns the number of elements
+        written.
+        * orphan is whether to orphan the old contents first, which defaults
+          to whether the usage is GL_STREAM_DRAW.  Otherwise, array is
+          written in place if it fits, which saves reallocating the storage
+          but waits for draws that still read the old contents.
+        """
+        array = self.elements(array)
+        count = array.nbytes // self.dtype.itemsize
+        if orphan is None:
+            orphan = self.usage == gl.GL_STREAM_DRAW
+        if count > self.capacity:
+            self.allocate(next_power_of_two(count))
+        elif orphan:
+            self.orphan()
+        if count:
+            buffer_sub_data(self.buffer_index, 0, array)
+        self.size = count
+        return count
+
+    def write(self, array, offset=0):
+        """
+        Writes array starting at element offset, growing the storage if
+        necessary.  array can be a view into a larger numpy array, in which
+        case only its elements are transferred.  Returns the number of
+        elements written.
+        """
+        array = self.elements(array)
+        count = array.nbytes // self.dtype.itemsize
+        if offset < 0:
+            raise ValueError(f"Negative offset {offset}.")
+        self.reserve(offset + count)
+        if count:
+            buffer_sub_data(self.buffer_index,
+                            offset * self.dtype.itemsize,
+                            array)
+        self.size = max(self.size, offset + count)
+        return count
+
+    def read(self, start=0, stop=None):
+        """
+        Returns the elements from start to stop, which defaults to size, as a
+        numpy array.  This waits for the GPU, e.g., for a compute shader that
+        writes to the buffer, so it is meant for results rather than for
+        every frame.
+        """
+        if stop is None:
+            stop = self.size
+        if not 0 <= start <= stop <= self.capacity:
+            raise ValueError(
+                f"Can't read elements [{start}, {stop}) of a buffer of "
+                f"capacity {self.capacity}.")
+        array = np.empty(stop - start, dtype=self.dtype)
+        if len(array):
+            get_buffer_sub_data(self.buffer_index,
+                                start * self.dtype.itemsize,
+                                array)
+        return array
+
+    def elements(self, array):
+        """
+        Returns array as a contiguous numpy array whose trailing dimensions
+        match the shape of the dtype, converting its elements if necessary.
+        """
+        array = np.ascontiguousarray(array, dtype=self.dtype.base)
+        element_shape = self.dtype.shape
+        if array.shape[array.ndim - len(element_shape):] != element_shape:
+            raise ValueError(
+                f"An array of shape {array.shape} can't be written into a "
+                f"buffer of elements of shape {element_shape}.")
+        return array
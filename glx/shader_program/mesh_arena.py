@@ -0,0 +1,183 @@
+import numpy as np
+
+from ..gl_importer import gl
+from .buffer_description import BufferDescription
+from .buffer_functions import (buffer_data, copy_buffer_sub_data,
+                               create_buffer, delete_buffer)
+from .free_list import FreeList
+from .gl_buffer import GLBuffer
+
+__all__ = ['Mesh', 'MeshArena']
+
+
+class Mesh:
+
+    """
+    A Mesh is a range of vertices allocated in a MeshArena.  Its first vertex
+    changes when the arena is defragmented, so hold on to the Mesh rather than
+    to first.
+    """
+
+    __slots__ = ['first', 'count']
+
+    def __init__(self, first, count):
+        self.first = first
+        self.count = count
+
+    def __repr__(self):
+        return "Mesh(first={}, count={})".format(self.first, self.count)
+
+
+class MeshArena:
+
+    """
+    A MeshArena packs many small meshes whose vertices share a dtype into one
+    GLBuffer, which is read by one VertexArray.  Drawing all of the meshes
+    takes one glMultiDrawArrays call instead of a buffer and a vertex array
+    bind per mesh.
+
+    Freed ranges are kept in a FreeList and reused first-fit.  When many
+    meshes have been freed, defragment moves the live meshes to the start of
+    the buffer.
+    """
+
+    def __init__(self, program, buffer_dtype, attributes, capacity=0,
+                 usage=gl.GL_STATIC_DRAW):
+        """
+        * program is a ShaderProgram object.
+        * buffer_dtype is the dtype of one vertex.
+        * attributes is a reiterable of Attribute objects describing the
+          vertex.
+        * capacity is the initial number of vertices.
+        * usage is the usage hint of the buffer.
+        """
+        self.buffer = GLBuffer(buffer_dtype, capacity, usage)
+        self.free_list = FreeList(self.buffer.capacity)
+        self.vertex_array, = program.create_vertex_arrays(
+            [BufferDescription(self.buffer, None, attributes)])
+        # The live meshes.
+        self.meshes = set()
+        # The cached firsts and counts of the live meshes for drawing them.
+        self.draw_arrays = None
+
+    def __len__(self):
+        return len(self.meshes)
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        self.vertex_array.delete()
+        self.buffer.delete()
+        self.meshes.clear()
+        self.draw_arrays = None
+
+    def allocate(self, array):
+        """
+        Returns a new Mesh that holds the vertices in array, growing the
+        buffer if there is no free range that is large enough.
+        """
+        array = self.buffer.elements(array)
+        count = array.nbytes // self.buffer.dtype.itemsize
+        first = self.free_list.allocate(count)
+        if first is None:
+            self.grow(count)
+            first = self.free_list.allocate(count)
+        self.buffer.write(array, first)
+        mesh = Mesh(first, count)
+        self.meshes.add(mesh)
+        self.draw_arrays = None
+        return mesh
+
+    def update(self, mesh, array):
+        """
+        Overwrites the vertices of mesh with array, which must have as many
+        vertices.
+        """
+        array = self.buffer.elements(array)
+        if array.nbytes != mesh.count * self.buffer.dtype.itemsize:
+            raise ValueError(
+                f"Can't update a mesh of {mesh.count} vertices with "
+                f"{array.nbytes // self.buffer.dtype.itemsize}.")
+        self.buffer.write(array, mesh.first)
+
+    def free(self, mesh):
+        self.meshes.remove(mesh)
+        self.free_list.free(mesh.first, mesh.count)
+        mesh.first = None
+        self.draw_arrays = None
+
+    def grow(self, count):
+        """
+        Grows the buffer so that count more vertices fit after its last used
+        vertex.
+        """
+        self.buffer.reserve(self.free_list.capacity + count)
+        self.free_list.grow(self.buffer.capacity)
+
+    def defragment(self):
+        """
+        Moves the live meshes to the start of the buffer, in order, so that
+        the free space is one range at the end.
+        """
+        meshes = sorted(self.meshes, key=lambda mesh: mesh.first)
+        used = sum(mesh.count for mesh in meshes)
+        if self.free_list.starts in ([], [used]):
+            return  # Already compact.
+
+        # Plan the moves as (source, destination, count), merging adjacent
+        # meshes.
+        moves = []
+        first = 0
+        for mesh in meshes:
+            if moves and sum(moves[-1][::2]) == mesh.first:
+                source, destination, count = moves[-1]
+                moves[-1] = (source, destination, count + mesh.count)
+            else:
+                moves.append((mesh.first, first, mesh.count))
+            mesh.first = first
+            first += mesh.count
+
+        # Gather the meshes in a temporary buffer, and copy them back.
+        itemsize = self.buffer.dtype.itemsize
+        temporary = create_buffer()
+        try:
+            buffer_data(temporary, None, gl.GL_STREAM_COPY, used * itemsize)
+            for source, destination, count in moves:
+                copy_buffer_sub_data(self.buffer.buffer_index, temporary,
+                                     source * itemsize,
+                                     destination * itemsize,
+                                     count * itemsize)
+            copy_buffer_sub_data(temporary, self.buffer.buffer_index,
+                                 0, 0, used * itemsize)
+        finally:
+            delete_buffer(temporary)
+        self.free_list.reset(used)
+        self.buffer.size = used
+        self.draw_arrays = None
+
+    def draw(self, mode, meshes=None):
+        """
+        Draws meshes, which defaults to all of the live meshes, using mode,
+        e.g., GL_TRIANGLE_STRIP.  Each mesh is a separate primitive.  The
+        program must be bound.
+        """
+        if meshes is None:
+            if self.draw_arrays is None:
+                self.draw_arrays = self.firsts_and_counts(self.meshes)
+            firsts, counts = self.draw_arrays
+        else:
+            firsts, counts = self.firsts_and_counts(meshes)
+        if not len(firsts):
+            return
+        with self.vertex_array.bind_context():
+            if len(firsts) == 1:
+                gl.glDrawArrays(mode, int(firsts[0]), int(counts[0]))
+            else:
+                gl.glMultiDrawArrays(mode, firsts, counts, len(firsts))
+
+    @staticmethod
+    def firsts_and_counts(meshes):
+        ranges = np.array([(mesh.first, mesh.count) for mesh in meshes],
+                          dtype=np.int32).reshape(-1, 2)
+        # glMultiDrawArrays reads the firsts and counts as separate arrays.
+        return (np.ascontiguousarray(ranges[:, 0]),
+                np.ascontiguousarray(ranges[:, 1]))
@@ -0,0 +1,198 @@
+import ctypes
+from contextlib import contextmanager
+
+import numpy as np
+
+from ..debug_output import register_object
+from ..gl_importer import gl
+from ..gl_state import GLState
+from .buffer_functions import EDIT_TARGET, create_buffer, delete_buffer
+
+__all__ = ['Fence', 'PersistentBuffer']
+
+
+class Fence:
+
+    """
+    A Fence wraps an OpenGL sync object that is signaled once the GPU has
+    finished the commands issued before it was placed.
+    """
+
+    def __init__(self):
+        self.sync = None
+
+    def delete(self):
+        if self.sync is not None:
+            gl.glDeleteSync(self.sync)
+            self.sync = None
+
+    def place(self):
+        self.delete()
+        self.sync = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def wait(self, timeout=1_000_000_000):
+        """
+        Blocks until the fence is signaled, and then deletes it.  Does nothing
+        if the fence hasn't been placed.
+        * timeout is the time in nanoseconds to wait before raising.
+        """
+        if self.sync is None:
+            return
+        result = gl.glClientWaitSync(self.sync,
+                                     gl.GL_SYNC_FLUSH_COMMANDS_BIT,
+                                     timeout)
+        if result not in (gl.GL_ALREADY_SIGNALED, gl.GL_CONDITION_SATISFIED):
+            raise Exception(
+                "The GPU didn't reach the fence in time."
+                if result == gl.GL_TIMEOUT_EXPIRED
+                else "glClientWaitSync failed.")
+        self.delete()
+
+    def signaled(self):
+        """
+        Returns whether the fence is signaled without blocking, and deletes it
+        if it is.  A fence that hasn't been placed counts as signaled.
+        """
+        if self.sync is None:
+            return True
+        result = gl.glClientWaitSync(self.sync,
+                                     gl.GL_SYNC_FLUSH_COMMANDS_BIT,
+                                     0)
+        if result == gl.GL_WAIT_FAILED:
+            raise Exception("glClientWaitSync failed.")
+        if result == gl.GL_TIMEOUT_EXPIRED:
+            return False
+        self.delete()
+        return True
+
+
+class PersistentBuffer:
+
+    """
+    A PersistentBuffer allocates immutable storage with glBufferStorage and
+    keeps it mapped, so that producers write vertex records straight into
+    GPU-visible memory through numpy arrays instead of copying them with
+    glBufferSubData.
+
+    The storage is divided into regions, each of capacity elements, which are
+    used in turn.  While the CPU writes one region, the GPU can still be
+    drawing from the others.  A Fence placed after the draws from a region is
+    waited on before that region is written again.
+
+    Use it like this:
+
+        with buffer.region_context() as array:
+            array[:n] = vertices
+            gl.glDrawArrays(mode, buffer.first, n)
+    """
+
+    FLAGS = (gl.GL_MAP_WRITE_BIT
+             | gl.GL_MAP_PERSISTENT_BIT
+             | gl.GL_MAP_COHERENT_BIT)
+
+    def __init__(self, dtype, capacity, regions=3):
+        """
+        * dtype is the numpy dtype of one element.
+        * capacity is the number of elements in each region.
+        * regions is the number of regions, e.g., three for triple buffering.
+
+        Members:
+        * arrays: a numpy array of shape (regions, capacity) + dtype.shape
+          that is mapped to the storage.
+        * region: the index of the region that is being written or was last
+          written.
+        """
+        state = GLState.current()
+        if not state.buffer_storage:
+            raise Exception(
+                "Persistent mapping needs OpenGL 4.4 or ARB_buffer_storage.")
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity
+        self.regions = regions
+        self.buffer_index = create_buffer()
+        register_object(gl.GL_BUFFER, self.buffer_index, self)
+        self.fences = [Fence() for _ in range(regions)]
+        self.region = regions - 1
+
+        nbytes = regions * capacity * self.dtype.itemsize
+        if state.direct_state_access:
+            gl.glNamedBufferStorage(self.buffer_index, nbytes, None,
+                                    self.FLAGS)
+            address = gl.glMapNamedBufferRange(self.buffer_index, 0, nbytes,
+                                               self.FLAGS)
+        else:
+            state.buffer(EDIT_TARGET).bind(self.buffer_index)
+            gl.glBufferStorage(EDIT_TARGET, nbytes, None, self.FLAGS)
+            address = gl.glMapBufferRange(EDIT_TARGET, 0, nbytes, self.FLAGS)
+        if not address:
+            raise Exception("Couldn't map the buffer.")
+        # The ctypes array keeps track of the mapping; the numpy arrays are
+        # views of it.
+        self.mapping = (ctypes.c_ubyte * nbytes).from_address(address)
+        self.arrays = np.frombuffer(self.mapping, dtype=self.dtype).reshape(
+            (regions, capacity) + self.dtype.shape)
+
+    # Properties --------------------------------------------------------------
+    @property
+    def array(self):
+        """
+        The region that is being written.
+        """
+        return self.arrays[self.region]
+
+    @property
+    def first(self):
+        """
+        The index of the first element of the region, e.g., the first vertex
+        to pass to glDrawArrays.
+        """
+        return self.region * self.capacity
+
+    @property
+    def offset(self):
+        """
+        The offset in bytes of the region.
+        """
+        return self.first * self.dtype.itemsize
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        for fence in self.fences:
+            fence.delete()
+        self.arrays = None
+        self.mapping = None
+        state = GLState.current()
+        if state.direct_state_access:
+            gl.glUnmapNamedBuffer(self.buffer_index)
+        else:
+            state.buffer(EDIT_TARGET).bind(self.buffer_index)
+            gl.glUnmapBuffer(EDIT_TARGET)
+        delete_buffer(self.buffer_index)
+        self.buffer_index = None
+
+    def acquire(self):
+        """
+        Advances to the next region, waiting until the GPU is done with it,
+        and returns it as a numpy array.
+        """
+        self.region = (self.region + 1) % self.regions
+        self.fences[self.region].wait()
+        return self.array
+
+    def release(self):
+        """
+        Fences the commands that read the current region.
+        """
+        self.fences[self.region].place()
+
+    @contextmanager
+    def region_context(self):
+        """
+        Yields the next region as a numpy array.  Draws that read the region
+        must be issued within the context.
+        """
+        array = self.acquire()
+        try:
+            yield array
+        finally:
+            self.release()
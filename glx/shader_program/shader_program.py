@@ -1,8 +1,11 @@
 from contextlib import contextmanager
 
+from ..debug_output import register_object
 from ..gl_importer import OpenGL, gl
+from ..gl_state import GLState
 from ..wrappers import glGetActiveAttrib
 from .shader import Shader
+from .uniform_block import uniform_block_registry
 from .uniform_description import UniformDescription
 from .vertex_array import VertexArray
 
@@ -16,26 +19,35 @@ class ShaderProgram:
     geometry shader, and fragment shader.  Calling bind_context binds the
     entire pipeline, and possible some uniform variables.   Its
     create_vertex_arrays method creates a list of VertexArray objects, which
-    allows binding of varying variables.
+    allows binding of varying variables, and its create_vertex_array method
+    creates one VertexArray that reads from several buffers.  Uniform blocks
+    are attached to the binding points of a UniformBlockRegistry, so they are
+    set by writing to a UniformBlock rather than by binding the program.
     """
 
-    def __init__(self, vertex=[], geometry=[], fragment=[],
-                 context_kwargs=None):
+    def __init__(self, vertex=[], geometry=[], fragment=[], compute=[],
+                 context_kwargs=None,
+                 uniform_block_registry=uniform_block_registry):
         """
-        * vertex, geometry and fragment are lists of filenames of included
-          shaders.
+        * vertex, geometry, fragment and compute are lists of filenames of
+          included shaders.  A program has either a compute shader or the
+          other stages; see ComputeProgram.
         * context_kwargs are passed to the mako runtime context.
+        * uniform_block_registry is the UniformBlockRegistry that assigns
+          binding points to the program's uniform blocks.
         """
         # pylint: disable=assignment-from-no-return
         self.program_index = gl.glCreateProgram()
         assert self.program_index > 0
+        register_object(gl.GL_PROGRAM, self.program_index, self)
         self.shaders = {(filename, type_): Shader(filename,
                                                   type_,
                                                   context_kwargs)
                         for filenames, type_ in [
                             (vertex, gl.GL_VERTEX_SHADER),
                             (geometry, gl.GL_GEOMETRY_SHADER),
-                            (fragment, gl.GL_FRAGMENT_SHADER)]
+                            (fragment, gl.GL_FRAGMENT_SHADER),
+                            (compute, gl.GL_COMPUTE_SHADER)]
                         for filename in filenames}
         for shader in self.shaders.values():
             gl.glAttachShader(self.program_index,
@@ -49,15 +61,16 @@ class ShaderProgram:
                             Shader program info log:
                             """ + log)
 
+        # A map from uniform block name to block index.
+        self.uniform_blocks = uniform_block_registry.bind_program(
+            self.program_index)
         self.create_uniform_binders()
 
     @contextmanager
     def bind_context(self, uniforms=None):
-        if uniforms is None:
-            uniforms = {}
-
+        program = GLState.current().program
         try:
-            gl.glUseProgram(self.program_index)
+            program.push(self.program_index)
         except OpenGL.error.GLError:
             log = gl.glGetProgramInfoLog(self.program_index).decode('latin')
             raise Exception("""
@@ -65,25 +78,51 @@ class ShaderProgram:
                             Shader program info log:
                             """ + log)
         try:
-            for name, value in uniforms.items():
-                getattr(self, name)(value)
+            if uniforms:
+                self.set_uniforms(uniforms)
             yield self
         finally:
-            gl.glUseProgram(0)
+            program.pop()
 
     def delete_program(self):
-        gl.glDeleteProgam(self.program_index)
+        gl.glDeleteProgram(self.program_index)
+        GLState.current().program.forget(self.program_index)
         self.program_index = 0
 
     def create_uniform_binders(self):
-        for shader in self.shaders.values():
-            if shader.type_ != gl.GL_VERTEX_SHADER:
-                continue
-            for u in UniformDescription.parse_shader_text(shader.shader_text):
-                if hasattr(self, u.name):
-                    raise ValueError(
-                        f"Multiple uniforms with the same name: {u.name}")
-                setattr(self, u.name, u.create_method(self.program_index))
+        """
+        Builds the uniform table from the active uniforms of the linked
+        program, which includes uniforms of every stage.  It sets:
+        * uniforms: a map from uniform name to UniformDescription, which
+          knows the uniform's location, type and setter, and
+        * uniform_setters: a map from uniform name to setter, which
+          set_uniforms dispatches through.
+        Each setter is also set as an attribute of this object so that, for
+        example, program.color(value) sets the uniform color.
+        """
+        self.uniforms = {}
+        self.uniform_setters = {}
+        for u in UniformDescription.active_uniforms(self.program_index):
+            if hasattr(self, u.name):
+                raise ValueError(
+                    f"Multiple uniforms with the same name: {u.name}")
+            setattr(self, u.name, u.setter)
+            self.uniforms[u.name] = u
+            self.uniform_setters[u.name] = u.setter
+
+    def set_uniforms(self, uniforms):
+        """
+        Sets the uniforms of the bound program.
+        * uniforms is a mapping from uniform name to value.
+        """
+        setters = self.uniform_setters
+        try:
+            for name, value in uniforms.items():
+                setters[name](value)
+        except KeyError as e:
+            raise ValueError(
+                f"Uniform {e.args[0]} is not active in the program.  Active "
+                f"uniforms are {sorted(setters)}.") from None
 
     def attribute_name_to_location(self, attribute_name):
         attribute_location = gl.glGetAttribLocation(
@@ -101,7 +140,17 @@ class ShaderProgram:
 
     def create_vertex_arrays(self, buffer_descriptions):
         """
+        Returns one VertexArray per buffer description.
         * buffer_descriptions is a reiterable of BufferDescription.
         """
-        return [VertexArray(self, buffer_description)
+        return [VertexArray(self, [buffer_description])
                 for buffer_description in buffer_descriptions]
+
+    def create_vertex_array(self, buffer_descriptions):
+        """
+        Returns one VertexArray whose attributes are read from the buffers of
+        all of the buffer descriptions, e.g., static positions from one buffer
+        and frequently rewritten colors from another.
+        * buffer_descriptions is a reiterable of BufferDescription.
+        """
+        return VertexArray(self, buffer_descriptions)
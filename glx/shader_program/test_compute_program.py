@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from .compute_program import ComputeProgram, memory_barrier
+from .gl_buffer import GLBuffer
+
+SHADER = """
+#version 430
+
+layout (local_size_x = ${local_size}) in;
+
+layout (std430) buffer Values
+{
+    float values[];
+};
+
+struct Output
+{
+    vec2 scaled;
+    uint index;
+};
+
+layout (std430) buffer Outputs
+{
+    Output outputs[];
+};
+
+uniform float scale;
+
+void main()
+{
+    uint i = gl_GlobalInvocationID.x;
+    if (i < values.length()) {
+        outputs[i].scaled = vec2(values[i] * scale, -values[i]);
+        outputs[i].index = i;
+    }
+}
+"""
+
+
+@pytest.fixture
+def shader_file(tmp_path):
+    path = tmp_path / 'scale.comp'
+    path.write_text(SHADER)
+    return str(path)
+
+
+@pytest.mark.parametrize('direct_state_access', [True, False])
+def test_dispatch_writes_storage_buffer(gl_state, shader_file,
+                                       direct_state_access):
+    if not direct_state_access:
+        gl_state.direct_state_access = False
+    program = ComputeProgram([shader_file], {'local_size': 32})
+    assert program.work_group_size == (32, 1, 1)
+    assert set(program.storage_blocks) == {'Values', 'Outputs'}
+
+    values = np.arange(100, dtype=np.float32)
+    output_dtype = np.dtype([('scaled', '<f4', 2),
+                             ('index', '<u4'),
+                             ('pad', '<u4')])
+    value_buffer = GLBuffer(np.float32)
+    value_buffer.upload(values)
+    output_buffer = GLBuffer(output_dtype, usage=gl.GL_DYNAMIC_READ)
+    output_buffer.allocate(len(values))
+    output_buffer.size = len(values)
+
+    program.dispatch_elements(len(values),
+                              {'Values': value_buffer,
+                               'Outputs': output_buffer},
+                              {'scale': 3.0})
+    memory_barrier(gl.GL_BUFFER_UPDATE_BARRIER_BIT)
+    outputs = output_buffer.read()
+    assert_array_equal(outputs['scaled'][:, 0], values * 3)
+    assert_array_equal(outputs['scaled'][:, 1], -values)
+    assert_array_equal(outputs['index'], np.arange(100))
+
+    with pytest.raises(ValueError):
+        program.bind_storage_buffers({'Missing': value_buffer})
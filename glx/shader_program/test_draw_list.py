@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from ..shader_programs import BasicShaderProgram
+from .buffer_description import BufferDescription
+from .draw_list import DrawList
+from .test_vertex_array import expected_image, quad, read_image
+
+RECTANGLES = [(0, 0, 2, 2), (3, 0, 2, 2), (6, 0, 2, 2), (9, 0, 2, 2),
+              (0, 4, 3, 3), (4, 4, 3, 3)]
+
+RED = np.array([1.0, 0.0, 0.0, 1.0], dtype='f')
+
+GREEN = np.array([0.0, 1.0, 0.0, 1.0], dtype='f')
+
+
+@pytest.fixture
+def program(context):
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    program.buffer.upload(np.concatenate([quad(*rectangle)
+                                          for rectangle in RECTANGLES]))
+    yield program
+    program.delete_program()
+
+
+def _record(draw_list, program, uniforms):
+    """
+    Records a draw of each rectangle, with the uniforms of the same index.
+    """
+    for i, rectangle_uniforms in enumerate(uniforms):
+        draw_list.draw_arrays(program, program.vertex_array,
+                              gl.GL_TRIANGLE_STRIP, 4 * i, 4,
+                              uniforms=rectangle_uniforms)
+
+
+def _execute(framebuffer, draw_list, sort=True):
+    framebuffer.clear()
+    with framebuffer.bind_context():
+        draw_list.execute(sort)
+    return read_image(framebuffer)
+
+
+def test_merging(render_target, program):
+    red = {'color': RED}
+    # A different mapping with equal values, so it is merged with red.
+    other_red = {'color': RED.copy()}
+    green = {'color': GREEN}
+    draw_list = DrawList()
+    _record(draw_list, program, [red, other_red, green, None, green, red])
+    image = _execute(render_target, draw_list)
+    assert sorted(len(group) for group in draw_list.groups) == [1, 2, 3]
+    for group in draw_list.groups:
+        assert len({command.uniforms_key for command in group}) == 1
+    # The draw without uniforms uses whatever color is set when it runs.
+    image[expected_image(render_target, RECTANGLES[3:4]).any(axis=-1)] = 0
+    assert_array_equal(
+        image,
+        expected_image(render_target, RECTANGLES[:2] + RECTANGLES[5:])
+        | expected_image(render_target, RECTANGLES[2:3] + RECTANGLES[4:5],
+                         color=(0, 255, 0, 255)))
+
+    # Without sorting, only consecutive draws are merged.
+    _execute(render_target, draw_list, sort=False)
+    assert [len(group) for group in draw_list.groups] == [2, 1, 1, 1, 1]
+    draw_list.delete()
+
+
+@pytest.mark.parametrize('sort', [True, False])
+def test_indirect_and_fallback_match(gl_state, render_target, program, sort):
+    if not gl_state.multi_draw_indirect:
+        pytest.skip("glMultiDrawArraysIndirect isn't supported.")
+    red = {'color': RED}
+    green = {'color': GREEN}
+    draw_list = DrawList()
+    _record(draw_list, program, [red, red, green, green, green, red])
+    indirect = _execute(render_target, draw_list, sort)
+    assert draw_list.indirect
+    assert gl.glGetInteger(gl.GL_DRAW_INDIRECT_BUFFER_BINDING) == 0
+    # Then the merged draws fall back to glMultiDrawArrays.
+    gl_state.multi_draw_indirect = False
+    fallback = _execute(render_target, draw_list, sort)
+    assert not draw_list.indirect
+
+    expected = (expected_image(render_target,
+                               RECTANGLES[:2] + RECTANGLES[5:])
+                | expected_image(render_target, RECTANGLES[2: 5],
+                                 color=(0, 255, 0, 255)))
+    assert_array_equal(indirect, expected)
+    assert_array_equal(fallback, expected)
+    draw_list.delete()
+
+
+def test_count_needs_known_size(render_target, program):
+    vertex_array, = program.create_vertex_arrays(
+        [BufferDescription(program.buffer.buffer_index,
+                           program.VERTEX_DTYPE,
+                           program.vertex_attributes())])
+    draw_list = DrawList()
+    with pytest.raises(ValueError):
+        draw_list.draw_arrays(program, vertex_array, gl.GL_TRIANGLE_STRIP)
+    assert len(draw_list) == 0
+    draw_list.draw_arrays(program, vertex_array, gl.GL_TRIANGLE_STRIP, 4, 4,
+                          uniforms={'color': RED})
+    assert_array_equal(_execute(render_target, draw_list),
+                       expected_image(render_target, RECTANGLES[1: 2]))
+    draw_list.delete()
+    vertex_array.delete()
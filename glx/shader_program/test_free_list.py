@@ -0,0 +1,39 @@
+import pytest
+
+from .free_list import FreeList
+
+
+def test_allocate_and_coalesce():
+    free_list = FreeList(10)
+    assert [free_list.allocate(n) for n in (3, 3, 3)] == [0, 3, 6]
+    assert free_list.allocate(2) is None
+    free_list.free(0, 3)
+    free_list.free(6, 3)
+    assert list(zip(free_list.starts, free_list.counts)) == [(0, 3), (6, 4)]
+    free_list.free(3, 3)
+    assert list(zip(free_list.starts, free_list.counts)) == [(0, 10)]
+    assert free_list.free_count == 10
+
+
+def test_first_fit_and_growth():
+    free_list = FreeList(8)
+    assert free_list.allocate(8) == 0
+    free_list.grow(16)
+    assert free_list.allocate(4) == 8
+    free_list.free(2, 2)
+    assert free_list.allocate(2) == 2
+    assert free_list.allocate(5) is None
+    assert free_list.allocate(4) == 12
+    free_list.reset(5)
+    assert list(zip(free_list.starts, free_list.counts)) == [(5, 11)]
+
+
+def test_bad_frees():
+    free_list = FreeList(8)
+    free_list.allocate(4)
+    with pytest.raises(ValueError):
+        free_list.free(2, 4)
+    with pytest.raises(ValueError):
+        free_list.free(6, 4)
+    with pytest.raises(ValueError):
+        free_list.grow(4)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from .gl_buffer import GLBuffer
+
+
+def _record_allocations(buffer):
+    """
+    Wraps the buffer's allocate, and returns the list of the capacities that
+    it allocates.
+    """
+    allocations = []
+
+    def allocate(capacity, allocate=buffer.allocate):
+        allocations.append(capacity)
+        allocate(capacity)
+    buffer.allocate = allocate
+    return allocations
+
+
+@pytest.mark.parametrize('direct_state_access', [True, False])
+def test_growth_preserves_contents(gl_state, direct_state_access):
+    if not direct_state_access:
+        gl_state.direct_state_access = False
+    buffer = GLBuffer(np.dtype(('f4', (2,))))
+    buffer_index = buffer.buffer_index
+    points = np.arange(200, dtype=np.float32).reshape(100, 2)
+    capacities = []
+    for i in range(len(points)):
+        buffer.write(points[i: i + 1], i)
+        capacities.append(buffer.capacity)
+    # The storage doubles, and it keeps its name.
+    assert sorted(set(capacities)) == [2 ** k for k in range(8)]
+    assert buffer.buffer_index == buffer_index
+    assert len(buffer) == len(points)
+    assert_array_equal(buffer.read(), points)
+
+    buffer.reserve(1000)
+    assert buffer.capacity == 1024
+    assert_array_equal(buffer.read(), points)
+
+    # Writes of sub-ranges leave the other elements alone.
+    buffer.write(-points[10:20], 10)
+    assert_array_equal(buffer.read(0, 10), points[:10])
+    assert_array_equal(buffer.read(10, 20), -points[10:20])
+    assert_array_equal(buffer.read(20), points[20:])
+
+    # Uploads that fit are written in place, so the elements past them are
+    # kept.  The storage is reallocated to orphan it or to grow it.
+    allocations = _record_allocations(buffer)
+    assert buffer.upload(points[:3]) == 3
+    assert allocations == []
+    assert_array_equal(buffer.read(), points[:3])
+    assert_array_equal(buffer.read(3, 10), points[3:10])
+    buffer.upload(points[:3], orphan=True)
+    assert allocations == [1024]
+    buffer.upload(np.zeros((1500, 2)))
+    assert allocations == [1024, 2048]
+    assert buffer.capacity == 2048
+    buffer.delete()
+
+
+def test_stream_buffers_orphan(context):
+    buffer = GLBuffer(np.dtype(('f4', (2,))), 4, usage=gl.GL_STREAM_DRAW)
+    allocations = _record_allocations(buffer)
+    buffer.upload(np.ones((4, 2)))
+    buffer.upload(np.ones((4, 2)), orphan=False)
+    assert allocations == [4]
+    assert_array_equal(buffer.read(), np.ones((4, 2)))
+    buffer.delete()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from ..shader_programs import BasicShaderProgram
+from .test_vertex_array import expected_image, quad, read_image
+
+
+@pytest.mark.parametrize('direct_state_access', [True, False])
+def test_freed_ranges_are_reused(gl_state, render_target,
+                                 direct_state_access):
+    if not direct_state_access:
+        gl_state.direct_state_access = False
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    arena = program.create_mesh_arena(capacity=8)
+    rectangles = [(0, 0, 2, 2), (4, 0, 2, 2), (8, 0, 2, 2)]
+    a, b, c = [arena.allocate(quad(*rectangle)) for rectangle in rectangles]
+    # The third mesh didn't fit, so the buffer grew.
+    assert arena.buffer.capacity == 16
+    assert_array_equal(arena.buffer.read(a.first, a.first + 4),
+                       quad(*rectangles[0]))
+
+    first = b.first
+    arena.free(b)
+    d = arena.allocate(quad(4, 4, 2, 2))
+    assert d.first == first
+    assert arena.buffer.capacity == 16
+
+    def draw():
+        render_target.clear()
+        with render_target.bind_context(), program.bind_context(
+                {'color': np.array([1.0, 0.0, 0.0, 1.0], dtype='f')}):
+            arena.draw(gl.GL_TRIANGLE_STRIP)
+        return read_image(render_target)
+
+    expected = expected_image(render_target,
+                              [rectangles[0], rectangles[2], (4, 4, 2, 2)])
+    assert_array_equal(draw(), expected)
+
+    # Defragmenting moves the meshes into the freed range.
+    arena.free(a)
+    arena.defragment()
+    assert sorted((mesh.first, mesh.count) for mesh in arena.meshes) == [
+        (0, 4), (4, 4)]
+    assert_array_equal(draw(),
+                       expected_image(render_target,
+                                      [rectangles[2], (4, 4, 2, 2)]))
+    arena.delete()
+    program.delete_program()
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..shader_programs import BasicShaderProgram
+from .buffer_description import BufferDescription
+from .persistent_buffer import PersistentBuffer
+from .test_vertex_array import expected_image, quad, read_image
+
+
+def _record_waits(buffer):
+    """
+    Wraps the wait of each region's fence, and returns the list of
+    (region, whether the fence was placed) for each wait.
+    """
+    waits = []
+    for region, fence in enumerate(buffer.fences):
+        def wait(region=region, fence=fence, wait=fence.wait):
+            waits.append((region, fence.sync is not None))
+            wait()
+        fence.wait = wait
+    return waits
+
+
+def test_draw_from_regions(render_target):
+    if not GLState.current().buffer_storage:
+        pytest.skip("Persistent mapping isn't supported.")
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    buffer = PersistentBuffer(program.VERTEX_DTYPE, capacity=4, regions=3)
+    vertex_array, = program.create_vertex_arrays(
+        [BufferDescription(buffer, None, program.vertex_attributes())])
+    waits = _record_waits(buffer)
+    color = np.array([1.0, 0.0, 0.0, 1.0], dtype='f')
+
+    for frame in range(5):
+        render_target.clear()
+        rectangle = (2 * frame, frame % 3, 3, 2)
+        with render_target.bind_context(), program.bind_context(
+                {'color': color}):
+            with buffer.region_context() as array:
+                # The vertices are written straight into the mapping.
+                array[:] = quad(*rectangle)
+                assert buffer.region == frame % 3
+                vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP, buffer.first,
+                                         4)
+        assert buffer.fences[buffer.region].sync is not None
+        assert_array_equal(read_image(render_target),
+                           expected_image(render_target, [rectangle]))
+
+    # Every region is acquired after waiting on its fence, which has been
+    # placed once the region has been drawn from.
+    assert waits == [(0, False), (1, False), (2, False), (0, True),
+                     (1, True)]
+
+    # Only a GLBuffer knows how many vertices there are to draw.
+    with pytest.raises(ValueError):
+        vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP)
+    vertex_array.delete()
+    buffer.delete()
+    program.delete_program()
+
+
+def test_raw_buffer_index_needs_count(context):
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    vertex_array, = program.create_vertex_arrays(
+        [BufferDescription(program.buffer.buffer_index,
+                           program.VERTEX_DTYPE,
+                           program.vertex_attributes())])
+    assert vertex_array.buffer is None
+    with pytest.raises(ValueError):
+        vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP)
+    vertex_array.delete()
+    program.delete_program()
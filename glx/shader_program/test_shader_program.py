@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from .shader_program import ShaderProgram
+
+VERTEX_SHADER = """
+#version 330
+
+uniform vec2 offsets[3];
+uniform float weights[2];
+// Nothing reads unused, so the compiler removes it.
+uniform float unused;
+
+in vec2 vertex;
+
+void main()
+{
+    gl_Position = vec4(
+        vertex + (offsets[0] + offsets[1] + offsets[2]) * weights[1],
+        0.0, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+uniform vec4 color;
+uniform float weights[2];
+
+out vec4 fragment_color;
+
+void main()
+{
+    fragment_color = color * weights[0];
+}
+"""
+
+
+@pytest.fixture
+def program(context, tmp_path):
+    vertex = tmp_path / 'uniforms.vert'
+    vertex.write_text(VERTEX_SHADER)
+    fragment = tmp_path / 'uniforms.frag'
+    fragment.write_text(FRAGMENT_SHADER)
+    program = ShaderProgram(vertex=[str(vertex)], fragment=[str(fragment)])
+    yield program
+    program.delete_program()
+
+
+def _uniform(program, name, size):
+    values = np.zeros(size, dtype=np.float32)
+    gl.glGetUniformfv(program.program_index,
+                      gl.glGetUniformLocation(program.program_index, name),
+                      values)
+    return values
+
+
+def test_uniform_table(program):
+    # Uniforms used by either stage are listed once, without [0].
+    assert set(program.uniforms) == {'offsets', 'weights', 'color'}
+    offsets = program.uniforms['offsets']
+    assert (offsets.array_length, offsets.method_name) == (3, 'Uniform2fv')
+    weights = program.uniforms['weights']
+    assert (weights.array_length, weights.method_name) == (2, 'Uniform1fv')
+    assert program.uniforms['color'].gl_type == gl.GL_FLOAT_VEC4
+    assert not hasattr(program, 'unused')
+
+    offsets = np.arange(6, dtype=np.float32).reshape(3, 2)
+    with program.bind_context({'offsets': offsets,
+                               'weights': np.array([0.5, 2.0], dtype='f')}):
+        program.color(np.array([1.0, 0.5, 0.25, 1.0], dtype='f'))
+    for i in range(3):
+        assert_array_equal(_uniform(program, f'offsets[{i}]', 2), offsets[i])
+    assert_array_equal(_uniform(program, 'weights[1]', 1), [2.0])
+    assert_array_equal(_uniform(program, 'color', 4), [1.0, 0.5, 0.25, 1.0])
+
+
+@pytest.mark.parametrize('name', ['missing', 'unused'])
+def test_inactive_uniforms(program, name):
+    with program.bind_context():
+        with pytest.raises(ValueError, match=name):
+            program.set_uniforms({name: np.float32(1.0)})
@@ -0,0 +1,333 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from .attribute import Attribute
+from .bound_attribute import BoundAttribute
+from .buffer_description import BufferDescription
+from .element_buffer import ElementBuffer
+from .gl_buffer import GLBuffer
+from .shader_program import ShaderProgram
+
+VERTEX_SHADER = """
+#version 330
+
+layout (std140, row_major) uniform Camera
+{
+    mat4 projection;
+    mat4 view;
+};
+
+in vec2 position;
+in vec2 offset;
+in vec4 color;
+in float weights[2];
+
+out vec4 v_color;
+
+void main()
+{
+    gl_Position = projection * view * vec4(position + offset, 0.0, 1.0);
+    v_color = color * vec4(weights[0], weights[1], 1.0, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+
+out vec4 fragment_color;
+
+void main()
+{
+    fragment_color = v_color;
+}
+"""
+
+RED = (255, 0, 0, 255)
+
+VERTEX_DTYPE = np.dtype([('position', 'f4', 2),
+                         ('color', 'f4', 4),
+                         ('weights', 'f4', 2)])
+
+OFFSET_DTYPE = np.dtype(('f4', (2,)))
+
+
+@pytest.fixture
+def program(context, tmp_path):
+    vertex = tmp_path / 'vertex_array.vert'
+    vertex.write_text(VERTEX_SHADER)
+    fragment = tmp_path / 'vertex_array.frag'
+    fragment.write_text(FRAGMENT_SHADER)
+    program = ShaderProgram(vertex=[str(vertex)], fragment=[str(fragment)])
+    yield program
+    program.delete_program()
+
+
+def quad(x, y, width, height):
+    """
+    Returns the corners of a rectangle in triangle strip order.
+    """
+    return np.array([[x, y],
+                     [x + width, y],
+                     [x, y + height],
+                     [x + width, y + height]], dtype='f')
+
+
+def expected_image(framebuffer, rectangles, color=RED):
+    """
+    Returns the image, indexed from the bottom, of the (x, y, width, height)
+    rectangles filled with color.
+    """
+    image = np.zeros((framebuffer.height, framebuffer.width, 4),
+                     dtype=np.uint8)
+    for x, y, width, height in rectangles:
+        image[y: y + height, x: x + width] = color
+    return image
+
+
+def read_image(framebuffer):
+    return framebuffer.read()[::-1]
+
+
+def vertices(points, color=(1.0, 1.0, 0.0, 1.0), weights=(1.0, 0.0)):
+    """
+    Returns vertices of VERTEX_DTYPE, which are drawn in color times
+    (weights[0], weights[1], 1, 1): red by default.
+    """
+    array = np.zeros(len(points), dtype=VERTEX_DTYPE)
+    array['position'] = points
+    array['color'] = color
+    array['weights'] = weights
+    return array
+
+
+def vertex_attributes(names=('position', 'color', 'weights')):
+    attributes = {'position': Attribute('position', ['position'],
+                                        is_vector=True),
+                  'color': Attribute('color', ['color'], is_vector=True),
+                  'weights': Attribute('weights', ['weights'], array_size=2)}
+    return [attributes[name] for name in names]
+
+
+def force_binding_mode(gl_state, mode):
+    """
+    Switches off the capabilities that the binding mode, one of those of
+    BoundAttribute, doesn't need, so that vertex arrays created afterwards
+    use it.
+    """
+    if mode != BoundAttribute.DIRECT_STATE_ACCESS:
+        gl_state.direct_state_access = False
+    if mode == BoundAttribute.POINTER:
+        gl_state.vertex_attrib_binding = False
+
+
+def draw(framebuffer, program, draw_function):
+    """
+    Returns the image, indexed from the bottom, that draw_function draws into
+    the cleared framebuffer.
+    """
+    framebuffer.clear()
+    with framebuffer.bind_context(), program.bind_context():
+        draw_function()
+    return read_image(framebuffer)
+
+
+MODES = [BoundAttribute.DIRECT_STATE_ACCESS,
+         BoundAttribute.VERTEX_ATTRIB_BINDING,
+         BoundAttribute.POINTER]
+
+
+# (name, direct state access, vertex attrib binding, whether array
+# attributes can share a binding point, and the expected binding modes of the
+# attributes position and weights).
+BINDING_MODES = [
+    ('direct_state_access', True, True, True,
+     BoundAttribute.DIRECT_STATE_ACCESS, BoundAttribute.DIRECT_STATE_ACCESS),
+    ('direct_state_access_separate', True, True, False,
+     BoundAttribute.DIRECT_STATE_ACCESS, BoundAttribute.DIRECT_STATE_ACCESS),
+    ('vertex_attrib_binding', False, True, True,
+     BoundAttribute.VERTEX_ATTRIB_BINDING,
+     BoundAttribute.VERTEX_ATTRIB_BINDING),
+    ('vertex_attrib_binding_separate', False, True, False,
+     BoundAttribute.VERTEX_ATTRIB_BINDING, BoundAttribute.POINTER),
+    ('pointer', False, False, True,
+     BoundAttribute.POINTER, BoundAttribute.POINTER)]
+
+
+@pytest.mark.parametrize(
+    'direct_state_access, vertex_attrib_binding, shared, position_mode, '
+    'weights_mode',
+    [mode[1:] for mode in BINDING_MODES],
+    ids=[mode[0] for mode in BINDING_MODES])
+def test_binding_modes(gl_state, render_target, program, direct_state_access,
+                       vertex_attrib_binding, shared, position_mode,
+                       weights_mode):
+    if not direct_state_access:
+        gl_state.direct_state_access = False
+    if not vertex_attrib_binding:
+        gl_state.vertex_attrib_binding = False
+    if not shared:
+        # The elements of weights are then read through separate binding
+        # points, or, without direct state access, fall back to pointers.
+        gl_state.max_vertex_attrib_relative_offset = 0
+
+    # Each vertex has two positions, which are chosen when drawing.  The
+    # first puts the rectangle outside of the framebuffer.
+    dtype = np.dtype([('position', 'f4', (2, 2)),
+                      ('offset', 'f4', 2),
+                      ('color', 'f4', 4),
+                      ('weights', 'f4', 2)])
+    vertices = np.zeros(4, dtype=dtype)
+    vertices['position'][:, 0] = quad(100, 100, 8, 4)
+    vertices['position'][:, 1] = quad(4, 2, 8, 4)
+    vertices['color'] = (1.0, 1.0, 0.0, 1.0)
+    vertices['weights'] = (1.0, 0.0)
+    buffer = GLBuffer(dtype)
+    buffer.upload(vertices)
+    vertex_array = program.create_vertex_array(
+        [BufferDescription(buffer,
+                           None,
+                           [Attribute('position', ['position'],
+                                      is_vector=True),
+                            Attribute('offset', ['offset'], is_vector=True),
+                            Attribute('color', ['color'], is_vector=True),
+                            Attribute('weights', ['weights'],
+                                      array_size=2)])])
+    attributes = vertex_array.attributes
+    assert attributes['position'].binding_mode == position_mode
+    assert attributes['weights'].binding_mode == weights_mode
+    assert attributes['weights'].shares_binding == (
+        shared and weights_mode != BoundAttribute.POINTER)
+    for index in [2, -1, (1, 0)]:
+        with pytest.raises(IndexError):
+            attributes['position'].bind(index)
+
+    with render_target.bind_context(), program.bind_context():
+        with vertex_array.bind_context():
+            # In the POINTER binding mode, the attribute reads from the
+            # buffer that is bound to GL_ARRAY_BUFFER.
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, buffer.buffer_index)
+            attributes['position'].bind(1)
+            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP)
+    assert_array_equal(read_image(render_target),
+                       expected_image(render_target, [(4, 2, 8, 4)]))
+    vertex_array.delete()
+    buffer.delete()
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_instancing(gl_state, render_target, program, mode):
+    force_binding_mode(gl_state, mode)
+    vertex_buffer = GLBuffer(VERTEX_DTYPE)
+    vertex_buffer.upload(vertices(quad(0, 0, 2, 2)))
+    instance_buffer = GLBuffer(OFFSET_DTYPE)
+    instance_buffer.upload([[0, 0], [4, 1], [8, 2], [12, 3]])
+    vertex_array = program.create_vertex_array(
+        [BufferDescription(vertex_buffer, None, vertex_attributes()),
+         BufferDescription(instance_buffer,
+                           None,
+                           [Attribute('offset', [], is_vector=True,
+                                      divisor=1)])])
+    assert vertex_array.attributes['offset'].binding_mode == mode
+    rectangles = [(0, 0, 2, 2), (4, 1, 2, 2), (8, 2, 2, 2), (12, 3, 2, 2)]
+    assert_array_equal(
+        draw(render_target, program,
+             lambda: vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP,
+                                              instance_count=4)),
+        expected_image(render_target, rectangles))
+    assert_array_equal(
+        draw(render_target, program,
+             lambda: vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP,
+                                              instance_count=2,
+                                              base_instance=2)),
+        expected_image(render_target, rectangles[2:]))
+    vertex_array.delete()
+    vertex_buffer.delete()
+    instance_buffer.delete()
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('dtype', [np.uint8, np.uint16, np.uint32])
+def test_primitive_restart(gl_state, render_target, program, mode, dtype):
+    force_binding_mode(gl_state, mode)
+    vertex_buffer = GLBuffer(VERTEX_DTYPE)
+    vertex_buffer.upload(vertices(np.concatenate([quad(1, 1, 3, 3),
+                                                  quad(8, 2, 4, 4)])))
+    element_buffer = ElementBuffer(dtype)
+    strips = element_buffer.join_strips([[0, 1, 2, 3], [4, 5, 6, 7]])
+    assert strips[4] == np.iinfo(dtype).max
+    element_buffer.upload(strips)
+    vertex_array = program.create_vertex_array(
+        [BufferDescription(vertex_buffer, None, vertex_attributes(),
+                           element_buffer)])
+    # Without the restart, the strip would join the rectangles.
+    assert_array_equal(
+        draw(render_target, program,
+             lambda: vertex_array.draw_elements(gl.GL_TRIANGLE_STRIP,
+                                                primitive_restart=True)),
+        expected_image(render_target, [(1, 1, 3, 3), (8, 2, 4, 4)]))
+    # An offset and a base vertex select the second strip.
+    assert_array_equal(
+        draw(render_target, program,
+             lambda: vertex_array.draw_elements(
+                 gl.GL_TRIANGLE_STRIP, count=4,
+                 offset=5 * element_buffer.dtype.itemsize)),
+        expected_image(render_target, [(8, 2, 4, 4)]))
+    assert_array_equal(
+        draw(render_target, program,
+             lambda: vertex_array.draw_elements(gl.GL_TRIANGLE_STRIP,
+                                                count=4, base_vertex=4)),
+        expected_image(render_target, [(8, 2, 4, 4)]))
+    vertex_array.delete()
+    vertex_buffer.delete()
+    element_buffer.delete()
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_multiple_buffers(gl_state, render_target, program, mode):
+    force_binding_mode(gl_state, mode)
+    # The positions and the colors are read from separate buffers.
+    position_buffer = GLBuffer(VERTEX_DTYPE)
+    position_buffer.upload(vertices(quad(2, 1, 4, 3)))
+    color_buffer = GLBuffer(VERTEX_DTYPE)
+    color_buffer.upload(vertices(np.zeros((4, 2))))
+    offset_buffer = GLBuffer(OFFSET_DTYPE)
+    offset_buffer.upload(np.zeros((4, 2)))
+    descriptions = [
+        BufferDescription(position_buffer, None,
+                          vertex_attributes(['position'])),
+        BufferDescription(color_buffer, None,
+                          vertex_attributes(['color', 'weights'])),
+        BufferDescription(offset_buffer, None,
+                          [Attribute('offset', [], is_vector=True)])]
+    vertex_array = program.create_vertex_array(descriptions)
+    assert vertex_array.buffers == [position_buffer, color_buffer,
+                                    offset_buffer]
+
+    def draw_rectangle():
+        return draw(render_target, program,
+                    lambda: vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP))
+
+    assert_array_equal(draw_rectangle(),
+                       expected_image(render_target, [(2, 1, 4, 3)]))
+    # Rewriting one buffer changes only its attributes.
+    color_buffer.upload(vertices(np.zeros((4, 2)),
+                                 color=(1.0, 1.0, 1.0, 1.0),
+                                 weights=(0.0, 1.0)))
+    assert_array_equal(draw_rectangle(),
+                       expected_image(render_target, [(2, 1, 4, 3)],
+                                      color=(0, 255, 255, 255)))
+    offset_buffer.upload(np.full((4, 2), 8.0))
+    assert_array_equal(draw_rectangle(),
+                       expected_image(render_target, [(10, 9, 4, 3)],
+                                      color=(0, 255, 255, 255)))
+
+    with pytest.raises(ValueError):
+        program.create_vertex_array(descriptions[:2] + descriptions[1:2])
+    vertex_array.delete()
+    for buffer in [position_buffer, color_buffer, offset_buffer]:
+        buffer.delete()
@@ -0,0 +1,129 @@
+import numpy as np
+
+from ..debug_output import register_object
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..wrappers import (glGetActiveUniformBlockName, glGetInteger,
+                        glGetProgramInteger)
+from .buffer_functions import (buffer_data, buffer_sub_data, create_buffer,
+                               delete_buffer)
+
+__all__ = ['UniformBlock', 'UniformBlockRegistry', 'uniform_block_registry']
+
+
+class UniformBlockRegistry:
+
+    """
+    A UniformBlockRegistry assigns a uniform buffer binding point to each
+    uniform block name.  Every ShaderProgram that declares a block with a
+    registered name has the block attached to that binding point when it is
+    linked.  Writing to the UniformBlock whose buffer is bound there therefore
+    updates all of those programs without binding any of them.
+    """
+
+    def __init__(self):
+        # A map from uniform block name to binding point.
+        self.binding_points = {}
+
+    def binding_point(self, block_name):
+        """
+        Returns the binding point of the block called block_name, assigning a
+        new one if necessary.
+        """
+        try:
+            return self.binding_points[block_name]
+        except KeyError:
+            binding_point = len(self.binding_points)
+            max_bindings = glGetInteger(gl.GL_MAX_UNIFORM_BUFFER_BINDINGS)
+            if binding_point >= max_bindings:
+                raise ValueError(
+                    f"Can't assign a binding point to uniform block "
+                    f"{block_name}: all {max_bindings} are in use.")
+            self.binding_points[block_name] = binding_point
+            return binding_point
+
+    def bind_program(self, program_index):
+        """
+        Attaches each active uniform block in the linked program to its
+        binding point.  Returns a map from block name to block index.
+        """
+        block_indices = {}
+        count = glGetProgramInteger(program_index,
+                                    gl.GL_ACTIVE_UNIFORM_BLOCKS)
+        for block_index in range(count):
+            name = glGetActiveUniformBlockName(program_index, block_index)
+            gl.glUniformBlockBinding(program_index,
+                                     block_index,
+                                     self.binding_point(name))
+            block_indices[name] = block_index
+        return block_indices
+
+
+uniform_block_registry = UniformBlockRegistry()
+
+
+class UniformBlock:
+
+    """
+    A UniformBlock owns the uniform buffer object that backs a GLSL uniform
+    block, e.g.,
+
+        layout (std140, row_major) uniform Camera
+        {
+            mat4 projection;
+            mat4 view;
+        };
+
+    The buffer is bound to the binding point that the registry assigns to the
+    block's name, so a single write is seen by every program that declares the
+    block.  Each write binds it again, so that of several blocks with the same
+    name, the one written last is the one that programs read.
+    """
+
+    def __init__(self,
+                 name,
+                 dtype,
+                 registry=uniform_block_registry,
+                 usage=gl.GL_DYNAMIC_DRAW):
+        """
+        * name is the name of the uniform block in the GLSL source.
+        * dtype is a structured numpy dtype whose fields are laid out
+          according to the block's layout, e.g., std140.  Declaring the block
+          row_major lets matrix fields be written as ordinary numpy matrices.
+        * registry is the UniformBlockRegistry that assigns the binding point.
+        * usage is the usage hint passed to glBufferData.
+        """
+        if not isinstance(dtype, np.dtype) or dtype.fields is None:
+            raise TypeError("The dtype of a uniform block must be a "
+                            "structured numpy dtype.")
+        self.name = name
+        self.data = np.zeros(1, dtype=dtype)
+        self.binding_point = registry.binding_point(name)
+        self.buffer_index = create_buffer()
+        register_object(gl.GL_BUFFER, self.buffer_index, self)
+        buffer_data(self.buffer_index, self.data, usage)
+        self.bind()
+
+    def delete(self):
+        delete_buffer(self.buffer_index)
+        self.buffer_index = None
+
+    def write(self, **values):
+        """
+        Sets the named fields of the block and uploads the block.
+        """
+        for name, value in values.items():
+            self.data[name] = value
+        self.upload()
+
+    def bind(self):
+        """
+        Binds the buffer to the block's binding point, unless it is already
+        bound there.
+        """
+        GLState.current().indexed_buffer(
+            gl.GL_UNIFORM_BUFFER, self.binding_point).bind(self.buffer_index)
+
+    def upload(self):
+        buffer_sub_data(self.buffer_index, 0, self.data)
+        self.bind()
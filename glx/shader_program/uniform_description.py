@@ -1,43 +1,160 @@
 import re
+from functools import partial
 
 import numpy as np
 
 from ..gl_importer import gl
+from ..wrappers import glGetActiveUniform, glGetProgramInteger
 
 __all__ = ['UniformDescription']
 
 
+def _glsl_type_names():
+    """
+    Returns a map from the GL type enumerants returned by glGetActiveUniform
+    to the GLSL type names understood by the parse methods.
+    """
+    # Samplers and images are all set with glUniform1i.
+    opaque_pattern = (r'GL_(INT_|UNSIGNED_INT_|)(SAMPLER|IMAGE)_'
+                      r'(\d|CUBE|BUFFER)')
+    retval = {getattr(gl, name): ('image' if 'IMAGE' in name else 'sampler')
+              for name in dir(gl)
+              if re.match(opaque_pattern, name)}
+    for prefix, glsl_prefix in [('FLOAT', ''),
+                                ('DOUBLE', 'd'),
+                                ('INT', 'i'),
+                                ('UNSIGNED_INT', 'u'),
+                                ('BOOL', 'b')]:
+        for size in range(2, 5):
+            retval[getattr(gl, f'GL_{prefix}_VEC{size}')] = \
+                f'{glsl_prefix}vec{size}'
+    for prefix, glsl_prefix in [('FLOAT', ''), ('DOUBLE', 'd')]:
+        for shape in ['2', '3', '4',
+                      '2x3', '2x4', '3x2', '3x4', '4x2', '4x3']:
+            retval[getattr(gl, f'GL_{prefix}_MAT{shape}')] = \
+                f'{glsl_prefix}mat{shape}'
+    retval.update({gl.GL_BOOL: 'bool',
+                   gl.GL_INT: 'int',
+                   gl.GL_UNSIGNED_INT: 'uint',
+                   gl.GL_FLOAT: 'float',
+                   gl.GL_DOUBLE: 'double'})
+    return retval
+
+
 class UniformDescription:
 
+    GLSL_TYPE_NAMES = _glsl_type_names()
+
     def __init__(self, name, array_length, is_matrix, method_name, dtype):
+        """
+        * name is the name of the uniform in the GLSL source.
+        * array_length is the number of elements the setter passes to
+          OpenGL, or None for scalars.
+        * is_matrix is a Boolean that says whether the uniform is a matrix.
+        * method_name is the name of the glUniform* function without the gl
+          prefix, e.g., Uniform4fv.
+        * dtype is the numpy type of the uniform's components.
+
+        Descriptions that are created from a linked program by
+        active_uniforms also set:
+        * location: the location of the uniform in the program,
+        * gl_type: the GL type enumerant, e.g., GL_FLOAT_VEC4, and
+        * setter: a function of one argument, the value, that sets the
+          uniform of the bound program.
+        """
         self.name = name
         self.array_length = array_length
         self.is_matrix = is_matrix
         self.method_name = method_name
         self.dtype = dtype
+        self.location = -1
+        self.gl_type = None
+        self.setter = None
 
     # New methods -------------------------------------------------------------
     def create_method(self, program_index):
-        index = gl.glGetUniformLocation(program_index, self.name)
+        return self.create_setter(
+            gl.glGetUniformLocation(program_index, self.name))
+
+    def create_setter(self, location):
+        """
+        Returns a function of one argument, the value, that sets the uniform at
+        location.  Scalars are passed straight to the glUniform* function.
+        Vectors, matrices and arrays are converted to contiguous arrays of
+        dtype first, which doesn't copy values that already are, because the
+        production GL profile makes PyOpenGL raise rather than copy them.
+        """
         method = getattr(gl, 'gl' + self.method_name)
+        if self.array_length is None:
+            setter = partial(method, location)
+            setter.description = self
+            return setter
+        if self.is_matrix:
+            method = partial(method, location, self.array_length, gl.GL_TRUE)
+        else:
+            method = partial(method, location, self.array_length)
+        dtype = self.dtype
+
+        def setter(value):
+            method(np.ascontiguousarray(value, dtype))
+        setter.description = self
+        return setter
+
+    @classmethod
+    def active_uniforms(cls, program_index):
+        """
+        Returns an iterable of UniformDescription objects of the active
+        uniforms in all stages of the linked program.  Members of uniform
+        blocks and built-in uniforms are excluded.
+        """
+        count = glGetProgramInteger(program_index, gl.GL_ACTIVE_UNIFORMS)
+        if count == 0:
+            return
+        block_indices = np.empty(count, dtype=np.int32)
+        gl.glGetActiveUniformsiv(program_index,
+                                 count,
+                                 np.arange(count, dtype=np.uint32),
+                                 gl.GL_UNIFORM_BLOCK_INDEX,
+                                 block_indices)
+        for index, block_index in enumerate(block_indices):
+            if block_index != -1:
+                continue
+            name, size, gl_type = glGetActiveUniform(program_index, index)
+            if name.startswith('gl_'):
+                continue
+            yield cls.from_active_uniform(
+                name, int(size), int(gl_type),
+                gl.glGetUniformLocation(program_index, name))
+
+    @classmethod
+    def from_active_uniform(cls, name, size, gl_type, location):
+        """
+        Returns a UniformDescription given the values returned by
+        glGetActiveUniform:
+        * name, a string, which ends with [0] for arrays,
+        * size, the number of active array elements,
+        * gl_type, a GL type enumerant such as GL_FLOAT_VEC4, and
+        * location, the uniform location.
+        """
+        try:
+            type_ = cls.GLSL_TYPE_NAMES[gl_type]
+        except KeyError:
+            raise ValueError(
+                f"Type {gl_type:#x} of uniform {name} not understood") \
+                from None
+        if name.endswith('[0]'):
+            name = name[:-3]
+            array_length = size
+        else:
+            array_length = None
 
-        def internal_create_method(index, method, array_length):
-            # pylint: disable=cell-var-from-loop
-            if self.is_matrix:
-                def h(ref):
-                    # assert ref.dtype == h.description.dtype
-                    method(index, array_length, gl.GL_TRUE, ref)
-            elif self.array_length is not None:
-                def h(ref):
-                    # assert ref.dtype == h.description.dtype
-                    method(index, array_length, ref)
-            else:
-                def h(value):
-                    # assert value.dtype == h.description.dtype
-                    method(index, value)
-            h.description = self
-            return h
-        return internal_create_method(index, method, self.array_length)
+        u = (cls.parse_vector(name, type_, array_length)
+             or cls.parse_matrix(name, type_, array_length)
+             or cls.parse_scalar(name, type_, array_length))
+        u.location = location
+        u.gl_type = gl_type
+        u.setter = u.create_setter(location)
+        return u
 
     @classmethod
     def parse_shader_text(cls, shader_text):
@@ -106,8 +223,9 @@ class UniformDescription:
         * type_, a string such as bvec4, and
         * array_length, an integer or None.
         """
-        if any(type_.startswith(x + 'sampler')
-               for x in ['', 'i', 'u']):
+        if any(type_.startswith(x + opaque_type)
+               for x in ['', 'i', 'u']
+               for opaque_type in ['sampler', 'image']):
             type_code = 'i'
         else:
             try:
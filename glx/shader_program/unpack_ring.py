@@ -0,0 +1,78 @@
+import ctypes
+from contextlib import contextmanager
+
+import numpy as np
+
+from ..gl_importer import gl
+from ..gl_state import GLState
+from ..tools import next_power_of_two
+from .buffer_functions import (buffer_data, buffer_sub_data, create_buffer,
+                               delete_buffer)
+from .persistent_buffer import Fence
+
+__all__ = ['UnpackRing']
+
+
+class UnpackRing:
+
+    """
+    An UnpackRing stages texture uploads through pixel unpack buffers.  When
+    glTexImage2D is given client memory, the driver copies and converts the
+    pixels before the call returns.  Instead, the pixels are written into a
+    pixel unpack buffer that the GPU isn't reading, and the texture is updated
+    from that buffer, so the transfer overlaps with rendering.  The buffers
+    are used in turn, and a Fence placed after each update keeps a buffer from
+    being overwritten before the GPU has read it.
+
+    Use it like this:
+
+        with ring.unpack_context(array) as pixels:
+            raw_gl_1_1.glTexSubImage2D(..., pixels)
+
+    The raw PyOpenGL functions must be used because the wrapped ones treat
+    the pixels argument as client memory.
+    """
+
+    def __init__(self, slots=3):
+        """
+        * slots is the number of pixel unpack buffers, and so the largest
+          number of uploads that the GPU can be behind on.
+        """
+        self.buffers = [create_buffer() for _ in range(slots)]
+        # The size in bytes of each buffer's storage.
+        self.capacities = [0 for _ in self.buffers]
+        self.fences = [Fence() for _ in self.buffers]
+        self.slot = slots - 1
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        for fence, buffer_index in zip(self.fences, self.buffers):
+            fence.delete()
+            delete_buffer(buffer_index)
+        self.buffers = []
+
+    @contextmanager
+    def unpack_context(self, array):
+        """
+        Writes array, a numpy array, into the next pixel unpack buffer, and
+        yields the pointer to pass to the texture upload, which must be issued
+        within the context.
+        """
+        self.slot = (self.slot + 1) % len(self.buffers)
+        buffer_index = self.buffers[self.slot]
+        self.fences[self.slot].wait()
+        array = np.ascontiguousarray(array)
+        if array.nbytes > self.capacities[self.slot]:
+            capacity = next_power_of_two(array.nbytes)
+            buffer_data(buffer_index, None, gl.GL_STREAM_DRAW, capacity)
+            self.capacities[self.slot] = capacity
+        buffer_sub_data(buffer_index, 0, array)
+
+        binding = GLState.current().buffer(gl.GL_PIXEL_UNPACK_BUFFER)
+        with binding.context(buffer_index):
+            # With a pixel unpack buffer bound, the pointer argument is an
+            # offset into it.
+            yield ctypes.c_void_p(0)
+        # Uploads from client memory would otherwise read from the buffer.
+        binding.unbind()
+        self.fences[self.slot].place()
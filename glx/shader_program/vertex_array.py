@@ -1,7 +1,13 @@
+import ctypes
 from contextlib import contextmanager
 
+from ..debug_output import register_object
 from ..gl_importer import gl as gl
+from ..gl_state import GLState
+from ..wrappers import glCreateName, glDeleteNames, glGenName
 from .bound_attribute import BoundAttribute
+from .element_buffer import ElementBuffer
+from .gl_buffer import GLBuffer
 
 __all__ = []
 
@@ -14,40 +20,107 @@ class VertexArray:
     BoundAttribute are created to do the individual binding.
     """
 
-    def __init__(self, program, buffer_description):
+    def __init__(self, program, buffer_descriptions):
         """
         * program is a ShaderProgram object.
-        * buffer_description is a BufferDescription object.
+        * buffer_descriptions is a reiterable of BufferDescription objects,
+          each of which describes the attributes that are read from one
+          buffer.  Splitting the attributes among several buffers lets
+          attributes that change often be rewritten without touching the
+          others.  The buffer of a description can be a GLBuffer or
+          PersistentBuffer.  The element_buffer of at most one description
+          holds the indices for draw_elements.
 
         Creating this object will enable the specified attributes, which
-        associates them with the bound buffer.
+        associates them with their buffers.  If the context supports direct
+        state access, this happens without binding the vertex array or the
+        buffers.
         """
-        # The GL vertex array index.
-        self.vertex_array = gl.glGenVertexArrays(1)
+        buffer_descriptions = list(buffer_descriptions)
+        if not buffer_descriptions:
+            raise ValueError("A vertex array needs a buffer description.")
         # A map from attribute name to an instance of BoundAttribute.
         self.attributes = {}
+        # The GLBuffer or PersistentBuffer of each buffer description, or None
+        # for buffer descriptions that have a raw buffer index.
+        self.buffers = [buffer_description.buffer
+                        for buffer_description in buffer_descriptions]
+        # The buffer of the first buffer description.
+        self.buffer = self.buffers[0]
+        self.element_buffer = None
+        element_buffers = [buffer_description.element_buffer
+                           for buffer_description in buffer_descriptions
+                           if buffer_description.element_buffer is not None]
+        if len(element_buffers) > 1:
+            raise ValueError("A vertex array has only one element buffer.")
 
-        with self.bind_context():
-            # Bind buffer for attribute name.
-            gl.glBindBuffer(gl.GL_ARRAY_BUFFER,
-                            buffer_description.buffer_index)
-
-            for attribute in buffer_description.attributes:
-                bound_attribute = BoundAttribute(
-                    attribute,
-                    program,
-                    buffer_description.buffer_dtype)
-                bound_attribute.enable_attributes()
-                if not bound_attribute.indexer:
-                    bound_attribute.bind()
-                self.attributes[attribute.name] = bound_attribute
-
-            # Finished describing buffers.
-            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        if GLState.current().direct_state_access:
+            # The GL vertex array index.
+            self.vertex_array = glCreateName(gl.glCreateVertexArrays)
+            for buffer_description in buffer_descriptions:
+                self.create_bound_attributes(program,
+                                             buffer_description,
+                                             self.vertex_array)
+        else:
+            # The GL vertex array index.
+            self.vertex_array = glGenName(gl.glGenVertexArrays)
+
+            with self.bind_context():
+                for buffer_description in buffer_descriptions:
+                    # Bind buffer for attribute name.
+                    gl.glBindBuffer(gl.GL_ARRAY_BUFFER,
+                                    buffer_description.buffer_index)
+
+                    self.create_bound_attributes(program, buffer_description)
+
+                # Finished describing buffers.
+                gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        register_object(gl.GL_VERTEX_ARRAY, self.vertex_array, self)
+
+        for element_buffer in element_buffers:
+            self.set_element_buffer(element_buffer)
+
+    def create_bound_attributes(self, program, buffer_description,
+                                vertex_array=None):
+        """
+        * vertex_array is the GL vertex array index if the attributes should
+          be specified using direct state access.  Otherwise, the vertex array
+          must be bound.
+        """
+        for attribute in buffer_description.attributes:
+            if attribute.name in self.attributes:
+                raise ValueError(
+                    f'Attribute "{attribute.name}" is described by more than '
+                    f'one buffer description.')
+            bound_attribute = BoundAttribute(
+                attribute,
+                program,
+                buffer_description.buffer_dtype,
+                vertex_array,
+                buffer_description.buffer_index)
+            bound_attribute.enable_attributes()
+            if not bound_attribute.indexer:
+                bound_attribute.bind()
+            self.attributes[attribute.name] = bound_attribute
+
+    def set_element_buffer(self, element_buffer):
+        """
+        Makes element_buffer, an ElementBuffer, the source of the indices
+        for draw_elements.  The binding is part of the vertex array's state.
+        """
+        if GLState.current().direct_state_access:
+            gl.glVertexArrayElementBuffer(self.vertex_array,
+                                          element_buffer.buffer_index)
+        else:
+            with self.bind_context():
+                gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER,
+                                element_buffer.buffer_index)
+        self.element_buffer = element_buffer
 
     def delete(self):
         assert self.vertex_array is not None
-        gl.glDeleteVertexArrays(1, [self.vertex_array])
+        glDeleteNames(gl.glDeleteVertexArrays, [self.vertex_array])
+        GLState.current().vertex_array.forget(self.vertex_array)
         self.vertex_array = None
 
     @contextmanager
@@ -55,8 +128,81 @@ class VertexArray:
         if self.vertex_array is None:
             yield
         else:
-            gl.glBindVertexArray(self.vertex_array)
-            try:
+            with GLState.current().vertex_array.context(self.vertex_array):
                 yield
-            finally:
-                gl.glBindVertexArray(0)
+
+    def default_count(self, first):
+        """
+        Returns the number of vertices from first to the last element
+        written into buffer.  Only a GLBuffer knows how much has been
+        written, so draws from a PersistentBuffer or a raw buffer index must
+        be given a count.
+        """
+        if not isinstance(self.buffer, GLBuffer):
+            raise ValueError(
+                "Pass the count of vertices to draw: the number of elements "
+                "in a PersistentBuffer or a raw buffer index isn't known.")
+        return len(self.buffer) - first
+
+    def draw_arrays(self, mode, first=0, count=None, instance_count=None,
+                    base_instance=0):
+        """
+        Draws count vertices starting at first with mode, e.g.,
+        GL_TRIANGLE_STRIP.  The program must be bound.
+        * count defaults to the number of elements written into buffer if it
+          is a GLBuffer; see default_count.
+        * instance_count is the number of instances to draw, or None to draw
+          without instancing.  Attributes with a nonzero divisor advance per
+          instance.
+        * base_instance is the instance that the per-instance attributes
+          start from.
+        """
+        if count is None:
+            count = self.default_count(first)
+        with self.bind_context():
+            if instance_count is None:
+                gl.glDrawArrays(mode, first, count)
+            elif base_instance:
+                gl.glDrawArraysInstancedBaseInstance(
+                    mode, first, count, instance_count, base_instance)
+            else:
+                gl.glDrawArraysInstanced(mode, first, count, instance_count)
+
+    def draw_elements(self, mode, count=None, element_type=None, offset=0,
+                      instance_count=None, base_vertex=0, base_instance=0,
+                      primitive_restart=False):
+        """
+        Draws count indices of type element_type, e.g., GL_UNSIGNED_INT,
+        starting at the byte offset into the element array buffer of the
+        vertex array.  The program must be bound.
+        * count and element_type default to the number of indices after
+          offset in element_buffer and their type.
+        * instance_count and base_instance are as for draw_arrays.
+        * base_vertex is added to each index.
+        * primitive_restart is whether the largest value of element_type
+          restarts the primitive, e.g., to draw many triangle strips at once.
+        """
+        if element_type is None:
+            element_type = self.element_buffer.element_type
+        if count is None:
+            count = (len(self.element_buffer)
+                     - offset // self.element_buffer.dtype.itemsize)
+        GLState.current().primitive_restart(
+            ElementBuffer.RESTART_INDICES[element_type]
+            if primitive_restart
+            else None)
+        indices = ctypes.c_void_p(offset)
+        with self.bind_context():
+            if instance_count is None:
+                if base_vertex:
+                    gl.glDrawElementsBaseVertex(mode, count, element_type,
+                                                indices, base_vertex)
+                else:
+                    gl.glDrawElements(mode, count, element_type, indices)
+            elif base_vertex or base_instance:
+                gl.glDrawElementsInstancedBaseVertexBaseInstance(
+                    mode, count, element_type, indices, instance_count,
+                    base_vertex, base_instance)
+            else:
+                gl.glDrawElementsInstanced(mode, count, element_type, indices,
+                                           instance_count)
@@ -1 +1,3 @@
 from .basic import *
+from .camera_block import *
+from .streaming_polyline import *
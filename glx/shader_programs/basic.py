@@ -1,8 +1,11 @@
+from importlib.resources import files
+
 import numpy as np
-from pkg_resources import resource_filename
 
 from ..gl_importer import gl
-from ..shader_program import Attribute, BufferDescription, ShaderProgram
+from ..shader_program import (Attribute, BufferDescription, GLBuffer,
+                              MeshArena, ShaderProgram)
+from .streaming_polyline import StreamingPolyline
 
 __all__ = ['BasicShaderProgram']
 
@@ -14,20 +17,44 @@ class BasicShaderProgram(ShaderProgram):
     triangle strips or lines.
     """
 
+    VERTEX_DTYPE = np.dtype(('f', (2,)))
+
     def __init__(self, uniforms={}):
         super().__init__(
-            vertex=[resource_filename('glx', 'glsl_shaders/basic.vert')],
-            fragment=[resource_filename('glx', 'glsl_shaders/basic.frag')])
+            vertex=[str(files('glx') / 'glsl_shaders' / 'basic.vert')],
+            fragment=[str(files('glx') / 'glsl_shaders' / 'basic.frag')])
 
         with self.bind_context(uniforms):
             # Create one buffer.
-            self.buffer, = gl.glGenBuffers(1)
+            # The buffer is fed using a numpy array of shape (n, 2), which
+            # describes n (x, y) pairs, e.g., self.buffer.upload(points).
+            self.buffer = GLBuffer(self.VERTEX_DTYPE)
 
             # Create one vertex array and describe it.
-            # The array is fed using a numpy array of shape (n, 2), which
-            # describes n (x, y) pairs.
             self.vertex_array, = self.create_vertex_arrays(
                 [BufferDescription(
                     self.buffer,
-                    np.dtype(('f', (2,))),
-                    [Attribute('vertex', [], is_vector=True)])])
+                    None,
+                    self.vertex_attributes())])
+
+    # New methods -------------------------------------------------------------
+    def vertex_attributes(self):
+        return [Attribute('vertex', [], is_vector=True)]
+
+    def create_mesh_arena(self, capacity=0, usage=gl.GL_STATIC_DRAW):
+        """
+        Returns a MeshArena for many small geometries, each a numpy array of
+        shape (n, 2), that are drawn with one call.
+        """
+        return MeshArena(self,
+                         self.VERTEX_DTYPE,
+                         self.vertex_attributes(),
+                         capacity,
+                         usage)
+
+    def create_streaming_polyline(self, capacity, usage=gl.GL_STREAM_DRAW):
+        """
+        Returns a StreamingPolyline that keeps the last capacity (x, y)
+        samples appended to it in a ring buffer.
+        """
+        return StreamingPolyline(self, capacity, usage)
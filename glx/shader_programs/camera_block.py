@@ -0,0 +1,21 @@
+import numpy as np
+
+from ..shader_program import UniformBlock
+
+__all__ = ['CameraBlock']
+
+
+class CameraBlock(UniformBlock):
+
+    """
+    The CameraBlock backs the Camera uniform block that is declared by the
+    shaders in glsl_shaders.  It holds the projection and view matrices, which
+    a Viewport writes once per frame using write_camera_block.
+    """
+
+    BLOCK_NAME = 'Camera'
+    BLOCK_TYPE = np.dtype([('projection', '<f4', (4, 4)),
+                           ('view', '<f4', (4, 4))])
+
+    def __init__(self, **kwargs):
+        super().__init__(self.BLOCK_NAME, self.BLOCK_TYPE, **kwargs)
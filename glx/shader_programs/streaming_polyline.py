@@ -0,0 +1,142 @@
+import numpy as np
+
+from ..gl_importer import gl
+from ..shader_program import BufferDescription, GLBuffer
+
+__all__ = ['StreamingPolyline']
+
+
+class StreamingPolyline:
+
+    """
+    A StreamingPolyline is a polyline of the most recent capacity samples,
+    e.g., a telemetry history, that is drawn by a BasicShaderProgram.
+
+    The samples are stored in a ring in a GLBuffer.  Appending uploads only
+    the new samples, overwriting the oldest ones once the ring is full.  The
+    x coordinates of the samples must be nondecreasing so that drawing can
+    search for the samples within a visible x range.
+
+    The buffer has one more element than the ring: the sample at ring index
+    zero is duplicated after the end of the ring.  A line strip that crosses
+    the end of the ring is then drawn as two ranges that share that sample,
+    i.e., without losing the segment across the wrap.
+    """
+
+    def __init__(self, program, capacity, usage=gl.GL_STREAM_DRAW):
+        """
+        * program is a BasicShaderProgram.
+        * capacity is the number of samples in the ring.
+        * usage is the usage hint of the buffer.
+        """
+        if capacity < 2:
+            raise ValueError("A polyline needs a capacity of at least two.")
+        self.program = program
+        self.capacity = capacity
+        self.buffer = GLBuffer(program.VERTEX_DTYPE, capacity + 1, usage)
+        self.vertex_array, = program.create_vertex_arrays(
+            [BufferDescription(self.buffer,
+                               None,
+                               program.vertex_attributes())])
+        # The x coordinates of the ring for searching.
+        self.x = np.zeros(capacity, dtype=np.float64)
+        # The ring index of the oldest sample.
+        self.start = 0
+        # The number of samples in the ring.
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # New methods -------------------------------------------------------------
+    def delete(self):
+        self.vertex_array.delete()
+        self.buffer.delete()
+
+    def clear(self):
+        self.start = 0
+        self.size = 0
+
+    def append(self, samples):
+        """
+        Appends samples, a numpy array of shape (n, 2) of (x, y) pairs.
+        """
+        samples = self.buffer.elements(samples).reshape(-1, 2)
+        if len(samples) > self.capacity:
+            samples = samples[-self.capacity:]
+        n = len(samples)
+        if not n:
+            return
+        stop = (self.start + self.size) % self.capacity
+        first_count = min(n, self.capacity - stop)
+        self.write(stop, samples[:first_count])
+        if first_count < n:
+            self.write(0, samples[first_count:])
+        overflow = max(0, self.size + n - self.capacity)
+        self.start = (self.start + overflow) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def write(self, ring_index, samples):
+        self.buffer.write(samples, ring_index)
+        self.x[ring_index: ring_index + len(samples)] = samples[:, 0]
+        if ring_index == 0:
+            self.buffer.write(samples[:1], self.capacity)
+
+    def search(self, x, side):
+        """
+        Returns the index into the samples, oldest first, at which x would be
+        inserted to keep them sorted, as for numpy.searchsorted.
+        """
+        first_count = min(self.size, self.capacity - self.start)
+        first = self.x[self.start: self.start + first_count]
+        index = int(np.searchsorted(first, x, side))
+        if index < first_count:
+            return index
+        second = self.x[:self.size - first_count]
+        return first_count + int(np.searchsorted(second, x, side))
+
+    def visible_ranges(self, x_min, x_max):
+        """
+        Returns the ranges of the buffer, as (first, count) pairs, to draw as
+        line strips to show the polyline between x_min and x_max.  The
+        samples just outside of the range are included so that the line
+        reaches the edges.  There are at most two ranges.
+        """
+        if not self.size:
+            return []
+        lo = max(self.search(x_min, 'left') - 1, 0)
+        hi = min(self.search(x_max, 'right') + 1, self.size)
+        if hi - lo < 2:
+            return []
+        first = (self.start + lo) % self.capacity
+        count = hi - lo
+        if first + count <= self.capacity:
+            return [(first, count)]
+        # Draw up to and including the duplicate of ring index zero, and
+        # then from ring index zero.
+        first_count = self.capacity - first
+        return [(first, first_count + 1), (0, count - first_count)]
+
+    def draw(self, x_min=-np.inf, x_max=np.inf, mode=gl.GL_LINE_STRIP):
+        """
+        Draws the polyline between x_min and x_max with at most one call.  The
+        program must be bound.
+        """
+        ranges = self.visible_ranges(x_min, x_max)
+        if not ranges:
+            return
+        with self.vertex_array.bind_context():
+            if len(ranges) == 1:
+                (first, count), = ranges
+                gl.glDrawArrays(mode, first, count)
+            else:
+                firsts, counts = np.array(ranges, dtype=np.int32).T.copy()
+                gl.glMultiDrawArrays(mode, firsts, counts, len(ranges))
+
+    def draw_visible(self, viewport, mode=gl.GL_LINE_STRIP):
+        """
+        Draws the part of the polyline within the x range of the viewport's
+        scene_visible_rect.
+        """
+        visible_rect = viewport.scene_visible_rect()
+        self.draw(visible_rect.mins[0], visible_rect.maxes[0], mode)
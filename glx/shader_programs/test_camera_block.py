@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from rectangle import Rect
+
+from ..gl_importer import gl
+from ..shader_program import get_buffer_sub_data
+from ..viewport import OrthoProjection, OrthoView, Viewport
+from ..wrappers import glGetActiveUniform, glGetProgramInteger
+from .basic import BasicShaderProgram
+from .camera_block import CameraBlock
+
+
+def _block_layout(program, block_name):
+    """
+    Returns a map from the name of each member of the uniform block to its
+    (offset, matrix stride, is row major) in the linked program.
+    """
+    program_index = program.program_index
+    count = glGetProgramInteger(program_index, gl.GL_ACTIVE_UNIFORMS)
+    indices = np.arange(count, dtype=np.uint32)
+
+    def query(pname):
+        values = np.empty(count, dtype=np.int32)
+        gl.glGetActiveUniformsiv(program_index, count, indices, pname,
+                                 values)
+        return values
+
+    block_indices = query(gl.GL_UNIFORM_BLOCK_INDEX)
+    layout = zip(query(gl.GL_UNIFORM_OFFSET),
+                 query(gl.GL_UNIFORM_MATRIX_STRIDE),
+                 query(gl.GL_UNIFORM_IS_ROW_MAJOR))
+    return {glGetActiveUniform(program_index, index)[0]: member
+            for index, member in enumerate(layout)
+            if block_indices[index] == program.uniform_blocks[block_name]}
+
+
+@pytest.mark.parametrize('direct_state_access', [True, False])
+def test_layout(gl_state, direct_state_access):
+    if not direct_state_access:
+        gl_state.direct_state_access = False
+    camera_block = CameraBlock()
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    dtype = CameraBlock.BLOCK_TYPE
+    data_size = gl.GLint()
+    gl.glGetActiveUniformBlockiv(
+        program.program_index,
+        program.uniform_blocks[CameraBlock.BLOCK_NAME],
+        gl.GL_UNIFORM_BLOCK_DATA_SIZE,
+        data_size)
+    assert data_size.value == dtype.itemsize
+
+    layout = _block_layout(program, CameraBlock.BLOCK_NAME)
+    assert set(layout) == set(dtype.names)
+    for name, (offset, matrix_stride, row_major) in layout.items():
+        field_dtype, field_offset = dtype.fields[name]
+        assert offset == field_offset
+        # Each row of the numpy matrix is one row of the GLSL matrix.
+        assert matrix_stride == field_dtype.base.itemsize * 4
+        assert row_major
+
+    viewport = Viewport(OrthoProjection(Rect([2.0, 3.0], [40.0, 20.0])),
+                        OrthoView(zoom=[2.0, 0.5], scroll=[5, -7]))
+    viewport.write_camera_block(camera_block)
+    data = np.zeros(1, dtype=dtype)
+    get_buffer_sub_data(camera_block.buffer_index, 0, data)
+    assert_array_equal(data['projection'][0],
+                       viewport.projection.widget_to_gl.astype(np.float32))
+    assert_array_equal(data['view'][0],
+                       viewport.view.matrix('scene', 'widget', np.float32))
+    program.delete_program()
+    camera_block.delete()
+
+
+def test_written_block_is_bound(context):
+    def bound_buffer(camera_block):
+        buffer_index = np.zeros(1, dtype=np.int32)
+        gl.glGetIntegeri_v(gl.GL_UNIFORM_BUFFER_BINDING,
+                           camera_block.binding_point, buffer_index)
+        return buffer_index[0]
+
+    # The blocks share the binding point of the Camera block, and the one
+    # written last is bound there.
+    first = CameraBlock()
+    second = CameraBlock()
+    assert first.binding_point == second.binding_point
+    assert bound_buffer(second) == second.buffer_index
+    first.write(projection=np.eye(4))
+    assert bound_buffer(first) == first.buffer_index
+    second.write(view=np.eye(4))
+    assert bound_buffer(second) == second.buffer_index
+    first.delete()
+    second.delete()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from ..gl_importer import gl
+from .basic import BasicShaderProgram
+
+CAPACITY = 12
+
+
+def _drawn_samples(polyline):
+    """
+    Returns the samples in the order in which draw passes them to the line
+    strips, with the sample that the strips share at the end of the ring
+    once.
+    """
+    parts = [polyline.buffer.read(first, first + count)
+             for first, count in polyline.visible_ranges(-np.inf, np.inf)]
+    if len(parts) == 2:
+        assert_array_equal(parts[0][-1], parts[1][0])
+        parts[1] = parts[1][1:]
+    return np.concatenate(parts)
+
+
+@pytest.mark.parametrize('chunk', [1, 5, CAPACITY + 1])
+def test_wraparound(render_target, chunk):
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    polyline = program.create_streaming_polyline(CAPACITY)
+    # A zigzag with one segment per pixel column, which wraps around the
+    # ring twice.  The last samples span the framebuffer.
+    i = np.arange(31)
+    samples = np.stack([i - 15.0, 1.5 + 5.0 * (i % 2)], axis=1)
+    for start in range(0, len(samples), chunk):
+        polyline.append(samples[start: start + chunk])
+    assert len(polyline) == CAPACITY
+    assert polyline.start != 0
+    assert len(polyline.visible_ranges(-np.inf, np.inf)) == 2
+    assert_array_equal(_drawn_samples(polyline), samples[-CAPACITY:])
+
+    def draw(draw_function):
+        render_target.clear()
+        with render_target.bind_context(), program.bind_context(
+                {'color': np.array([1.0, 1.0, 1.0, 1.0], dtype='f')}):
+            draw_function()
+        return render_target.read()
+
+    image = draw(polyline.draw)
+    # The ring draws the same pixels as one line strip of the samples.
+    program.buffer.upload(samples[-CAPACITY:])
+    expected = draw(lambda: program.vertex_array.draw_arrays(
+        gl.GL_LINE_STRIP))
+    assert image.any()
+    assert_array_equal(image, expected)
+    polyline.delete()
+    program.delete_program()
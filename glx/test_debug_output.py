@@ -0,0 +1,43 @@
+import logging
+
+import pytest
+
+from .debug_output import DebugOutput
+from .gl_importer import gl
+from .gl_profiles import gl_profile, select_gl_profile
+from .gl_state import GLState
+from .shader_program import GLBuffer
+
+
+def test_select_gl_profile():
+    with pytest.raises(ValueError):
+        select_gl_profile('fastest')
+    # OpenGL.GL has been imported, so only the selected profile is accepted.
+    select_gl_profile(gl_profile())
+    other = 'debug' if gl_profile() != 'debug' else 'production'
+    with pytest.raises(ValueError):
+        select_gl_profile(other)
+
+
+def test_debug_output(context, caplog):
+    state = GLState.current()
+    if state.debug_output is not None:
+        state.debug_output.uninstall()
+    debug_output = DebugOutput()
+    debug_output.install()
+    buffer = GLBuffer('f4', 4)
+    binding = state.buffer(gl.GL_COPY_WRITE_BUFFER)
+    with caplog.at_level(logging.DEBUG, logger='glx.debug_output'), \
+            binding.context(buffer.buffer_index):
+        gl.glDebugMessageInsert(gl.GL_DEBUG_SOURCE_APPLICATION,
+                                gl.GL_DEBUG_TYPE_MARKER, 7,
+                                gl.GL_DEBUG_SEVERITY_NOTIFICATION, -1,
+                                b'marker')
+    debug_output.uninstall()
+    assert state.debug_output is None
+    records = [record for record in caplog.records
+               if record.name == 'glx.debug_output']
+    assert len(records) == 1
+    assert 'application marker 7: marker' in records[0].getMessage()
+    assert records[0].glx_objects == [buffer]
+    buffer.delete()
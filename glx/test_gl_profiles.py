@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import glx
+from glx.gl_profiles import ENVIRONMENT_VARIABLE, GL_PROFILES
+
+# Sets uniforms from float64 values, which the production profile would
+# refuse to copy for glUniform*, and draws a rectangle with them.
+CODE = """
+import numpy as np
+from rectangle import Rect
+
+from glx import (BasicShaderProgram, CameraBlock, Framebuffer,
+                 OffscreenContext, OrthoProjection, OrthoView, Viewport,
+                 gl, gl_profile)
+
+assert gl_profile() == {profile!r}
+context = OffscreenContext()
+camera_block = CameraBlock()
+Viewport(OrthoProjection(Rect(sizes=[4, 4])),
+         OrthoView(scroll=[0, -4])).write_camera_block(camera_block)
+program = BasicShaderProgram({{'model': np.eye(4)}})
+program.buffer.upload(np.array([[0, 0], [1, 0], [0, 4], [1, 4]], dtype='f'))
+framebuffer = Framebuffer(4, 4)
+framebuffer.clear()
+# A list, which is converted as well, doubles the width of the rectangle.
+with framebuffer.bind_context(), program.bind_context(
+        {{'model': [[2, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1]]}}):
+    program.color(np.array([0.0, 1.0, 0.0, 1.0]))
+    program.vertex_array.draw_arrays(gl.GL_TRIANGLE_STRIP)
+image = framebuffer.read()
+assert (image[:, :2] == (0, 255, 0, 255)).all(), image
+assert not image[:, 2:].any(), image
+context.delete()
+"""
+
+
+@pytest.mark.parametrize('profile', list(GL_PROFILES))
+def test_float64_uniforms(profile):
+    subprocess.run([sys.executable, '-c', CODE.format(profile=profile)],
+                   cwd=Path(glx.__file__).parent.parent,
+                   env={**os.environ, ENVIRONMENT_VARIABLE: profile},
+                   check=True)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from .gl_importer import gl
+from .gl_state import Binding, GLState
+from .offscreen import OffscreenContext
+from .shader_programs import BasicShaderProgram
+from .wrappers import glGetInteger
+
+
+def _count_binds(binding):
+    """
+    Wraps the bind function of binding, and returns the list of the names
+    that it is called with.
+    """
+    calls = []
+    bind_function = binding.bind_function
+
+    def counting_bind_function(name):
+        calls.append(name)
+        bind_function(name)
+    binding.bind_function = counting_bind_function
+    return calls
+
+
+def test_nested_contexts():
+    calls = []
+    binding = Binding(calls.append)
+    with binding.context(4):
+        with binding.context(5):
+            pass
+        # Popping rebinds the object of the enclosing context.
+        assert calls == [4, 5, 4]
+        binding.unbind()
+    # The last pop leaves the object bound.
+    assert calls == [4, 5, 4]
+    binding.unbind()
+    binding.unbind()
+    assert calls == [4, 5, 4, 0]
+
+
+def test_redundant_binds_and_deferred_unbinds(context):
+    state = GLState.current()
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    state.unbind_all()
+    calls = _count_binds(state.program)
+    try:
+        for _ in range(3):
+            with program.bind_context():
+                with program.bind_context():
+                    pass
+        assert calls == [program.program_index]
+        assert (glGetInteger(gl.GL_CURRENT_PROGRAM)
+                == program.program_index)
+        state.unbind_all()
+        assert calls == [program.program_index, 0]
+        assert glGetInteger(gl.GL_CURRENT_PROGRAM) == 0
+    finally:
+        state.program.bind_function = gl.glUseProgram
+        program.delete_program()
+
+
+def test_contexts_have_separate_states(context):
+    state = GLState.current()
+    program = BasicShaderProgram({'model': np.eye(4, dtype='f')})
+    state.program.bind(program.program_index)
+    other = OffscreenContext()
+    try:
+        other_state = GLState.current()
+        assert other_state is not state
+        assert other_state.program.current is None
+        assert glGetInteger(gl.GL_CURRENT_PROGRAM) == 0
+        other_state.program.bind(0)
+    finally:
+        other.delete()
+        context.make_current()
+    assert GLState.current() is state
+    assert state.program.current == program.program_index
+    assert glGetInteger(gl.GL_CURRENT_PROGRAM) == program.program_index
+    state.unbind_all()
+    program.delete_program()
@@ -0,0 +1,40 @@
+import importlib
+import inspect
+import subprocess
+import sys
+from pathlib import Path
+
+import glx
+
+
+def test_exports():
+    for module_name, names in glx._EXPORTS.items():
+        module = importlib.import_module(f'glx.{module_name}')
+        if hasattr(module, '__all__'):
+            public = set(module.__all__)
+        else:
+            public = {name
+                      for name, value in vars(module).items()
+                      if not name.startswith('_')
+                      and not inspect.ismodule(value)}
+        assert set(names) == public, module_name
+        for name in names:
+            assert getattr(glx, name) is getattr(module, name)
+
+
+def test_lazy_imports():
+    code = """
+import sys
+import glx.transformations
+import glx.viewport
+glx.OrthoView
+glx.select_gl_profile('production')
+assert not {'OpenGL.GL', 'freetype', 'mako', 'pkg_resources'} & set(
+    sys.modules)
+import OpenGL._configflags
+glx.gl
+assert not OpenGL._configflags.ERROR_CHECKING
+"""
+    subprocess.run([sys.executable, '-c', code],
+                   cwd=Path(glx.__file__).parent.parent,
+                   check=True)
@@ -3,7 +3,7 @@ from contextlib import contextmanager
 import numpy as np
 from rectangle import Rect
 
-from .ortho_view import OrthoView
+from .ortho_view import OrthoView, memoized_property, read_only
 
 __all__ = ['BoundedOrthoView']
 
@@ -20,6 +20,8 @@ class BoundedOrthoView(OrthoView):
     * the represented area in scene space,
     * a range of valid zoom levels, and
     * a border.
+    The rectangles, like the matrices, are cached until the state changes,
+    which includes the scene rectangle, border and widget size.
     """
 
     def __init__(self,
@@ -56,9 +58,9 @@ class BoundedOrthoView(OrthoView):
         """
         super().__init__(zoom=zoom, scroll=scroll)
         self.scene_rect_ = scene_rect
-        self.border = border
+        self.border_ = border
         self.zoom_range = zoom_range
-        self.widget_size_ = widget_size
+        self.widget_size_ = read_only(np.array(widget_size))
 
     # Settable vector properties ----------------------------------------------
     @OrthoView.zoom.setter
@@ -79,6 +81,16 @@ class BoundedOrthoView(OrthoView):
     @scene_rect.setter
     def scene_rect(self, new_scene_rect):
         self.scene_rect_ = new_scene_rect
+        self.changed()
+
+    @property
+    def border(self):
+        return self.border_
+
+    @border.setter
+    def border(self, new_border):
+        self.border_ = new_border
+        self.changed()
 
     @property
     def widget_size(self):
@@ -86,19 +98,21 @@ class BoundedOrthoView(OrthoView):
 
     @widget_size.setter
     def widget_size(self, new_widget_size):
-        self.widget_size_ = new_widget_size
+        if not np.array_equal(new_widget_size, self.widget_size_):
+            self.widget_size_ = read_only(np.array(new_widget_size))
+            self.changed()
         self.scroll = self.scroll  # Clamp the scroll.
 
     # Rectangle properties ----------------------------------------------------
-    @property
+    @memoized_property
     def screen_rect(self):
         return (self.scene_rect * self.flipped_zoom).rectified().bordered(
             self.border)
 
-    @property
+    @memoized_property
     def scroll_range_rect(self):
-        return Rect(self.screen_rect.mins,
-                    self.screen_rect.maxes - self.widget_size)
+        screen_rect = self.screen_rect
+        return Rect(screen_rect.mins, screen_rect.maxes - self.widget_size)
 
     # Value updaters ----------------------------------------------------------
     def hold_and_set_scene_rect(self,
@@ -112,18 +126,21 @@ class BoundedOrthoView(OrthoView):
         """
         Scrolls the scene to make a point (in widget space) map to the same
         scene space.  This keeps the spot under the pointer from moving when
-        the zoom command is being issued with the mouse.
+        the zoom command is being issued with the mouse.  widget_hold_point
+        can have two components, or four homogeneous ones.
         """
         def scene_hold_point(widget_hold_point):
             if widget_hold_point is None:
-                return np.zeros(4)
-            return self.widget_to_scene.dot(widget_hold_point)
+                return np.zeros(2)
+            return self.convert(np.asarray(widget_hold_point)[:2],
+                                'widget', 'scene')
         shp = scene_hold_point(widget_hold_point)
         try:
             yield
         finally:
-            delta_shp = (shp - scene_hold_point(widget_hold_point))[:2]
-            self.scroll += (delta_shp * self.flipped_zoom).astype(np.int32)
+            delta_shp = shp - scene_hold_point(widget_hold_point)
+            self.scroll = (self.scroll
+                           + (delta_shp * self.flipped_zoom).astype(np.int32))
 
     def __repr__(self):
         return (f"{type(self).__name__}("
@@ -1,10 +1,35 @@
-import numpy as np
+import functools
 
-from ..transformations import translation_matrix
+import numpy as np
 
 __all__ = ['OrthoView']
 
 
+def read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+def memoized_property(compute):
+    """
+    Returns a property of an OrthoView whose value is computed by compute
+    when it is first needed, and cached until the state of the view changes.
+    """
+    name = compute.__name__
+
+    @functools.wraps(compute)
+    def get(self):
+        try:
+            return self.cache[name]
+        except KeyError:
+            value = compute(self)
+            if isinstance(value, np.ndarray):
+                read_only(value)
+            self.cache[name] = value
+            return value
+    return property(get)
+
+
 class OrthoView:
     """
     An OrthoView converts between four spaces:
@@ -14,8 +39,18 @@ class OrthoView:
       top-left)
     * scaled_widget (device_pixel_ratio times smaller than widget), which
       accounts for a scaling trick on retina screens in OS X.
+
+    Each space is a scale and a translation of every other, so each
+    conversion is given by a scale and an offset, from which the matrices and
+    their inverses are computed in closed form.  They are computed when they
+    are first needed and cached until the zoom, scroll or device pixel ratio
+    change, which increments version.  The cached arrays, and the zoom and
+    scroll, are read-only, so set the zoom and scroll rather than editing
+    them.
     """
 
+    SPACES = ('scene', 'screen', 'widget', 'scaled_widget')
+
     def __init__(self, zoom=np.ones(2), scroll=np.zeros(2, dtype='i')):
         """
         * zoom
@@ -27,10 +62,15 @@ class OrthoView:
           * Bottom-right is positive.
         """
         super().__init__()
+        # The number of changes to the state, which consumers of the matrices
+        # can compare to skip redundant work.
+        self.version = 0
+        # A map from the name or key of a derived value to the value.
+        self.cache = {}
         # These variables do the transformation between spaces.
-        self.zoom_ = np.ones(2) * zoom
-        self.scroll_ = np.array(scroll, dtype='i')
-        self.device_pixel_ratio = 1.0
+        self.zoom_ = read_only(np.ones(2) * zoom)
+        self.scroll_ = read_only(np.array(scroll, dtype='i'))
+        self.device_pixel_ratio_ = 1.0
         assert self.scroll.shape == (2,)
 
     # Settable vector properties ----------------------------------------------
@@ -40,7 +80,10 @@ class OrthoView:
 
     @zoom.setter
     def zoom(self, new_zoom):
-        self.zoom_ = new_zoom
+        if np.array_equal(new_zoom, self.zoom_):
+            return
+        self.zoom_ = read_only(np.array(new_zoom, dtype=float))
+        self.changed()
 
     @property
     def scroll(self):
@@ -48,55 +91,148 @@ class OrthoView:
 
     @scroll.setter
     def scroll(self, new_scroll):
-        self.scroll_ = new_scroll
+        if np.array_equal(new_scroll, self.scroll_):
+            return
+        self.scroll_ = read_only(np.array(new_scroll))
+        self.changed()
 
-    # Vector properties -------------------------------------------------------
     @property
+    def device_pixel_ratio(self):
+        return self.device_pixel_ratio_
+
+    @device_pixel_ratio.setter
+    def device_pixel_ratio(self, new_device_pixel_ratio):
+        if new_device_pixel_ratio == self.device_pixel_ratio_:
+            return
+        self.device_pixel_ratio_ = new_device_pixel_ratio
+        self.changed()
+
+    # Vector properties -------------------------------------------------------
+    @memoized_property
     def flipped_zoom(self):
         return np.array([self.zoom_[0], -self.zoom_[1]])
 
     # Matrix properties -------------------------------------------------------
     @property
     def scene_to_screen(self):
-        return np.diag([self.zoom[0], -self.zoom[1], 1.0, 1.0])
+        return self.matrix('scene', 'screen')
 
     @property
     def widget_to_screen(self):
-        return translation_matrix([self.scroll_[0],
-                                   self.scroll_[1],
-                                   0.0])
+        return self.matrix('widget', 'screen')
 
     @property
     def widget_to_scene(self):
         """
         The inverse view matrix.
         """
-        return self.screen_to_scene.dot(self.widget_to_screen)
+        return self.matrix('widget', 'scene')
 
     @property
     def screen_to_scene(self):
-        return np.diag([1 / self.zoom[0], -1 / self.zoom[1], 1.0, 1.0])
+        return self.matrix('screen', 'scene')
 
     @property
     def screen_to_widget(self):
-        return np.linalg.inv(self.widget_to_screen)
+        return self.matrix('screen', 'widget')
 
     @property
     def scene_to_widget(self):
         """
         This is the view matrix.
         """
-        return self.screen_to_widget.dot(self.scene_to_screen)
+        return self.matrix('scene', 'widget')
 
     @property
     def scaled_widget_to_scene(self):
-        return self.widget_to_scene.dot(self.scaled_widget_to_widget)
+        return self.matrix('scaled_widget', 'scene')
 
     @property
     def scaled_widget_to_screen(self):
-        return self.widget_to_screen.dot(self.scaled_widget_to_widget)
+        return self.matrix('scaled_widget', 'screen')
 
     @property
     def scaled_widget_to_widget(self):
-        return np.diag([self.device_pixel_ratio, self.device_pixel_ratio,
-                        1.0, 1.0])
+        return self.matrix('scaled_widget', 'widget')
+
+    # New methods -------------------------------------------------------------
+    def changed(self):
+        """
+        Discards the derived values.  It is called whenever the state changes.
+        """
+        self.version += 1
+        self.cache.clear()
+
+    def widget_affine(self, space):
+        """
+        Returns the pair (scale, offset) of arrays of shape (2,) such that a
+        point p in space maps to scale * p + offset in widget space.
+        """
+        if space == 'scene':
+            return self.flipped_zoom, -self.scroll_
+        if space == 'screen':
+            return np.ones(2), -self.scroll_
+        if space == 'widget':
+            return np.ones(2), np.zeros(2)
+        if space == 'scaled_widget':
+            return np.full(2, self.device_pixel_ratio_), np.zeros(2)
+        raise ValueError(
+            f"Unknown space {space!r}.  The spaces are {self.SPACES}.")
+
+    def affine(self, source, target):
+        """
+        Returns the pair (scale, offset) of read-only arrays of shape (2,)
+        such that a point p in the space source maps to scale * p + offset in
+        the space target.  The spaces are named as in SPACES.
+        """
+        key = ('affine', source, target)
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+        source_scale, source_offset = self.widget_affine(source)
+        target_scale, target_offset = self.widget_affine(target)
+        value = (read_only(source_scale / target_scale),
+                 read_only((source_offset - target_offset) / target_scale))
+        self.cache[key] = value
+        return value
+
+    def matrix(self, source, target, dtype=np.float64):
+        """
+        Returns the read-only 4×4 matrix that maps homogeneous points in the
+        space source to the space target.  The matrices with dtype float32 are
+        ready to be uploaded as uniforms.
+        """
+        key = ('matrix', source, target, np.dtype(dtype))
+        try:
+            return self.cache[key]
+        except KeyError:
+            pass
+        scale, offset = self.affine(source, target)
+        value = np.eye(4, dtype=dtype)
+        value[[0, 1], [0, 1]] = scale
+        value[:2, 3] = offset
+        self.cache[key] = read_only(value)
+        return value
+
+    def convert(self, points, source, target, out=None):
+        """
+        Returns points mapped from the space source to the space target.
+        * points has shape (..., 2), e.g., (2,) for one point or (N, 2).
+        * out, if given, is a floating-point array of the same shape that
+          receives the result; it can be points itself to convert them in
+          place.
+        The points are scaled and offset directly, so no homogeneous
+        coördinates are made.
+        """
+        points = np.asarray(points)
+        if points.shape[-1:] != (2,):
+            raise ValueError(
+                f"Points must have shape (..., 2), not {points.shape}.")
+        scale, offset = self.affine(source, target)
+        if out is None:
+            out = np.empty(points.shape,
+                           dtype=np.result_type(points.dtype, scale.dtype))
+        np.multiply(points, scale, out=out)
+        np.add(out, offset, out=out)
+        return out
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from rectangle import Rect
+
+from ..bounded_ortho_view import BoundedOrthoView
+from ..ortho_view import OrthoView
+
+
+def test_memoized_matrices():
+    view = OrthoView(zoom=[2.0, 4.0], scroll=[8, 3])
+    view_matrix = view.scene_to_widget
+    assert view.scene_to_widget is view_matrix
+    assert_allclose(view.widget_to_scene @ view_matrix, np.eye(4))
+    with pytest.raises(ValueError):
+        view_matrix[0, 0] = 1.0
+
+    version = view.version
+    view.scroll = [8, 3]
+    assert view.version == version
+    view.scroll = [9, 3]
+    assert view.version == version + 1
+    assert view.scene_to_widget is not view_matrix
+    assert_allclose(view.scene_to_widget[:2, 3], [-9, -3])
+    float32_matrix = view.matrix('scene', 'widget', np.float32)
+    assert float32_matrix.dtype == np.float32
+    assert_allclose(float32_matrix, view.scene_to_widget)
+
+
+def test_memoized_rects():
+    view = BoundedOrthoView(zoom=np.ones(2),
+                            scroll=np.zeros(2, dtype='i'),
+                            scene_rect=Rect([0.0, 0.0], [100.0, 50.0]),
+                            border=0,
+                            zoom_range=[[0.5, 0.5], [4.0, 4.0]],
+                            widget_size=np.array([20, 10]))
+    screen_rect = view.screen_rect
+    assert view.screen_rect is screen_rect
+    view.scroll = np.array([1000, 1000])
+    assert_allclose(view.scroll, [80, -10])
+    view.scene_rect = Rect([0.0, 0.0], [200.0, 50.0])
+    assert view.screen_rect is not screen_rect
+    view.scroll = np.array([1000, 1000])
+    assert_allclose(view.scroll, [180, -10])
+
+
+def test_convert():
+    view = OrthoView(zoom=[2.4, 31.2], scroll=[8, 3])
+    view.device_pixel_ratio = 2.0
+    points = np.random.uniform(-100.0, 100.0, size=(50, 2))
+    homogeneous = np.column_stack([points, np.zeros(50), np.ones(50)])
+    for source in OrthoView.SPACES:
+        for target in OrthoView.SPACES:
+            desired = (homogeneous @ view.matrix(source, target).T)[:, :2]
+            assert_allclose(view.convert(points, source, target), desired)
+            out = np.empty_like(points)
+            assert view.convert(points, source, target, out=out) is out
+            assert_allclose(out, desired)
+    in_place = points.copy()
+    view.convert(in_place, 'scene', 'widget', out=in_place)
+    assert_allclose(view.convert(in_place, 'widget', 'scene'), points)
+    with pytest.raises(ValueError):
+        view.convert(homogeneous, 'scene', 'widget')
+    with pytest.raises(ValueError):
+        view.convert(points, 'scene', 'gl')
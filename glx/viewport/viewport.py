@@ -1,3 +1,5 @@
+import numpy as np
+
 __all__ = ['Viewport']
 
 
@@ -22,6 +24,16 @@ class Viewport:
         return self.projection.widget_rect.transformed(
             self.view.widget_to_scene).rectified()
 
+    def write_camera_block(self, camera_block):
+        """
+        Writes the projection and view matrices into camera_block, a
+        CameraBlock, which shares them with every program that declares the
+        Camera uniform block.
+        """
+        camera_block.write(projection=self.projection.widget_to_gl,
+                           view=self.view.matrix('scene', 'widget',
+                                                 np.float32))
+
     # Magic methods -----------------------------------------------------------
     def __repr__(self):
         return (f"{type(self).__name__}("
@@ -1,6 +1,13 @@
-from .gl_importer import gl
+import ctypes
 
-__all__ = ['glGetActiveAttrib']
+import numpy as np
+
+from .gl_importer import gl, raw_gl_2_0, raw_gl_3_1, raw_gl_4_3
+
+__all__ = ['glGetActiveAttrib', 'glGetActiveUniform',
+           'glGetActiveUniformBlockName',
+           'glGetProgramResourceName', 'glGetInteger', 'glGetProgramInteger',
+           'glGenName', 'glCreateName', 'glDeleteNames']
 
 
 def glGetActiveAttrib(program, index):
@@ -16,3 +23,90 @@ def glGetActiveAttrib(program, index):
     gl.glGetActiveAttrib(program, index, buffer_size,
                          length, size, type_, name)
     return name.decode().rstrip('\x00'), size.value, type_.value
+
+
+def glGetActiveUniform(program, index):
+    """Wrap PyOpenGL glGetActiveUniform, which fails when
+    OpenGL.SIZE_1_ARRAY_UNPACK is False, as for glGetActiveAttrib
+    """
+    buffer_size = glGetProgramInteger(program,
+                                      gl.GL_ACTIVE_UNIFORM_MAX_LENGTH)
+    length = gl.GLsizei()
+    size = gl.GLint()
+    type_ = gl.GLenum()
+    name = ctypes.create_string_buffer(buffer_size)
+
+    raw_gl_2_0.glGetActiveUniform(program, index, buffer_size,
+                                  length, size, type_, name)
+    return name.value.decode(), size.value, type_.value
+
+
+def glGetActiveUniformBlockName(program, index):
+    """Wrap PyOpenGL glGetActiveUniformBlockName, which fails when
+    OpenGL.SIZE_1_ARRAY_UNPACK is False, as for glGetActiveUniform
+    """
+    buffer_size = gl.GLint()
+    gl.glGetActiveUniformBlockiv(program, index,
+                                 gl.GL_UNIFORM_BLOCK_NAME_LENGTH,
+                                 buffer_size)
+    length = gl.GLsizei()
+    name = ctypes.create_string_buffer(buffer_size.value)
+
+    raw_gl_3_1.glGetActiveUniformBlockName(program, index, buffer_size.value,
+                                           length, name)
+    return name.value.decode()
+
+
+def glGetProgramResourceName(program, interface, index):
+    """Wrap PyOpenGL glGetProgramResourceName, whose wrapper fails, as for
+    glGetActiveAttrib
+    """
+    buffer_size = gl.GLint()
+    gl.glGetProgramInterfaceiv(program, interface, gl.GL_MAX_NAME_LENGTH,
+                               buffer_size)
+    length = gl.GLsizei()
+    name = ctypes.create_string_buffer(buffer_size.value)
+
+    raw_gl_4_3.glGetProgramResourceName(program, interface, index,
+                                        buffer_size.value, length, name)
+    return name.value.decode()
+
+
+def glGetInteger(pname):
+    """Wrap PyOpenGL glGetIntegerv to return a single int.  Depending on
+    OpenGL.SIZE_1_ARRAY_UNPACK, PyOpenGL returns either an array or a scalar.
+    """
+    return int(np.ravel(gl.glGetIntegerv(pname))[0])
+
+
+def glGetProgramInteger(program, pname):
+    """Wrap PyOpenGL glGetProgramiv to return a single int as for
+    glGetInteger.
+    """
+    return int(np.ravel(gl.glGetProgramiv(program, pname))[0])
+
+
+def glGenName(gen_function):
+    """Wrap a PyOpenGL glGen* function, e.g., glGenBuffers, to return a single
+    name as a numpy.uint32.  Depending on its version, PyOpenGL returns either
+    an array or a scalar when one name is requested.
+    """
+    return np.uint32(np.ravel(gen_function(1))[0])
+
+
+def glCreateName(create_function):
+    """Wrap a PyOpenGL glCreate* function, e.g., glCreateBuffers, to return a
+    single name as a numpy.uint32 as for glGenName.
+    """
+    names = np.zeros(1, dtype=np.uint32)
+    create_function(1, names)
+    return names[0]
+
+
+def glDeleteNames(delete_function, names):
+    """Wrap a PyOpenGL glDelete* function, e.g., glDeleteBuffers, to delete an
+    iterable of names.  The names are passed as an array of GLuint, which,
+    unlike a list or a scalar, needs no copy and so works with ERROR_ON_COPY.
+    """
+    names = np.array(list(names), dtype=np.uint32)
+    delete_function(len(names), names)
@@ -24,9 +24,9 @@ setup(
         "Operating System :: OS Independent",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.4",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
     keywords=['OpenGL'],
     install_requires=['numpy>=1.13',
@@ -34,7 +34,7 @@ setup(
                       'rectangle>=0.2',
                       'freetype-py>=1.1',
                       'PyOpenGL>=3.0.0'],
-    python_requires='>=3.7',
+    python_requires='>=3.9',
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
 )